@@ -0,0 +1,68 @@
+"""Calentamiento de un worker al arrancar.
+
+`calentar_worker` importa el URLconf (y con él todas las vistas), prepara las
+tablas de `reverse()` y precompila las plantillas, para que la primera petición después de un despliegue cueste
+lo mismo que las siguientes. La llaman `wsgi.py` y `asgi.py` si
+`ARRANQUE_CALENTAR` está activo; `manage.py` y los tests no la llaman.
+
+Con el cargador en caché (`django.template.loaders.cached.Loader`) cada
+plantilla se lee y compila la primera vez que se usa y queda en memoria del
+proceso. `precompilar_plantillas` hace ese trabajo por adelantado para todas
+las plantillas de `templates/`.
+"""
+
+import logging
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+
+def nombres_plantillas(motor):
+    """Nombres relativos de todas las plantillas en los DIRS del motor"""
+    nombres = []
+    for directorio in motor.engine.dirs:
+        directorio = Path(directorio)
+        nombres.extend(
+            ruta.relative_to(directorio).as_posix()
+            for ruta in sorted(directorio.rglob('*')) if ruta.is_file()
+        )
+    return nombres
+
+
+def precompilar_plantillas():
+    """Compilar las plantillas del proyecto; devuelve (compiladas, segundos)"""
+    inicio = time.perf_counter()
+    compiladas = 0
+    for motor in engines.all():
+        if not isinstance(motor, DjangoTemplates):
+            continue
+        for nombre in nombres_plantillas(motor):
+            try:
+                motor.get_template(nombre)
+            except TemplateSyntaxError:
+                # Un error de sintaxis no debe impedir que el worker arranque;
+                # la vista que use la plantilla fallará igual que sin precompilar
+                logger.exception("No se pudo compilar la plantilla %s", nombre)
+                continue
+            compiladas += 1
+    segundos = time.perf_counter() - inicio
+    logger.info("%d plantillas precompiladas en %.0f ms", compiladas, segundos * 1000)
+    return compiladas, segundos
+
+
+def calentar_worker():
+    if not getattr(settings, 'ARRANQUE_CALENTAR', True):
+        return
+    # Importa urls.py con las vistas de cada app y arma las tablas de reverse()
+    # que usa {% url %}, que Django construye por espacio de nombres
+    resolver = get_resolver()
+    resolver.reverse_dict
+    for _, subresolver in resolver.namespace_dict.values():
+        subresolver.reverse_dict
+    precompilar_plantillas()
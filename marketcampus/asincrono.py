@@ -0,0 +1,29 @@
+"""Utilidades para las vistas async.
+
+Las vistas async consultan con el ORM async (`aget_object_or_404`, `async
+for`, `aexists`...). Cada consulta async pasa por `sync_to_async` al hilo
+del ORM de la petición y se ejecuta una detrás de otra, así que se esperan
+en orden: `asyncio.gather` no las solaparía. Lo que se gana es no bloquear
+el bucle de eventos mientras tanto. Todo lo que sigue siendo síncrono y puede
+tocar la base de datos, como renderizar una plantilla, va por `sync_to_async`.
+"""
+
+from asgiref.sync import sync_to_async
+from django.shortcuts import render
+
+
+async def alista(queryset):
+    """Evaluar un queryset desde una vista async"""
+    return [objeto async for objeto in queryset]
+
+
+async def arender(request, *args, **kwargs):
+    """`render` para vistas async.
+
+    La plantilla puede consultar la base (usuario de la sesión, mensajes,
+    relaciones perezosas), así que se renderiza en el hilo del ORM. Antes se
+    fija `request.user` al usuario ya cargado con `request.auser()` para que
+    el procesador de contexto no lo vuelva a consultar.
+    """
+    request.user = await request.auser()
+    return await sync_to_async(render)(request, *args, **kwargs)
@@ -0,0 +1,20 @@
+"""Qué se puede confiar a la caché según su backend.
+
+LocMemCache guarda los datos en la memoria de cada proceso: con varios
+workers cada uno ve su propia caché, y un comando de manage.py ve una vacía.
+Lo que necesita que todos los procesos vean lo mismo (contadores en diferido,
+versiones del catálogo) comprueba `cache_compartida()` antes de apoyarse en
+ella.
+"""
+
+from django.conf import settings
+
+CACHES_POR_PROCESO = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def cache_compartida(alias='default'):
+    """Si todos los procesos ven la misma caché (Redis, Memcached, base de datos, archivos)"""
+    return settings.CACHES[alias]['BACKEND'] not in CACHES_POR_PROCESO
@@ -0,0 +1,66 @@
+"""Archivos estáticos con hash de contenido y variantes precomprimidas.
+
+`collectstatic` copia cada archivo con el hash de su contenido en el nombre
+(`css/base.3f2a9c1b7e4d.css`) y escribe `staticfiles.json` para que
+`{% static %}` devuelva ese nombre; así el servidor web puede servir
+`STATIC_ROOT` con caché de un año (`Cache-Control: immutable`). Junto a cada
+archivo de texto deja `.gz` y, si está instalado `brotli`, `.br`, para
+servirlos sin comprimir en cada petición (`gzip_static` / `brotli_static` en
+nginx).
+"""
+
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+EXTENSIONES_COMPRIMIBLES = ('.css', '.js', '.svg', '.json', '.txt', '.map', '.xml')
+# Por debajo de este tamaño comprimir no ahorra nada en la práctica
+TAMANO_MINIMO = 256
+
+
+def comprimir(ruta):
+    """Escribir las variantes .gz y .br de `ruta`; devuelve las rutas escritas"""
+    with open(ruta, 'rb') as archivo:
+        contenido = archivo.read()
+    if len(contenido) < TAMANO_MINIMO:
+        return []
+
+    variantes = [(ruta + '.gz', gzip.compress(contenido, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variantes.append((ruta + '.br', brotli.compress(contenido, mode=brotli.MODE_TEXT)))
+
+    escritas = []
+    for destino, comprimido in variantes:
+        if len(comprimido) >= len(contenido):
+            continue
+        with open(destino, 'wb') as archivo:
+            archivo.write(comprimido)
+        escritas.append(destino)
+    return escritas
+
+
+class AlmacenamientoEstaticos(ManifestStaticFilesStorage):
+
+    def stored_name(self, name):
+        # Sin collectstatic (desarrollo y tests) no hay manifiesto ni copias con
+        # hash: se sirven los archivos originales desde STATICFILES_DIRS
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        # Solo los nombres con hash: son los únicos que enlazan las plantillas
+        for nombre in sorted(set(self.hashed_files.values())):
+            if not nombre.endswith(EXTENSIONES_COMPRIMIBLES):
+                continue
+            for destino in comprimir(self.path(nombre)):
+                yield nombre, os.path.relpath(destino, self.location), True
@@ -0,0 +1,212 @@
+"""Instrumentación por petición: consultas SQL, plantillas y tiempo de vista.
+
+`InstrumentacionMiddleware` registra en cada petición:
+
+- número de consultas SQL y tiempo total en la base de datos,
+- consultas repetidas (mismo SQL ejecutado varias veces, típico de un N+1),
+- tiempo de renderizado de plantillas,
+- tiempo de la vista y total.
+
+Los datos se devuelven en la cabecera `Server-Timing` (visible en la pestaña
+Red del navegador) y en una línea JSON del logger ``marketcampus.peticiones``.
+`RegistroConsultas` también lo usan los tests de presupuesto de consultas
+(ver `marketcampus.pruebas`).
+
+Las consultas se capturan con un envoltorio instalado en cada conexión que
+anota en los registros activos del contexto actual (ContextVar). Así se
+cuentan también las consultas de las vistas async, que el ORM ejecuta en
+otros hilos con una copia del contexto, sin mezclar peticiones concurrentes.
+"""
+
+import json
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.backends.django import Template as PlantillaDjango
+
+logger = logging.getLogger('marketcampus.peticiones')
+
+# Un mismo SQL ejecutado al menos estas veces se reporta como repetido
+UMBRAL_REPETIDAS = 2
+
+_medicion_actual = ContextVar('medicion_actual', default=None)
+_registros_activos = ContextVar('registros_activos', default=())
+
+
+def _capturar_consulta(execute, sql, params, many, context):
+    registros = _registros_activos.get()
+    if not registros:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duracion = time.perf_counter() - inicio
+        for registro in registros:
+            registro.consultas.append((sql, duracion))
+
+
+def _instalar_captura(connection, **kwargs):
+    if _capturar_consulta not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_capturar_consulta)
+
+
+# Las conexiones nuevas (de cualquier hilo) nacen con el envoltorio instalado
+connection_created.connect(_instalar_captura)
+
+
+class RegistroConsultas:
+    """Guarda (sql, duración) de cada consulta ejecutada mientras está activo"""
+
+    def __init__(self):
+        self.consultas = []
+
+    @contextmanager
+    def activo(self):
+        # Conexiones abiertas antes de importar este módulo
+        for alias in connections:
+            _instalar_captura(connections[alias])
+        token = _registros_activos.set(_registros_activos.get() + (self,))
+        try:
+            yield self
+        finally:
+            _registros_activos.reset(token)
+
+    @property
+    def total(self):
+        return len(self.consultas)
+
+    @property
+    def segundos(self):
+        return sum(duracion for _, duracion in self.consultas)
+
+    def repetidas(self, umbral=UMBRAL_REPETIDAS):
+        """{sql: veces} de las consultas ejecutadas al menos `umbral` veces"""
+        conteo = Counter(sql for sql, _ in self.consultas)
+        return {sql: veces for sql, veces in conteo.items() if veces >= umbral}
+
+
+class Medicion:
+    def __init__(self):
+        self.sql = RegistroConsultas()
+        self.plantillas = 0.0
+        self.vista = 0.0
+        self.total = 0.0
+        self._profundidad = 0
+
+
+_render_original = PlantillaDjango.render
+
+
+def _render_medido(self, context=None, request=None):
+    medicion = _medicion_actual.get()
+    if medicion is None:
+        return _render_original(self, context, request)
+    # Las plantillas anidadas (fragmentos con render_to_string) ya cuentan en la exterior
+    medicion._profundidad += 1
+    inicio = time.perf_counter()
+    try:
+        return _render_original(self, context, request)
+    finally:
+        medicion._profundidad -= 1
+        if not medicion._profundidad:
+            medicion.plantillas += time.perf_counter() - inicio
+
+
+PlantillaDjango.render = _render_medido
+
+
+def _ms(segundos):
+    return f"{segundos * 1000:.1f}"
+
+
+def server_timing(medicion):
+    repetidas = medicion.sql.repetidas()
+    metricas = [
+        f'sql;dur={_ms(medicion.sql.segundos)};desc="{medicion.sql.total} consultas"',
+        f'sql-rep;desc="{sum(repetidas.values())} repetidas en {len(repetidas)} grupos"',
+        f'tpl;dur={_ms(medicion.plantillas)}',
+        f'vista;dur={_ms(medicion.vista)}',
+        f'total;dur={_ms(medicion.total)}',
+    ]
+    return ', '.join(metricas)
+
+
+class InstrumentacionMiddleware:
+    """Debe ir primero en MIDDLEWARE para que `total` cubra toda la petición"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not getattr(settings, 'INSTRUMENTACION_ACTIVA', True):
+            return self.get_response(request)
+
+        medicion, token, inicio = self._iniciar(request)
+        try:
+            with medicion.sql.activo():
+                response = self.get_response(request)
+        finally:
+            _medicion_actual.reset(token)
+        return self._terminar(request, response, medicion, inicio)
+
+    async def __acall__(self, request):
+        if not getattr(settings, 'INSTRUMENTACION_ACTIVA', True):
+            return await self.get_response(request)
+
+        medicion, token, inicio = self._iniciar(request)
+        try:
+            with medicion.sql.activo():
+                response = await self.get_response(request)
+        finally:
+            _medicion_actual.reset(token)
+        return self._terminar(request, response, medicion, inicio)
+
+    def _iniciar(self, request):
+        medicion = Medicion()
+        request._medicion = medicion
+        return medicion, _medicion_actual.set(medicion), time.perf_counter()
+
+    def _terminar(self, request, response, medicion, inicio):
+        medicion.total = time.perf_counter() - inicio
+        if getattr(request, '_inicio_vista', None):
+            medicion.vista = time.perf_counter() - request._inicio_vista
+
+        if getattr(settings, 'INSTRUMENTACION_SERVER_TIMING', True):
+            response['Server-Timing'] = server_timing(medicion)
+        self._registrar(request, response, medicion)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._inicio_vista = time.perf_counter()
+
+    def _registrar(self, request, response, medicion):
+        repetidas = medicion.sql.repetidas()
+        match = getattr(request, 'resolver_match', None)
+        registro = {
+            'metodo': request.method,
+            'ruta': request.path,
+            'vista': match.view_name if match else None,
+            'estado': response.status_code,
+            'sql_consultas': medicion.sql.total,
+            'sql_ms': round(medicion.sql.segundos * 1000, 1),
+            'sql_repetidas': sum(repetidas.values()),
+            'plantillas_ms': round(medicion.plantillas * 1000, 1),
+            'vista_ms': round(medicion.vista * 1000, 1),
+            'total_ms': round(medicion.total * 1000, 1),
+        }
+        logger.info(json.dumps(registro, ensure_ascii=False))
@@ -0,0 +1,72 @@
+"""Paginador del admin que no cuenta filas en tablas grandes.
+
+El changelist del admin hace un COUNT(*) de la tabla en cada página; en
+InnoDB eso recorre un índice entero y con cientos de miles de filas tarda
+segundos. Sin filtros ni búsqueda, `PaginadorEstimado` toma el total de las
+estadísticas del motor y solo cuenta de verdad si la tabla es pequeña. Con
+filtros el COUNT es exacto: ya lo acota el filtro.
+
+Usar junto con `show_full_result_count = False`, que evita el segundo COUNT
+de la tabla completa cuando hay filtros.
+"""
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models.query import QuerySet
+from django.utils.functional import cached_property
+
+# Por debajo de esta estimación se cuenta con COUNT(*)
+UMBRAL_CONTEO_EXACTO = 10000
+
+
+def _estimar_sqlite(cursor, tabla, ops):
+    # Con pocas filas borradas el rowid máximo es una buena estimación, y sale del índice
+    cursor.execute(f"SELECT MAX(_ROWID_) FROM {ops.quote_name(tabla)}")
+    return cursor.fetchone()[0] or 0
+
+
+def _estimar_mysql(cursor, tabla, ops):
+    cursor.execute(
+        "SELECT TABLE_ROWS FROM information_schema.TABLES "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+        [tabla],
+    )
+    fila = cursor.fetchone()
+    return fila[0] if fila else None
+
+
+def _estimar_postgresql(cursor, tabla, ops):
+    cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [tabla])
+    fila = cursor.fetchone()
+    # -1 si la tabla nunca se analizó
+    return fila[0] if fila and fila[0] >= 0 else None
+
+
+ESTIMADORES = {
+    'sqlite': _estimar_sqlite,
+    'mysql': _estimar_mysql,
+    'postgresql': _estimar_postgresql,
+}
+
+
+def estimar_filas(queryset):
+    """Filas aproximadas de la tabla del queryset, o None si no se puede estimar"""
+    conexion = connections[queryset.db]
+    estimador = ESTIMADORES.get(conexion.vendor)
+    if estimador is None:
+        return None
+    with conexion.cursor() as cursor:
+        return estimador(cursor, queryset.model._meta.db_table, conexion.ops)
+
+
+class PaginadorEstimado(Paginator):
+
+    @cached_property
+    def count(self):
+        consulta = self.object_list
+        sin_filtros = isinstance(consulta, QuerySet) and not consulta.query.where and not consulta.query.distinct
+        if sin_filtros:
+            estimado = estimar_filas(consulta)
+            if estimado is not None and estimado >= UMBRAL_CONTEO_EXACTO:
+                return estimado
+        return super().count
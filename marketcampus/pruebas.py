@@ -0,0 +1,56 @@
+"""Utilidades para tests: presupuesto de consultas por vista.
+
+Uso::
+
+    class ExplorarTests(PresupuestoConsultasMixin, TestCase):
+        def test_presupuesto(self):
+            self.assertPresupuestoConsultas(reverse('productos:explorar'), maximo=4)
+
+Falla si la vista hace más de `maximo` consultas o si algún SQL se repite
+(señal de un N+1), mostrando las consultas ejecutadas en el mensaje.
+
+`crear_estudiante(indice)` crea un User con su Estudiante, con datos
+distintos por índice.
+"""
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+from usuarios.models import Estudiante
+
+from .instrumentacion import RegistroConsultas
+
+
+class PresupuestoConsultasMixin:
+
+    def assertPresupuestoConsultas(self, url, maximo, repeticiones_permitidas=1, status=200):
+        # Las cachés de páginas y tarjetas ocultarían las consultas reales
+        cache.clear()
+        registro = RegistroConsultas()
+        with registro.activo():
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status)
+
+        listado = '\n'.join(f"  {sql}" for sql, _ in registro.consultas)
+        self.assertLessEqual(
+            registro.total, maximo,
+            f"{url} hizo {registro.total} consultas (presupuesto {maximo}):\n{listado}",
+        )
+        repetidas = registro.repetidas(umbral=repeticiones_permitidas + 1)
+        self.assertFalse(
+            repetidas,
+            f"{url} repite consultas (posible N+1):\n" +
+            '\n'.join(f"  {veces}x {sql}" for sql, veces in repetidas.items()),
+        )
+        return response
+
+
+def crear_estudiante(indice):
+    user = User.objects.create_user(
+        username=f"estudiante{indice}@uni.edu", password='clave-segura-123',
+        first_name=f"Nombre{indice}", last_name='Apellido',
+    )
+    return Estudiante.objects.create(
+        user=user, nombres=f"Nombre{indice}", apellidos='Apellido',
+        apodo=f"apodo{indice}", correo=user.username,
+    )
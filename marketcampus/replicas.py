@@ -0,0 +1,134 @@
+"""Lecturas en réplicas con consistencia "leer lo que escribí".
+
+`RouterReplicas` envía las escrituras a `default` y las lecturas de las
+peticiones GET/HEAD a una de las réplicas de `REPLICAS_LECTURA`. Leen de la
+primaria:
+
+- las peticiones POST/PUT/PATCH/DELETE,
+- todo lo que no pasa por `ReplicasMiddleware`: comandos de manage.py, la
+  consola y los hilos en segundo plano, que leen para luego escribir,
+- las lecturas dentro de `transaction.atomic()` en `default`, aunque todavía
+  no se haya escrito nada (leer de una réplica atrasada y escribir el
+  resultado en la primaria pisaría datos),
+- cualquier lectura posterior a una escritura en la misma petición,
+- las peticiones que llegan durante `REPLICAS_PRIMARIA_SEGUNDOS` después de
+  una escritura del mismo navegador (cookie puesta por `ReplicasMiddleware`),
+  para que la redirección tras un formulario muestre el cambio aunque la
+  réplica vaya con retraso.
+
+Las escrituras que el usuario no ve reflejadas enseguida (contar una visita)
+van dentro de `escritura_interna()` y no cuentan para lo anterior.
+
+Sin réplicas configuradas, o si apuntan a la misma base que `default` (como
+en los tests), todo va a `default`.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+COOKIE_PRIMARIA = 'leer_primaria'
+METODOS_SEGUROS = frozenset({'GET', 'HEAD', 'OPTIONS', 'TRACE'})
+
+_leer_replicas = ContextVar('leer_replicas', default=False)
+_hubo_escritura = ContextVar('hubo_escritura', default=False)
+
+
+def _misma_base(alias):
+    # Los tests configuran la réplica como espejo (MIRROR) de la base de pruebas
+    campos = ('ENGINE', 'NAME', 'HOST', 'PORT')
+    replica, primaria = connections[alias].settings_dict, connections['default'].settings_dict
+    return all(replica.get(campo) == primaria.get(campo) for campo in campos)
+
+
+def _replicas():
+    return [alias for alias in getattr(settings, 'REPLICAS_LECTURA', []) if not _misma_base(alias)]
+
+
+@contextmanager
+def escritura_interna():
+    """Escrituras que no deben fijar las lecturas en la primaria"""
+    token = _hubo_escritura.set(_hubo_escritura.get())
+    try:
+        yield
+    finally:
+        _hubo_escritura.reset(token)
+
+
+class RouterReplicas:
+
+    def db_for_read(self, model, **hints):
+        replicas = _replicas()
+        if not replicas or not _leer_replicas.get() or _hubo_escritura.get():
+            return 'default'
+        if connections['default'].in_atomic_block:
+            return 'default'
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        _hubo_escritura.set(True)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Todas las bases tienen los mismos datos
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Las réplicas reciben el esquema por replicación
+        return db == 'default'
+
+
+class ReplicasMiddleware:
+    """Decide por petición si las lecturas pueden ir a una réplica"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        tokens = self._iniciar(request)
+        try:
+            response = self.get_response(request)
+            escribio = _hubo_escritura.get()
+        finally:
+            self._restaurar(tokens)
+        return self._terminar(response, escribio)
+
+    async def __acall__(self, request):
+        # Las consultas async corren en otros hilos con una copia de este
+        # contexto; asgiref devuelve aquí los cambios de `_hubo_escritura`
+        tokens = self._iniciar(request)
+        try:
+            response = await self.get_response(request)
+            escribio = _hubo_escritura.get()
+        finally:
+            self._restaurar(tokens)
+        return self._terminar(response, escribio)
+
+    def _iniciar(self, request):
+        replicas = request.method in METODOS_SEGUROS and COOKIE_PRIMARIA not in request.COOKIES
+        return _leer_replicas.set(replicas), _hubo_escritura.set(False)
+
+    def _restaurar(self, tokens):
+        token_replicas, token_escritura = tokens
+        _leer_replicas.reset(token_replicas)
+        _hubo_escritura.reset(token_escritura)
+
+    def _terminar(self, response, escribio):
+        if escribio and _replicas():
+            response.set_cookie(
+                COOKIE_PRIMARIA, '1',
+                max_age=getattr(settings, 'REPLICAS_PRIMARIA_SEGUNDOS', 5),
+                httponly=True, samesite='Lax',
+            )
+        return response
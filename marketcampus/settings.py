@@ -3,11 +3,17 @@ Django settings for marketcampus project.
 """
 
 import os
+import sys
 from pathlib import Path
 
+from dotenv import load_dotenv
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Variables de entorno locales (ver .env-ejemplo); las del sistema tienen prioridad
+load_dotenv(BASE_DIR / '.env')
+
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = 'django-insecure-dur(lvom&15#12yqnf4j+1=8f0yf4q3(u7g@kifnv9&7ghz+8c'
 
@@ -34,6 +40,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'marketcampus.instrumentacion.InstrumentacionMiddleware',  # Primero: mide la petición completa
+    'marketcampus.replicas.ReplicasMiddleware',  # Antes de cualquier consulta (sesión incluida)
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -49,8 +57,15 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Cada plantilla se compila una sola vez por proceso; con DEBUG el
+            # autorecargador vacía la caché cuando cambia un archivo
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -65,13 +80,89 @@ TEMPLATES = [
 WSGI_APPLICATION = 'marketcampus.wsgi.application'
 
 # Database
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Se configura con variables de entorno DB_* (ver .env-ejemplo). Sin ellas se
+# usa el SQLite local de desarrollo.
+MOTORES_BD = {
+    'sqlite': 'django.db.backends.sqlite3',
+    'mysql': 'django.db.backends.mysql',
+}
+
+
+def base_de_datos(prefijo, base=None):
+    """Configuración de una conexión a partir de <prefijo>_ENGINE, _NAME, _HOST...
+
+    Las variables que faltan se toman de `base` (la réplica hereda de la primaria).
+    """
+    base = base or {}
+
+    def variable(nombre, defecto=''):
+        return os.environ.get(f'{prefijo}_{nombre}', defecto)
+
+    motor = variable('ENGINE')
+    configuracion = {
+        'ENGINE': MOTORES_BD[motor] if motor else base.get('ENGINE', MOTORES_BD['sqlite']),
+        'NAME': variable('NAME') or base.get('NAME', BASE_DIR / 'db.sqlite3'),
+        'USER': variable('USER', base.get('USER', '')),
+        'PASSWORD': variable('PASSWORD', base.get('PASSWORD', '')),
+        'HOST': variable('HOST', base.get('HOST', '')),
+        'PORT': variable('PORT', base.get('PORT', '')),
+        # Conexiones persistentes solo si se piden (ver .env-ejemplo): con ASGI
+        # cada hilo del ORM guardaría la suya y se irían acumulando
+        'CONN_MAX_AGE': int(variable('CONN_MAX_AGE', base.get('CONN_MAX_AGE', 0))),
+        'CONN_HEALTH_CHECKS': True,
     }
+    if configuracion['ENGINE'] == MOTORES_BD['mysql']:
+        configuracion['OPTIONS'] = {
+            'charset': 'utf8mb4',
+            'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
+            'isolation_level': 'read committed',
+        }
+    return configuracion
+
+
+DATABASES = {
+    'default': base_de_datos('DB'),
 }
 
+# Réplica de solo lectura (DB_REPLICA_*). Para probar en local sirve un segundo
+# MySQL o una copia del SQLite en DB_REPLICA_NAME (una "réplica" con retraso).
+if os.environ.get('DB_REPLICA_NAME') or os.environ.get('DB_REPLICA_HOST'):
+    DATABASES['replica'] = base_de_datos('DB_REPLICA', DATABASES['default'])
+    # En los tests la réplica es la misma base de pruebas que la primaria
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['marketcampus.replicas.RouterReplicas']
+REPLICAS_LECTURA = [alias for alias in DATABASES if alias != 'default']
+REPLICAS_PRIMARIA_SEGUNDOS = 5  # Lecturas en la primaria tras escribir (retraso de réplica tolerado)
+
+# Cache
+# Backend compartido entre procesos desde el entorno (CACHE_REDIS_URL o
+# CACHE_MEMCACHED). Sin ninguno se usa una caché en memoria de cada proceso y
+# se desactiva lo que necesita que todos los workers vean lo mismo: la caché de
+# páginas del catálogo, los 304 de los listados y el búfer de visitas
+# (ver marketcampus/caches.py).
+if os.environ.get('CACHE_REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['CACHE_REDIS_URL'],
+        }
+    }
+elif os.environ.get('CACHE_MEMCACHED'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': os.environ['CACHE_MEMCACHED'].split(','),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'marketcampus',
+        }
+    }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -102,6 +193,18 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
+# Destino de collectstatic; en producción el servidor web sirve este directorio
+# con caché permanente (ver marketcampus/estaticos.py)
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'marketcampus.estaticos.AlmacenamientoEstaticos',
+    },
+}
 
 # Media files (Uploaded by users)
 MEDIA_URL = '/media/'
@@ -127,22 +230,50 @@ IMAGEKIT_DEFAULT_IMAGE_CACHE_BACKEND = 'imagekit.imagecache.NonValidatingImageCa
 IMAGEKIT_CACHEFILE_DIR = 'CACHE/images'
 IMAGEKIT_DEFAULT_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
 
+# Procesamiento de imágenes en segundo plano (ver productos/procesamiento.py)
+IMAGENES_PROCESAMIENTO_HILOS = 2
+IMAGENES_PROCESAMIENTO_SINCRONO = False  # True para procesar en el mismo hilo (tests)
+
+# Contador de visitas en diferido (ver productos/contadores.py)
+VISITAS_INTERVALO_SEGUNDOS = 60  # Cada cuánto se vuelcan las visitas a la base de datos
+VISITAS_MAX_PENDIENTES = 1000    # Volcar antes si se acumulan tantas visitas
+
+# Caché de páginas del catálogo público (ver productos/cache.py)
+CATALOGO_CACHE_SEGUNDOS = 300
+
+# Fragmentos de tarjetas de producto (ver productos/templatetags/productos_tags.py)
+TARJETAS_CACHE_SEGUNDOS = 600
+
+# Importar las vistas y compilar las plantillas de templates/ al arrancar
+# cada worker (ver marketcampus/arranque.py)
+ARRANQUE_CALENTAR = os.environ.get('ARRANQUE_CALENTAR', '1') == '1'
+
+# Instrumentación por petición (ver marketcampus/instrumentacion.py)
+INSTRUMENTACION_ACTIVA = True
+INSTRUMENTACION_SERVER_TIMING = True  # Cabecera Server-Timing en cada respuesta
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'consola': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'marketcampus.peticiones': {
+            'handlers': ['consola'],
+            # Una línea por petición; bajo `manage.py test` solo los avisos
+            'level': os.environ.get(
+                'INSTRUMENTACION_LOG_NIVEL', 'WARNING' if sys.argv[1:2] == ['test'] else 'INFO',
+            ),
+            'propagate': False,
+        },
+    },
+}
+
 # Security settings (para desarrollo - revisar en producción)
 SESSION_COOKIE_SECURE = False  # True en producción con HTTPS
 CSRF_COOKIE_SECURE = False     # True en producción con HTTPS
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
-
-# Debug template verification (puedes eliminar esto en producción)
-print("=== DEBUG TEMPLATES ===")
-print("BASE_DIR:", BASE_DIR)
-print("Templates path:", BASE_DIR / 'templates')
-print("Templates exists:", (BASE_DIR / 'templates').exists())
-if (BASE_DIR / 'templates').exists():
-    template_dir = BASE_DIR / 'templates'
-    print("Contents of templates/:")
-    for item in template_dir.iterdir():
-        print(f"  - {item.name}")
-        if item.is_dir():
-            for subitem in item.iterdir():
-                print(f"    - {subitem.name}")
\ No newline at end of file
@@ -0,0 +1,99 @@
+import gzip
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connections
+from django.http import HttpResponse
+from django.template import engines
+from django.templatetags.static import static
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from productos.models import Producto
+
+from .arranque import nombres_plantillas, precompilar_plantillas
+from .replicas import COOKIE_PRIMARIA, ReplicasMiddleware, RouterReplicas, escritura_interna
+
+
+@mock.patch('marketcampus.replicas._replicas', return_value=['replica'])
+class RouterReplicasTests(SimpleTestCase):
+    """Lecturas en la réplica salvo después de escribir (leer lo que escribí)"""
+
+    def setUp(self):
+        self.router = RouterReplicas()
+        self.factory = RequestFactory()
+
+    def _pedir(self, request, escribir=False):
+        lecturas = []
+
+        def vista(request):
+            lecturas.append(self.router.db_for_read(Producto))
+            if escribir:
+                self.router.db_for_write(Producto)
+                lecturas.append(self.router.db_for_read(Producto))
+            return HttpResponse()
+
+        response = ReplicasMiddleware(vista)(request)
+        return lecturas, response
+
+    def test_get_lee_de_la_replica(self, _):
+        lecturas, response = self._pedir(self.factory.get('/'))
+        self.assertEqual(lecturas, ['replica'])
+        self.assertNotIn(COOKIE_PRIMARIA, response.cookies)
+
+    def test_despues_de_escribir_lee_de_la_primaria(self, _):
+        lecturas, response = self._pedir(self.factory.get('/'), escribir=True)
+        self.assertEqual(lecturas, ['replica', 'default'])
+        self.assertIn(COOKIE_PRIMARIA, response.cookies)
+
+        # La siguiente petición del mismo navegador también lee de la primaria
+        request = self.factory.get('/')
+        request.COOKIES[COOKIE_PRIMARIA] = '1'
+        lecturas, _ = self._pedir(request)
+        self.assertEqual(lecturas, ['default'])
+
+    def test_escrituras_internas_no_fijan_la_primaria(self, _):
+        def vista(request):
+            with escritura_interna():
+                self.router.db_for_write(Producto)
+            return HttpResponse()
+
+        response = ReplicasMiddleware(vista)(self.factory.get('/'))
+        self.assertNotIn(COOKIE_PRIMARIA, response.cookies)
+
+    def test_post_lee_de_la_primaria(self, _):
+        lecturas, _ = self._pedir(self.factory.post('/'))
+        self.assertEqual(lecturas, ['default'])
+
+    def test_transacciones_y_comandos_leen_de_la_primaria(self, _):
+        with mock.patch.object(connections['default'], 'in_atomic_block', True):
+            lecturas, _ = self._pedir(self.factory.get('/'))
+        self.assertEqual(lecturas, ['default'])
+        # Fuera de una petición (comandos, hilos en segundo plano)
+        self.assertEqual(self.router.db_for_read(Producto), 'default')
+
+
+class ArranqueTests(SimpleTestCase):
+
+    def test_precompila_todas_las_plantillas(self):
+        # Una plantilla con errores de sintaxis no se contaría
+        nombres = nombres_plantillas(engines['django'])
+        self.assertIn('productos/explorar.html', nombres)
+        compiladas, _ = precompilar_plantillas()
+        self.assertEqual(compiladas, len(nombres))
+
+
+class EstaticosTests(SimpleTestCase):
+
+    def test_sin_collectstatic_usa_los_nombres_originales(self):
+        self.assertEqual(static('css/base.css'), '/static/css/base.css')
+
+    def test_collectstatic_genera_nombres_con_hash_y_gzip(self):
+        with tempfile.TemporaryDirectory() as destino, override_settings(STATIC_ROOT=destino):
+            call_command('collectstatic', interactive=False, verbosity=0)
+            url = static('css/base.css')
+            self.assertRegex(url, r'^/static/css/base\.[0-9a-f]{12}\.css$')
+            original = Path(destino, url.removeprefix('/static/'))
+            comprimido = original.with_name(original.name + '.gz')
+            self.assertEqual(gzip.decompress(comprimido.read_bytes()), original.read_bytes())
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'marketcampus.settings')
 
 application = get_wsgi_application()
+
+# La primera petición de cada worker no importa vistas ni compila plantillas
+from marketcampus.arranque import calentar_worker  # noqa: E402
+
+calentar_worker()
@@ -1,10 +1,25 @@
 from django.contrib import admin
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from marketcampus.paginacion_admin import PaginadorEstimado
+from .busqueda import buscar_productos
 from .models import Categoria, Producto, ImagenProducto, Favorito
+from .templatetags.productos_tags import imagen_responsive
+
+# Productos que devuelve la búsqueda del admin, los más relevantes primero
+LIMITE_BUSQUEDA_ADMIN = 1000
 
 class ImagenProductoInline(admin.TabularInline):
     model = ImagenProducto
     extra = 1
-    fields = ['imagen', 'orden']
+    fields = ['vista_previa', 'imagen', 'orden']
+    readonly_fields = ['vista_previa']
+    
+    def vista_previa(self, obj):
+        if obj.pk and obj.imagen:
+            return imagen_responsive(obj, 'miniatura', alt=str(obj))
+        return "-"
+    vista_previa.short_description = 'Vista previa'
 
 @admin.register(Categoria)
 class CategoriaAdmin(admin.ModelAdmin):
@@ -12,14 +27,42 @@ class CategoriaAdmin(admin.ModelAdmin):
     list_filter = ['activa']
     search_fields = ['nombre']
     list_editable = ['activa']
+    
+    def get_queryset(self, request):
+        # Conteo como subconsulta por el índice (categoria, estado) en la misma
+        # consulta de la página, en vez de un COUNT por fila; el COUNT(*) del
+        # paginador la descarta al no usarse
+        disponibles = (
+            Producto.objects.filter(categoria=OuterRef('pk'), estado='disponible')
+            .values('categoria').annotate(total=Count('id')).values('total')
+        )
+        return super().get_queryset(request).annotate(
+            productos_disponibles=Coalesce(Subquery(disponibles), 0)
+        )
+    
+    def cantidad_productos(self, obj):
+        return obj.productos_disponibles
+    cantidad_productos.short_description = 'Productos disponibles'
+    cantidad_productos.admin_order_field = 'productos_disponibles'
 
 @admin.register(Producto)
 class ProductoAdmin(admin.ModelAdmin):
     list_display = ['nombre', 'categoria', 'precio_formateado', 'estado', 'vendedor', 'publicado_en']
     list_filter = ['estado', 'categoria', 'condicion', 'tipo_envio']
+    list_select_related = ['categoria', 'vendedor']
     search_fields = ['nombre', 'descripcion', 'tags']
-    readonly_fields = ['publicado_en', 'actualizado_en', 'visitas']
+    readonly_fields = ['publicado_en', 'actualizado_en', 'visitas', 'cantidad_favoritos']
+    autocomplete_fields = ['vendedor']
     inlines = [ImagenProductoInline]
+    paginator = PaginadorEstimado
+    show_full_result_count = False
+    
+    def get_search_results(self, request, queryset, search_term):
+        # El índice full-text en vez de icontains sobre nombre, descripción y tags
+        if not search_term.strip():
+            return queryset, False
+        ids = buscar_productos(Producto.objects.all(), search_term, limite=LIMITE_BUSQUEDA_ADMIN)
+        return queryset.filter(id__in=ids), False
     
     def precio_formateado(self, obj):
         return obj.precio_formateado
@@ -29,7 +72,20 @@ class ProductoAdmin(admin.ModelAdmin):
 class FavoritoAdmin(admin.ModelAdmin):
     list_display = ['estudiante', 'producto', 'agregado_en']
     list_filter = ['agregado_en']
-    search_fields = ['estudiante__user__username', 'producto__nombre']
+    list_select_related = ['estudiante', 'producto']
+    search_fields = ['^estudiante__apodo', '=estudiante__correo']
     readonly_fields = ['agregado_en']
+    autocomplete_fields = ['estudiante', 'producto']
+    paginator = PaginadorEstimado
+    show_full_result_count = False
+    
+    def get_search_results(self, request, queryset, search_term):
+        # Además del estudiante, el nombre del producto por el índice full-text
+        resultados, duplicados = super().get_search_results(request, queryset, search_term)
+        ids = buscar_productos(Producto.objects.all(), search_term, limite=LIMITE_BUSQUEDA_ADMIN)
+        if ids:
+            # Cada rama por su índice (id y producto), sin un OR sobre el JOIN
+            resultados = queryset.filter(Q(pk__in=resultados.values('pk')) | Q(producto_id__in=ids))
+        return resultados, duplicados
 
 admin.site.register(ImagenProducto) 
\ No newline at end of file
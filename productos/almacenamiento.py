@@ -0,0 +1,118 @@
+"""Almacenamiento de imágenes direccionado por contenido.
+
+Cada archivo se guarda una sola vez bajo el SHA-256 de su contenido
+(`productos/ab/cd/abcd....jpg`). Subir dos veces la misma foto, o duplicar un
+producto, reutiliza el mismo archivo; `ArchivoImagen` lleva la cuenta de
+cuántas ImagenProducto lo usan y el archivo se borra cuando nadie lo usa.
+"""
+
+import hashlib
+import os
+import posixpath
+import tempfile
+import time
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class AlmacenamientoPorContenido(FileSystemStorage):
+
+    def get_available_name(self, name, max_length=None):
+        # El nombre definitivo lo decide _save a partir del contenido
+        return name
+
+    def _save(self, name, content):
+        directorio, original = posixpath.split(name)
+        raiz, extension = os.path.splitext(original)
+        extension = extension.lower()
+        # Al volver a guardar un archivo ya direccionado, no anidar otro nivel
+        if len(raiz) == 64 and directorio.endswith(f"/{raiz[:2]}/{raiz[2:4]}"):
+            directorio = directorio[:-6]
+
+        # Copiar a un temporal calculando el hash en la misma pasada
+        os.makedirs(self.location, exist_ok=True)
+        resumen = hashlib.sha256()
+        descriptor, ruta_temporal = tempfile.mkstemp(dir=self.location, prefix='.subida-')
+        try:
+            with os.fdopen(descriptor, 'wb') as temporal:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for bloque in content.chunks():
+                    resumen.update(bloque)
+                    temporal.write(bloque)
+
+            digest = resumen.hexdigest()
+            nombre = posixpath.join(directorio, digest[:2], digest[2:4], digest + extension)
+            ruta = self.path(nombre)
+            if os.path.exists(ruta):
+                os.remove(ruta_temporal)
+                # Marcar el archivo como reutilizado: un borrado pendiente lo respeta
+                os.utime(ruta)
+            else:
+                os.makedirs(os.path.dirname(ruta), exist_ok=True)
+                os.replace(ruta_temporal, ruta)
+                if self.file_permissions_mode is not None:
+                    os.chmod(ruta, self.file_permissions_mode)
+        except BaseException:
+            if os.path.exists(ruta_temporal):
+                os.remove(ruta_temporal)
+            raise
+        return nombre
+
+
+def almacenamiento_imagenes():
+    # Sin location explícita: sigue a MEDIA_ROOT/MEDIA_URL aunque cambien (tests)
+    return AlmacenamientoPorContenido()
+
+
+def sumar_referencia(nombre):
+    from .models import ArchivoImagen
+
+    if not nombre:
+        return
+    ArchivoImagen.objects.get_or_create(nombre=nombre, defaults={'referencias': 0})
+    ArchivoImagen.objects.filter(nombre=nombre).update(referencias=F('referencias') + 1)
+
+
+def quitar_referencia(nombre, storage):
+    """Descontar una referencia y borrar el archivo si ya nadie lo usa"""
+    from .models import ArchivoImagen
+
+    if not nombre:
+        return
+    ArchivoImagen.objects.filter(nombre=nombre, referencias__gt=0).update(
+        referencias=F('referencias') - 1
+    )
+    borrados, _ = ArchivoImagen.objects.filter(nombre=nombre, referencias=0).delete()
+    if borrados:
+        momento = time.time()
+        transaction.on_commit(lambda: _borrar_si_huerfano(nombre, storage, momento))
+
+
+def _borrar_si_huerfano(nombre, storage, momento):
+    """Borrar el archivo salvo que una subida lo haya vuelto a usar.
+
+    Entre el borrado de la fila y este callback otra subida con el mismo
+    contenido puede reutilizar el archivo: crea de nuevo su ArchivoImagen o,
+    si todavía no llegó a crearlo, ya tocó el archivo en `_save`. La fila se
+    bloquea (o se crea vacía para bloquearla) mientras se decide.
+    """
+    from .models import ArchivoImagen
+
+    with transaction.atomic():
+        archivo, _ = ArchivoImagen.objects.select_for_update().get_or_create(
+            nombre=nombre, defaults={'referencias': 0},
+        )
+        if archivo.referencias:
+            return
+        archivo.delete()
+        try:
+            reutilizado = os.path.getmtime(storage.path(nombre)) >= momento
+        except FileNotFoundError:
+            return
+        if not reutilizado:
+            storage.delete(nombre)
@@ -0,0 +1,72 @@
+"""Búsqueda full-text de productos con ranking por relevancia.
+
+Uso desde las vistas::
+
+    ids = buscar_productos(queryset, 'calculadora científica')
+
+El índice se mantiene con las señales de `Producto` (ver `productos.signals`) y
+se reconstruye por completo con ``python manage.py reconstruir_indice_busqueda``.
+"""
+
+from django.db import connections, router
+
+from ..models import Producto
+from .analizador import analizar, documento
+from .backends import obtener_backend
+
+LIMITE_RESULTADOS = 240
+TAMANO_LOTE = 500
+
+
+def _backend():
+    return obtener_backend(connections[router.db_for_write(Producto)])
+
+
+def _fila(producto):
+    campos = documento(producto)
+    return (producto.id, campos['nombre'], campos['descripcion'], campos['tags'])
+
+
+def buscar_productos(queryset, consulta, limite=LIMITE_RESULTADOS, desde=0):
+    """Ids de productos del queryset que coinciden con la consulta, por relevancia.
+
+    `desde` salta los primeros resultados del ranking para pedir página a página.
+    """
+    terminos = analizar(consulta)
+    if not terminos:
+        return []
+    backend = obtener_backend(connections[queryset.db])
+    return backend.buscar(queryset, terminos, consulta, limite, desde)
+
+
+def indexar_producto(producto):
+    backend = _backend()
+    with backend.connection.cursor() as cursor:
+        backend.indexar(cursor, [_fila(producto)])
+
+
+def desindexar_producto(producto_id):
+    backend = _backend()
+    with backend.connection.cursor() as cursor:
+        backend.desindexar(cursor, [producto_id])
+
+
+def reconstruir_indice(tamano_lote=TAMANO_LOTE):
+    """Vaciar el índice y volver a indexar todos los productos por lotes"""
+    backend = _backend()
+    total = 0
+    productos = Producto.objects.only('id', 'nombre', 'descripcion', 'tags').order_by('id')
+    with backend.connection.cursor() as cursor:
+        backend.crear_tabla(cursor)
+        backend.vaciar(cursor)
+        lote = []
+        for producto in productos.iterator(chunk_size=tamano_lote):
+            lote.append(_fila(producto))
+            if len(lote) >= tamano_lote:
+                backend.indexar(cursor, lote)
+                total += len(lote)
+                lote = []
+        if lote:
+            backend.indexar(cursor, lote)
+            total += len(lote)
+    return total
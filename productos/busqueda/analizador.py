@@ -0,0 +1,90 @@
+"""Analizador de texto en español para el índice de búsqueda.
+
+Normaliza mayúsculas y tildes, elimina palabras vacías y reduce cada palabra a
+una raíz aproximada, de modo que "Calculadoras científicas" y "calculadora
+cientifica" produzcan los mismos términos. El mismo analizador se aplica al
+indexar y al consultar, así que basta con que sea consistente.
+"""
+
+import re
+import unicodedata
+
+PALABRAS_VACIAS = frozenset("""
+    a al algo algunas algunos ante antes como con contra cual cuando de del
+    desde donde durante e el ella ellos en entre era es esa ese eso esta estan
+    estas este esto estos fue ha hay la las le les lo los mas me mi muy nada
+    ni no nos o otra otras otro otros para pero poco por porque que quien se
+    ser si sin sobre son su sus tambien te tiene todo todos tu u un una uno
+    unos y ya yo
+""".split())
+
+# Ordenados de mayor a menor longitud para quitar siempre el sufijo más largo
+SUFIJOS = sorted([
+    'amientos', 'imientos', 'amiento', 'imiento', 'aciones', 'uciones',
+    'idades', 'adoras', 'adores', 'ancias', 'encias', 'mente', 'acion',
+    'ucion', 'idad', 'adora', 'ador', 'ancia', 'encia', 'ables', 'ibles',
+    'istas', 'ismos', 'able', 'ible', 'ista', 'ismo', 'osos', 'osas', 'ivos',
+    'ivas', 'oso', 'osa', 'ivo', 'iva',
+], key=len, reverse=True)
+
+LONGITUD_MINIMA_RAIZ = 3
+
+_PATRON_PALABRA = re.compile(r'[a-z0-9ñ]+')
+
+
+def plegar(texto):
+    """Minúsculas y sin tildes (conservando la ñ)"""
+    texto = texto.lower().replace('ñ', '\0')
+    descompuesto = unicodedata.normalize('NFKD', texto)
+    sin_tildes = ''.join(c for c in descompuesto if not unicodedata.combining(c))
+    return sin_tildes.replace('\0', 'ñ')
+
+
+def raiz(palabra):
+    """Stemmer ligero: quita un sufijo derivativo y luego plural y género"""
+    if len(palabra) <= LONGITUD_MINIMA_RAIZ or palabra.isdigit():
+        return palabra
+
+    for sufijo in SUFIJOS:
+        if palabra.endswith(sufijo) and len(palabra) - len(sufijo) >= LONGITUD_MINIMA_RAIZ:
+            palabra = palabra[:-len(sufijo)]
+            break
+
+    if palabra.endswith('es') and len(palabra) - 2 >= LONGITUD_MINIMA_RAIZ:
+        palabra = palabra[:-2]
+    elif palabra.endswith('s') and len(palabra) - 1 >= LONGITUD_MINIMA_RAIZ:
+        palabra = palabra[:-1]
+
+    if palabra[-1] in 'aeo' and len(palabra) - 1 >= LONGITUD_MINIMA_RAIZ:
+        palabra = palabra[:-1]
+
+    return palabra
+
+
+def analizar(texto):
+    """Lista de términos indexables de un texto libre"""
+    if not texto:
+        return []
+    terminos = []
+    for palabra in _PATRON_PALABRA.findall(plegar(texto)):
+        if palabra in PALABRAS_VACIAS:
+            continue
+        terminos.append(raiz(palabra))
+    return terminos
+
+
+def analizar_tags(tags):
+    """Términos de los tags separados por comas"""
+    terminos = []
+    for tag in (tags or '').split(','):
+        terminos.extend(analizar(tag))
+    return terminos
+
+
+def documento(producto):
+    """Campos analizados de un producto, listos para guardarse en el índice"""
+    return {
+        'nombre': ' '.join(analizar(producto.nombre)),
+        'descripcion': ' '.join(analizar(producto.descripcion)),
+        'tags': ' '.join(analizar_tags(producto.tags)),
+    }
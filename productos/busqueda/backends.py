@@ -0,0 +1,171 @@
+"""Backends del índice de búsqueda de productos.
+
+Cada backend guarda los campos ya analizados de cada producto en una tabla
+propia (FTS5 en SQLite, FULLTEXT en MySQL) y responde consultas con los ids
+ordenados por relevancia. El queryset recibido en `buscar` se usa como
+subconsulta, así que los filtros de estado y categoría se aplican dentro del
+mismo SELECT y las filas huérfanas del índice nunca llegan a la vista.
+"""
+
+from django.db.models import Q
+
+TABLA_INDICE = 'productos_busqueda'
+
+# Peso relativo de cada columna: un acierto en el nombre pesa más que en la descripción
+PESO_NOMBRE = 10.0
+PESO_DESCRIPCION = 1.0
+PESO_TAGS = 5.0
+
+
+class BackendBase:
+    """Interfaz común; también sirve de respaldo para motores sin full-text"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def crear_tabla(self, cursor):
+        pass
+
+    def eliminar_tabla(self, cursor):
+        pass
+
+    def indexar(self, cursor, filas):
+        """`filas` es una lista de (producto_id, nombre, descripcion, tags)"""
+        pass
+
+    def desindexar(self, cursor, ids):
+        pass
+
+    def vaciar(self, cursor):
+        pass
+
+    def buscar(self, queryset, terminos, consulta, limite, desde=0):
+        q = Q()
+        for palabra in consulta.split():
+            q &= (
+                Q(nombre__icontains=palabra) |
+                Q(descripcion__icontains=palabra) |
+                Q(tags__icontains=palabra)
+            )
+        return list(queryset.filter(q).values_list('id', flat=True)[desde:desde + limite])
+
+    def _restriccion(self, queryset, columna):
+        """Condición `AND columna IN (ids del queryset)`, vacía si el queryset no filtra.
+
+        Sin filtros la subconsulta sería la tabla entera y el planificador la
+        recorre buscando cada id en el índice (la búsqueda del admin).
+        """
+        if not queryset.query.where:
+            return '', []
+        sql, params = queryset.order_by().values('id').query.sql_with_params()
+        return f" AND {columna} IN ({sql})", list(params)
+
+
+class BackendSQLite(BackendBase):
+    """Tabla virtual FTS5 con rowid = id del producto y ranking BM25"""
+
+    def crear_tabla(self, cursor):
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLA_INDICE} "
+            f"USING fts5(nombre, descripcion, tags, tokenize='unicode61')"
+        )
+
+    def eliminar_tabla(self, cursor):
+        cursor.execute(f"DROP TABLE IF EXISTS {TABLA_INDICE}")
+
+    def indexar(self, cursor, filas):
+        self.desindexar(cursor, [fila[0] for fila in filas])
+        cursor.executemany(
+            f"INSERT INTO {TABLA_INDICE} (rowid, nombre, descripcion, tags) "
+            f"VALUES (%s, %s, %s, %s)",
+            filas,
+        )
+
+    def desindexar(self, cursor, ids):
+        cursor.executemany(
+            f"DELETE FROM {TABLA_INDICE} WHERE rowid = %s",
+            [(producto_id,) for producto_id in ids],
+        )
+
+    def vaciar(self, cursor):
+        cursor.execute(f"DELETE FROM {TABLA_INDICE}")
+
+    def buscar(self, queryset, terminos, consulta, limite, desde=0):
+        # Prefijo en cada término para que "calcu" encuentre "calculadora"
+        expresion = ' AND '.join(f'"{termino}"*' for termino in terminos)
+        # `+rowid` impide que SQLite recorra los ids del queryset y busque cada
+        # uno en el índice FTS: primero MATCH y después el filtro por ids
+        restriccion, params = self._restriccion(queryset, '+rowid')
+        sql = (
+            f"SELECT rowid FROM {TABLA_INDICE} "
+            f"WHERE {TABLA_INDICE} MATCH %s{restriccion} "
+            f"ORDER BY bm25({TABLA_INDICE}, %s, %s, %s), rowid LIMIT %s OFFSET %s"
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [
+                expresion, *params,
+                PESO_NOMBRE, PESO_DESCRIPCION, PESO_TAGS, limite, desde,
+            ])
+            return [fila[0] for fila in cursor.fetchall()]
+
+
+class BackendMySQL(BackendBase):
+    """Tabla InnoDB con índice FULLTEXT en modo booleano"""
+
+    def crear_tabla(self, cursor):
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {TABLA_INDICE} ("
+            f"producto_id BIGINT NOT NULL PRIMARY KEY, "
+            f"nombre TEXT NOT NULL, "
+            f"descripcion TEXT NOT NULL, "
+            f"tags TEXT NOT NULL, "
+            f"FULLTEXT KEY {TABLA_INDICE}_nombre (nombre), "
+            f"FULLTEXT KEY {TABLA_INDICE}_todo (nombre, descripcion, tags)"
+            f") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"
+        )
+
+    def eliminar_tabla(self, cursor):
+        cursor.execute(f"DROP TABLE IF EXISTS {TABLA_INDICE}")
+
+    def indexar(self, cursor, filas):
+        cursor.executemany(
+            f"REPLACE INTO {TABLA_INDICE} (producto_id, nombre, descripcion, tags) "
+            f"VALUES (%s, %s, %s, %s)",
+            filas,
+        )
+
+    def desindexar(self, cursor, ids):
+        cursor.executemany(
+            f"DELETE FROM {TABLA_INDICE} WHERE producto_id = %s",
+            [(producto_id,) for producto_id in ids],
+        )
+
+    def vaciar(self, cursor):
+        cursor.execute(f"DELETE FROM {TABLA_INDICE}")
+
+    def buscar(self, queryset, terminos, consulta, limite, desde=0):
+        expresion = ' '.join(f'+{termino}*' for termino in terminos)
+        restriccion, params = self._restriccion(queryset, 'producto_id')
+        sql = (
+            f"SELECT producto_id, "
+            f"MATCH(nombre) AGAINST (%s IN BOOLEAN MODE) * %s + "
+            f"MATCH(nombre, descripcion, tags) AGAINST (%s IN BOOLEAN MODE) AS puntaje "
+            f"FROM {TABLA_INDICE} "
+            f"WHERE MATCH(nombre, descripcion, tags) AGAINST (%s IN BOOLEAN MODE){restriccion} "
+            f"ORDER BY puntaje DESC, producto_id LIMIT %s OFFSET %s"
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [
+                expresion, PESO_NOMBRE, expresion, expresion, *params, limite, desde,
+            ])
+            return [fila[0] for fila in cursor.fetchall()]
+
+
+BACKENDS = {
+    'sqlite': BackendSQLite,
+    'mysql': BackendMySQL,
+}
+
+
+def obtener_backend(connection):
+    return BACKENDS.get(connection.vendor, BackendBase)(connection)
@@ -0,0 +1,153 @@
+"""Caché de páginas del catálogo público con invalidación por versiones.
+
+Cada página cacheada se guarda bajo una clave que incluye números de versión:
+uno global del catálogo, uno por categoría y uno para la lista de categorías.
+Cuando cambia un producto, una imagen o una categoría se incrementa la versión
+correspondiente (ver `productos.signals`), con lo que las claves viejas dejan
+de usarse y expiran solas; nunca hay que borrar páginas una por una.
+
+Las versiones solo sirven si todos los procesos las ven: con una caché por
+proceso (LocMemCache) el worker que atiende una venta incrementaría solo su
+copia y los demás seguirían sirviendo el listado viejo. En ese caso no se
+cachea ninguna página.
+"""
+
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from marketcampus.caches import cache_compartida
+
+PREFIJO = 'catalogo'
+PARAMETROS_CATALOGO = ('q', 'categoria', 'cursor')
+
+
+def _tiempo():
+    return getattr(settings, 'CATALOGO_CACHE_SEGUNDOS', 300)
+
+
+def _clave_version(*partes):
+    return ':'.join([PREFIJO, 'version', *map(str, partes)])
+
+
+def _version(clave):
+    # add() no pisa un valor existente; así la primera lectura fija la versión 1
+    cache.add(clave, 1, None)
+    return cache.get(clave, 1)
+
+
+def _incrementar(clave):
+    try:
+        cache.incr(clave)
+    except ValueError:
+        cache.set(clave, 2, None)
+
+
+def invalidar_catalogo(*categorias_ids):
+    """Invalidar los listados generales y los de las categorías indicadas"""
+    _incrementar(_clave_version('global'))
+    for categoria_id in set(categorias_ids):
+        if categoria_id:
+            _incrementar(_clave_version('categoria', categoria_id))
+
+
+def invalidar_categorias():
+    """La lista de categorías aparece en todas las páginas del catálogo"""
+    _incrementar(_clave_version('categorias'))
+
+
+def normalizar_parametros(request, **fijos):
+    """Parámetros relevantes de la URL con un formato canónico"""
+    parametros = {
+        'q': ' '.join(request.GET.get('q', '').lower().split()),
+        'categoria': request.GET.get('categoria', '').strip(),
+        'cursor': request.GET.get('cursor', '').strip(),
+    }
+    if not parametros['categoria'].isdigit():
+        parametros['categoria'] = ''
+    parametros.update({nombre: str(valor) for nombre, valor in fijos.items()})
+    return parametros
+
+
+def version_catalogo(categoria_id=None):
+    """Versión de los listados de una categoría (o de todos) y de la lista de categorías"""
+    if categoria_id:
+        version = _version(_clave_version('categoria', categoria_id))
+    else:
+        version = _version(_clave_version('global'))
+    version_categorias = _version(_clave_version('categorias'))
+    return f"{version_categorias}.{version}"
+
+
+def resumen_parametros(parametros):
+    crudo = '&'.join(f"{nombre}={parametros[nombre]}" for nombre in sorted(parametros))
+    return hashlib.md5(crudo.encode(), usedforsecurity=False).hexdigest()
+
+
+def clave_pagina(nombre_vista, parametros):
+    version = version_catalogo(parametros.get('categoria'))
+    return f"{PREFIJO}:pagina:{nombre_vista}:{version}:{resumen_parametros(parametros)}"
+
+
+def parametros_fijos(kwargs):
+    """Argumentos de la URL que cuentan como parámetros del listado"""
+    if 'categoria_id' in kwargs:
+        return {'categoria': kwargs['categoria_id']}
+    return {}
+
+
+def _cacheable_para(metodo):
+    return metodo in ('GET', 'HEAD') and cache_compartida()
+
+
+def _es_cacheable(respuesta):
+    return respuesta.status_code == 200 and not respuesta.cookies
+
+
+def cachear_catalogo(vista):
+    """Cachear la respuesta de una vista pública del catálogo para anónimos.
+
+    Los argumentos de la URL (por ejemplo `categoria_id`) forman parte de la
+    clave como si fueran parámetros de la consulta. Acepta vistas async. Sin
+    caché compartida la vista responde siempre sin cachear.
+    """
+    if iscoroutinefunction(vista):
+        @wraps(vista)
+        async def envoltura_async(request, *args, **kwargs):
+            if not _cacheable_para(request.method) or (await request.auser()).is_authenticated:
+                return await vista(request, *args, **kwargs)
+
+            parametros = normalizar_parametros(request, **parametros_fijos(kwargs))
+            clave = await sync_to_async(clave_pagina)(vista.__name__, parametros)
+
+            respuesta = await cache.aget(clave)
+            if respuesta is not None:
+                return respuesta
+
+            respuesta = await vista(request, *args, **kwargs)
+            if _es_cacheable(respuesta):
+                await cache.aset(clave, respuesta, _tiempo())
+            return respuesta
+
+        return envoltura_async
+
+    @wraps(vista)
+    def envoltura(request, *args, **kwargs):
+        if not _cacheable_para(request.method) or request.user.is_authenticated:
+            return vista(request, *args, **kwargs)
+
+        clave = clave_pagina(vista.__name__, normalizar_parametros(request, **parametros_fijos(kwargs)))
+
+        respuesta = cache.get(clave)
+        if respuesta is not None:
+            return respuesta
+
+        respuesta = vista(request, *args, **kwargs)
+        if _es_cacheable(respuesta):
+            cache.set(clave, respuesta, _tiempo())
+        return respuesta
+
+    return envoltura
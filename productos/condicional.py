@@ -0,0 +1,133 @@
+"""Peticiones condicionales (ETag / Last-Modified) del catálogo y del detalle.
+
+Antes de ejecutar la vista se calcula un validador barato: la fecha del último
+cambio (`Producto.actualizado_en`) y un ETag que además incluye las versiones
+del catálogo de `productos.cache`, el usuario, su secreto CSRF y lo que la
+página muestra distinto por usuario. Si el navegador ya tiene esa versión
+recibe un 304 sin que la vista consulte ni renderice nada.
+
+Las visitas y los contadores de favoritos se escriben con UPDATE ... F() y no
+tocan `actualizado_en`, así que no invalidan el validador: los números de las
+tarjetas pueden quedar atrasados hasta el próximo cambio real, igual que en
+la caché de páginas del catálogo. Un 304 del detalle cuenta la visita igual
+(`contar_visita`).
+
+Las versiones del catálogo solo son fiables con una caché compartida entre
+procesos; sin ella los validadores no validan y las vistas responden siempre
+completas.
+"""
+
+import hashlib
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db.models import Exists, Max, OuterRef
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from marketcampus.caches import cache_compartida
+
+from .cache import normalizar_parametros, parametros_fijos, resumen_parametros, version_catalogo
+from .contadores import registrar_visita
+from .models import Favorito, Producto
+
+
+def _etag(*partes):
+    crudo = '|'.join(map(str, partes))
+    return quote_etag(hashlib.md5(crudo.encode(), usedforsecurity=False).hexdigest())
+
+
+def _secreto_csrf(request):
+    # Cambia al iniciar sesión (rotate_token): una página con {% csrf_token %}
+    # guardada antes ya no sirve para enviar sus formularios
+    return request.META.get('CSRF_COOKIE', '')
+
+
+def respuesta_condicional(validador, sin_cambios=None):
+    """Responder 304 si la página no cambió desde la copia del navegador.
+
+    `validador(request, *args, **kwargs)` es async y devuelve (etag, última
+    modificación) o None si no puede validar (por ejemplo, si el objeto no
+    existe); en ese caso la vista responde como siempre. `sin_cambios`, con
+    los mismos argumentos, hace en los 304 lo que la vista no llega a hacer.
+    """
+    def decorador(vista):
+        @wraps(vista)
+        async def envoltura(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return await vista(request, *args, **kwargs)
+            validacion = await validador(request, *args, **kwargs)
+            if validacion is None:
+                return await vista(request, *args, **kwargs)
+
+            etag, ultima_modificacion = validacion
+            marca = int(ultima_modificacion.timestamp()) if ultima_modificacion else None
+            respuesta = get_conditional_response(request, etag=etag, last_modified=marca)
+            if respuesta is not None and respuesta.status_code == 304 and sin_cambios:
+                await sin_cambios(request, *args, **kwargs)
+            if respuesta is None:
+                respuesta = await vista(request, *args, **kwargs)
+                if respuesta.status_code != 200:
+                    return respuesta
+                respuesta.headers.setdefault('ETag', etag)
+                if marca:
+                    respuesta.headers.setdefault('Last-Modified', http_date(marca))
+
+            # El navegador puede guardar la página pero debe revalidarla siempre;
+            # las de usuarios con sesión no las guardan los proxies
+            autenticado = (await request.auser()).is_authenticated
+            patch_cache_control(respuesta, no_cache=True, private=autenticado, public=not autenticado)
+            return respuesta
+
+        return envoltura
+
+    return decorador
+
+
+async def validar_listado(request, *args, **kwargs):
+    """Validador de `explorar` y de las páginas de categoría"""
+    if not cache_compartida():
+        return None
+    parametros = normalizar_parametros(request, **parametros_fijos(kwargs))
+    productos = Producto.objects.all()
+    if parametros['categoria']:
+        productos = productos.filter(categoria_id=parametros['categoria'])
+    # Sobre todos los estados: un producto que se vende o se desactiva deja el
+    # listado pero su actualizado_en cambia igual
+    ultimo_cambio = (await productos.aaggregate(ultimo=Max('actualizado_en')))['ultimo']
+    version = await sync_to_async(version_catalogo)(parametros['categoria'])
+    user = await request.auser()
+    etag = _etag(
+        request.resolver_match.view_name, resumen_parametros(parametros), version, ultimo_cambio,
+        user.id, _secreto_csrf(request),
+    )
+    return etag, ultimo_cambio
+
+
+async def validar_detalle(request, producto_id):
+    """Validador del detalle: el producto, sus vecinos y si es favorito del usuario"""
+    if not cache_compartida():
+        return None
+    user = await request.auser()
+    fila = await (
+        Producto.objects.filter(id=producto_id)
+        .annotate(es_favorito=Exists(
+            Favorito.objects.filter(producto=OuterRef('pk'), estudiante__user_id=user.id)
+        ))
+        .values('actualizado_en', 'similares_calculados_en', 'es_favorito')
+        .afirst()
+    )
+    if fila is None:
+        return None
+    ultimo_cambio = max(filter(None, (fila['actualizado_en'], fila['similares_calculados_en'])))
+    # Los vecinos y relacionados pueden ser de cualquier categoría
+    version = await sync_to_async(version_catalogo)()
+    etag = _etag(
+        'detalle', producto_id, ultimo_cambio, fila['es_favorito'], version, user.id, _secreto_csrf(request),
+    )
+    return etag, ultimo_cambio
+
+
+async def contar_visita(request, producto_id):
+    """Un 304 del detalle también es una visita"""
+    await sync_to_async(registrar_visita)(producto_id)
@@ -0,0 +1,207 @@
+"""Contadores desnormalizados de Producto.
+
+Los incrementos se hacen con expresiones F() en un UPDATE, así que son
+atómicos en la base de datos y no dependen de la instancia cargada en memoria.
+"""
+
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import (
+    Case, Count, F, OuterRef, PositiveIntegerField, Subquery, Value, When,
+)
+from django.db.models.functions import Coalesce, Greatest
+
+from marketcampus.caches import cache_compartida
+from marketcampus.replicas import escritura_interna
+
+from .estadisticas import registrar_evento, registrar_visitas
+from .models import EventoProducto, Favorito, Producto
+
+
+def sumar_favoritos(producto_id, cantidad):
+    """Sumar (o restar, con cantidad negativa) favoritos a un producto"""
+    Producto.objects.filter(pk=producto_id).update(
+        cantidad_favoritos=Greatest(F('cantidad_favoritos') + cantidad, Value(0))
+    )
+
+
+def recalcular_favoritos(productos=None):
+    """Recalcular `cantidad_favoritos` desde la tabla Favorito.
+
+    Útil tras cargas con bulk_create, que no disparan señales. Devuelve la
+    cantidad de productos actualizados.
+    """
+    if productos is None:
+        productos = Producto.objects.all()
+    conteo = Favorito.objects.filter(producto=OuterRef('pk')).order_by().values(
+        'producto'
+    ).annotate(total=Count('id')).values('total')
+    return productos.update(
+        cantidad_favoritos=Coalesce(Subquery(conteo), Value(0))
+    )
+
+
+# --- Visitas (write-behind) ---------------------------------------------------
+#
+# Cada visita solo toca la caché: se suma a un contador por producto dentro de
+# una ventana de tiempo ("cubeta"). Cuando una cubeta se cierra, o cuando se
+# acumulan demasiadas visitas pendientes, los contadores se vuelcan a la base
+# de datos en lotes con UPDATE ... SET visitas = visitas + n. Las cubetas
+# cerradas ya no reciben escrituras, así que vaciarlas no compite con las
+# visitas nuevas. El búfer necesita una caché compartida (Redis/Memcached):
+# con una caché por proceso el comando `vaciar_visitas` no vería las visitas
+# de los workers, que se perderían al reiniciarse, así que en ese caso cada
+# visita se escribe directamente en la base de datos.
+
+PREFIJO_VISITAS = 'visitas'
+LOTE_VISITAS = 500
+EXPIRACION_VISITAS = 24 * 60 * 60
+
+_ultima_cubeta_vista = None
+
+
+def _intervalo():
+    return getattr(settings, 'VISITAS_INTERVALO_SEGUNDOS', 60)
+
+
+def _max_pendientes():
+    return getattr(settings, 'VISITAS_MAX_PENDIENTES', 1000)
+
+
+def _cubeta_actual():
+    return int(time.time() // _intervalo())
+
+
+def _clave(cubeta, *partes):
+    return ':'.join([PREFIJO_VISITAS, str(cubeta), *map(str, partes)])
+
+
+def _incrementar(clave):
+    """incr atómico que crea la clave si no existe; devuelve (valor, es_nueva)"""
+    if cache.add(clave, 1, EXPIRACION_VISITAS):
+        return 1, True
+    try:
+        return cache.incr(clave), False
+    except ValueError:
+        # La clave expiró entre add() e incr()
+        cache.set(clave, 1, EXPIRACION_VISITAS)
+        return 1, True
+
+
+def registrar_visita(producto_id):
+    """Anotar una visita en la caché sin escribir en la base de datos.
+
+    Si la caché no es compartida entre procesos la visita se suma directamente.
+    Ninguna de las dos formas fija al navegador en la primaria.
+    """
+    with escritura_interna():
+        _registrar_visita(producto_id)
+
+
+def _registrar_visita(producto_id):
+    global _ultima_cubeta_vista
+    if not cache_compartida():
+        registrar_evento(producto_id, EventoProducto.TIPO_VISITAS)
+        Producto.objects.filter(pk=producto_id).update(visitas=F('visitas') + 1)
+        return
+    cubeta = _cubeta_actual()
+
+    _, es_nueva = _incrementar(_clave(cubeta, 'p', producto_id))
+    if es_nueva:
+        posicion, _ = _incrementar(_clave(cubeta, 'seq'))
+        cache.set(_clave(cubeta, 'id', posicion), producto_id, EXPIRACION_VISITAS)
+
+    pendientes, _ = _incrementar(_clave(cubeta, 'total'))
+    if pendientes % _max_pendientes() == 0:
+        vaciar_visitas(incluir_actual=True)
+    elif cubeta != _ultima_cubeta_vista:
+        # Primera visita de este proceso en una cubeta nueva: volcar las cerradas
+        _ultima_cubeta_vista = cubeta
+        vaciar_visitas()
+
+
+def _pendientes_de(cubeta):
+    """{producto_id: visitas} acumuladas en una cubeta"""
+    total_ids = cache.get(_clave(cubeta, 'seq'), 0)
+    if not total_ids:
+        return {}
+    claves_ids = [_clave(cubeta, 'id', n) for n in range(1, total_ids + 1)]
+    ids = [i for i in cache.get_many(claves_ids).values() if i is not None]
+    claves = {_clave(cubeta, 'p', producto_id): producto_id for producto_id in ids}
+    return {
+        claves[clave]: valor
+        for clave, valor in cache.get_many(list(claves)).items()
+        if valor
+    }
+
+
+def _aplicar(visitas, cubeta):
+    """Sumar visitas en la base de datos con un UPDATE por lote de productos.
+
+    También quedan como eventos con la hora de la cubeta, para las
+    estadísticas diarias.
+    """
+    registrar_visitas(visitas, datetime.fromtimestamp(cubeta * _intervalo(), tz=dt_timezone.utc))
+    ids = list(visitas)
+    for inicio in range(0, len(ids), LOTE_VISITAS):
+        lote = ids[inicio:inicio + LOTE_VISITAS]
+        incremento = Case(
+            *[When(pk=producto_id, then=Value(visitas[producto_id])) for producto_id in lote],
+            default=Value(0),
+            output_field=PositiveIntegerField(),
+        )
+        Producto.objects.filter(pk__in=lote).update(visitas=F('visitas') + incremento)
+
+
+def _borrar_cubeta(cubeta, ids):
+    total_ids = cache.get(_clave(cubeta, 'seq'), 0)
+    claves = [_clave(cubeta, 'p', producto_id) for producto_id in ids]
+    claves += [_clave(cubeta, 'id', n) for n in range(1, total_ids + 1)]
+    claves += [_clave(cubeta, 'seq'), _clave(cubeta, 'total')]
+    cache.delete_many(claves)
+
+
+def vaciar_visitas(incluir_actual=False):
+    """Volcar a la base de datos las visitas de las cubetas cerradas.
+
+    Con `incluir_actual=True` también se vuelca la cubeta en curso; en ese caso
+    sus contadores se decrementan en lugar de borrarse para no perder visitas
+    que lleguen mientras tanto. Devuelve el total de visitas escritas.
+    """
+    if not cache.add(_clave('bloqueo'), 1, _intervalo()):
+        return 0  # Otro proceso está vaciando
+
+    try:
+        actual = _cubeta_actual()
+        clave_ultima = _clave('ultima_vaciada')
+        ultima = cache.get(clave_ultima)
+        # Las claves expiran, así que no tiene sentido mirar más atrás
+        desde = actual - EXPIRACION_VISITAS // _intervalo()
+        if ultima is not None:
+            desde = max(desde, ultima + 1)
+        escritas = 0
+
+        claves_seq = {_clave(cubeta, 'seq'): cubeta for cubeta in range(desde, actual)}
+        for cubeta in sorted(claves_seq[clave] for clave in cache.get_many(list(claves_seq))):
+            visitas = _pendientes_de(cubeta)
+            with transaction.atomic():
+                _aplicar(visitas, cubeta)
+            _borrar_cubeta(cubeta, visitas)
+            escritas += sum(visitas.values())
+        cache.set(clave_ultima, actual - 1, None)
+
+        if incluir_actual:
+            visitas = _pendientes_de(actual)
+            with transaction.atomic():
+                _aplicar(visitas, actual)
+            for producto_id, cantidad in visitas.items():
+                cache.decr(_clave(actual, 'p', producto_id), cantidad)
+            escritas += sum(visitas.values())
+
+        return escritas
+    finally:
+        cache.delete(_clave('bloqueo'))
@@ -0,0 +1,261 @@
+"""Generador de datos sintéticos con distribuciones realistas.
+
+Pocos vendedores publican la mayoría de los productos y pocos productos se
+llevan la mayoría de los favoritos (ley de potencias / Zipf); las categorías,
+estados y estrellas siguen proporciones parecidas a las de producción. Todo se
+inserta con `bulk_create` por lotes, así que no se disparan señales: al final
+se recalculan los contadores desnormalizados y el índice de búsqueda.
+
+Lo usan los comandos `generar_datos` y `medir_vistas`.
+"""
+
+import io
+import itertools
+import random
+import uuid
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import F, Max
+from PIL import Image
+
+from usuarios.models import Calificacion, Estudiante
+
+from .busqueda import reconstruir_indice
+from .cache import invalidar_catalogo, invalidar_categorias
+from .contadores import recalcular_favoritos
+from .models import ArchivoImagen, Categoria, Favorito, ImagenProducto, Producto
+
+TAMANO_LOTE = 1000
+CLAVE_SINTETICA = 'marketu-sintetico'
+
+# Exponentes de las leyes de potencias (mayor = más concentrado)
+EXPONENTE_VENDEDORES = 1.1
+EXPONENTE_POPULARIDAD = 0.9
+
+PESOS_ESTADO = {'disponible': 70, 'vendido': 15, 'reservado': 10, 'inactivo': 5}
+PESOS_ESTRELLAS = {1: 3, 2: 5, 3: 12, 4: 30, 5: 50}
+
+PALABRAS = {
+    'libros_texto': ['Libro', 'Cálculo', 'Física', 'Química', 'Álgebra', 'Edición', 'Tomo'],
+    'apuntes_guias': ['Apuntes', 'Guía', 'Resumen', 'Ejercicios', 'Parcial', 'Examen'],
+    'electronica': ['Calculadora', 'Laptop', 'Audífonos', 'Mouse', 'Teclado', 'Cargador'],
+    'instrumentos_laboratorio': ['Mandil', 'Gafas', 'Pipeta', 'Microscopio', 'Kit'],
+    'ropa': ['Camiseta', 'Buzo', 'Chompa', 'Zapatos', 'Gorra'],
+    'deportes': ['Balón', 'Raqueta', 'Bicicleta', 'Pesas', 'Guantes'],
+    'comida': ['Galletas', 'Brownies', 'Almuerzo', 'Café', 'Sánduches'],
+    'accesorios': ['Mochila', 'Termo', 'Estuche', 'Lámpara', 'Agenda'],
+    'muebles_hogar': ['Escritorio', 'Silla', 'Repisa', 'Colchón', 'Mesa'],
+    'arte_musica': ['Guitarra', 'Pinceles', 'Acuarelas', 'Teclado musical', 'Lienzo'],
+    'servicios': ['Tutoría', 'Clases', 'Impresiones', 'Diseño', 'Traducción'],
+    'otros': ['Varios', 'Artículo', 'Paquete', 'Combo'],
+}
+ADJETIVOS = ['usado', 'nuevo', 'económico', 'original', 'básico', 'avanzado', 'completo']
+
+
+def pesos_zipf(cantidad, exponente, rng):
+    """Pesos 1/rango^s en orden aleatorio, para que el id no delate la popularidad"""
+    pesos = [1 / (rango + 1) ** exponente for rango in range(cantidad)]
+    rng.shuffle(pesos)
+    return pesos
+
+
+def _ultimo_id(modelo):
+    return modelo.objects.aggregate(maximo=Max('id'))['maximo'] or 0
+
+
+def _ids_nuevos(modelo, desde):
+    # bulk_create no devuelve ids en todos los motores (MySQL): se releen
+    return list(modelo.objects.filter(id__gt=desde).order_by('id').values_list('id', flat=True))
+
+
+def _crear_categorias():
+    for nombre, _ in Categoria.CATEGORIAS_UNIVERSITARIAS:
+        Categoria.objects.get_or_create(nombre=nombre)
+    invalidar_categorias()
+    return list(Categoria.objects.values_list('id', 'nombre'))
+
+
+def _crear_estudiantes(cantidad, rng, tamano_lote):
+    universidades = [clave for clave, _ in Estudiante.UNIVERSIDADES]
+    clave = make_password(CLAVE_SINTETICA)
+    prefijo = uuid.uuid4().hex[:8]
+
+    desde_user = _ultimo_id(User)
+    User.objects.bulk_create([
+        User(
+            username=f"{prefijo}-{indice}@marketu.test", email=f"{prefijo}-{indice}@marketu.test",
+            password=clave, first_name=f"Estudiante{indice}", last_name='Sintético',
+        )
+        for indice in range(cantidad)
+    ], batch_size=tamano_lote)
+    users = User.objects.filter(id__gt=desde_user).order_by('id').values_list('id', 'username')
+
+    desde = _ultimo_id(Estudiante)
+    Estudiante.objects.bulk_create([
+        Estudiante(
+            user_id=user_id, nombres=username.split('@')[0], apellidos='Sintético',
+            apodo=username.split('@')[0], correo=username,
+            universidad=rng.choice(universidades),
+        )
+        for user_id, username in users
+    ], batch_size=tamano_lote)
+    return _ids_nuevos(Estudiante, desde)
+
+
+def _imagenes_base(categorias):
+    """Una imagen de color por categoría; el almacenamiento por contenido las comparte"""
+    storage = ImagenProducto._meta.get_field('imagen').storage
+    nombres = {}
+    for indice, (categoria_id, _) in enumerate(categorias):
+        color = (40 + indice * 17 % 200, 90 + indice * 29 % 160, 140 + indice * 11 % 110)
+        salida = io.BytesIO()
+        Image.new('RGB', (800, 600), color).save(salida, 'JPEG', quality=80)
+        nombres[categoria_id] = storage.save('productos/sintetico.jpg', ContentFile(salida.getvalue()))
+    return nombres
+
+
+def _producto(rng, vendedor_id, categoria_id, nombre_categoria):
+    palabras = PALABRAS.get(nombre_categoria, PALABRAS['otros'])
+    nombre = f"{rng.choice(palabras)} {rng.choice(ADJETIVOS)} {rng.randint(1, 999)}"
+    estado = rng.choices(list(PESOS_ESTADO), weights=list(PESOS_ESTADO.values()))[0]
+    condicion = rng.choice([clave for clave, _ in Producto.CONDICION_OPCIONES])
+    precio = max(Decimal(str(round(min(rng.lognormvariate(3, 1), 5000), 2))), Decimal('0.50'))
+    return Producto(
+        nombre=nombre,
+        descripcion=f"{nombre} en estado {condicion}. " + ' '.join(rng.sample(palabras, min(3, len(palabras)))),
+        categoria_id=categoria_id, precio=precio, condicion=condicion, estado=estado,
+        tipo_envio=rng.choice(['recoger', 'envio', 'ambos']), vendedor_id=vendedor_id,
+        visitas=int(rng.paretovariate(1.2) * 5), tags=','.join(rng.sample(palabras, 2)),
+    )
+
+
+def _crear_productos(cantidad, vendedores, categorias, rng, tamano_lote):
+    # Un solo choices(k=...) por distribución: elegir de uno en uno es O(n) cada vez
+    elegidos_vendedores = rng.choices(
+        vendedores, weights=pesos_zipf(len(vendedores), EXPONENTE_VENDEDORES, rng), k=cantidad,
+    )
+    elegidas_categorias = rng.choices(
+        categorias, weights=pesos_zipf(len(categorias), 0.7, rng), k=cantidad,
+    )
+    desde = _ultimo_id(Producto)
+    lote = []
+    for vendedor_id, (categoria_id, nombre_categoria) in zip(elegidos_vendedores, elegidas_categorias):
+        lote.append(_producto(rng, vendedor_id, categoria_id, nombre_categoria))
+        if len(lote) >= tamano_lote:
+            Producto.objects.bulk_create(lote)
+            lote = []
+    if lote:
+        Producto.objects.bulk_create(lote)
+    return list(
+        Producto.objects.filter(id__gt=desde).order_by('id').values_list('id', 'categoria_id')
+    )
+
+
+def _crear_imagenes(productos, por_producto, categorias, tamano_lote):
+    if not por_producto:
+        return 0
+    nombres = _imagenes_base(categorias)
+    lote = []
+    usos = {}
+    for producto_id, categoria_id in productos:
+        nombre = nombres[categoria_id]
+        for orden in range(por_producto):
+            lote.append(ImagenProducto(
+                producto_id=producto_id, imagen=nombre, orden=orden,
+                estado=ImagenProducto.ESTADO_LISTA,
+            ))
+        usos[nombre] = usos.get(nombre, 0) + por_producto
+    ImagenProducto.objects.bulk_create(lote, batch_size=tamano_lote)
+    for nombre, veces in usos.items():
+        ArchivoImagen.objects.get_or_create(nombre=nombre, defaults={'referencias': 0})
+        ArchivoImagen.objects.filter(nombre=nombre).update(referencias=F('referencias') + veces)
+    return len(lote)
+
+
+def _pares_unicos(cantidad, izquierda, derecha, pesos_derecha, rng, excluir=None):
+    """Pares (a, b) distintos con b elegido según `pesos_derecha`"""
+    excluir = excluir or set()
+    pares = set()
+    acumulados = list(itertools.accumulate(pesos_derecha))
+    intentos = 0
+    while len(pares) < cantidad and intentos < cantidad * 20:
+        faltan = cantidad - len(pares)
+        for b in rng.choices(derecha, cum_weights=acumulados, k=faltan):
+            a = rng.choice(izquierda)
+            if a != b and (a, b) not in excluir:
+                pares.add((a, b))
+        intentos += faltan
+    return pares
+
+
+def _crear_favoritos(cantidad, estudiantes, productos, rng, tamano_lote):
+    ids = [producto_id for producto_id, _ in productos]
+    existentes = set(Favorito.objects.values_list('estudiante_id', 'producto_id'))
+    pares = _pares_unicos(
+        cantidad, estudiantes, ids, pesos_zipf(len(ids), EXPONENTE_POPULARIDAD, rng), rng,
+        excluir=existentes,
+    )
+    Favorito.objects.bulk_create(
+        [Favorito(estudiante_id=a, producto_id=b) for a, b in pares], batch_size=tamano_lote,
+    )
+    return len(pares)
+
+
+def _crear_calificaciones(cantidad, estudiantes, vendedores, rng, tamano_lote):
+    existentes = set(
+        Calificacion.objects.filter(producto__isnull=True).values_list('calificador_id', 'calificado_id')
+    )
+    pares = _pares_unicos(
+        cantidad, estudiantes, vendedores,
+        pesos_zipf(len(vendedores), EXPONENTE_VENDEDORES, rng), rng, excluir=existentes,
+    )
+    estrellas = list(PESOS_ESTRELLAS)
+    pesos = list(PESOS_ESTRELLAS.values())
+    Calificacion.objects.bulk_create([
+        Calificacion(
+            calificador_id=a, calificado_id=b,
+            estrellas=rng.choices(estrellas, weights=pesos)[0], comentario='Buena experiencia',
+        )
+        for a, b in pares
+    ], batch_size=tamano_lote)
+    return len(pares)
+
+
+def generar(estudiantes=0, productos=0, imagenes_por_producto=1, favoritos=0,
+            calificaciones=0, semilla=None, tamano_lote=TAMANO_LOTE):
+    """Crear datos sintéticos y dejar consistentes los agregados. Devuelve los totales creados."""
+    rng = random.Random(semilla)
+    with transaction.atomic():
+        categorias = _crear_categorias()
+        nuevos_estudiantes = _crear_estudiantes(estudiantes, rng, tamano_lote)
+        todos_estudiantes = list(Estudiante.objects.values_list('id', flat=True))
+        if not todos_estudiantes:
+            raise ValueError("Se necesita al menos un estudiante para crear productos")
+
+        nuevos_productos = _crear_productos(productos, todos_estudiantes, categorias, rng, tamano_lote)
+        imagenes = _crear_imagenes(nuevos_productos, imagenes_por_producto, categorias, tamano_lote)
+        todos_productos = list(Producto.objects.values_list('id', 'categoria_id'))
+        cantidad_favoritos = _crear_favoritos(favoritos, todos_estudiantes, todos_productos, rng, tamano_lote)
+
+        vendedores = list(Producto.objects.values_list('vendedor_id', flat=True).distinct())
+        cantidad_calificaciones = _crear_calificaciones(
+            calificaciones, todos_estudiantes, vendedores or todos_estudiantes, rng, tamano_lote,
+        )
+
+        # bulk_create no dispara señales: recalcular lo desnormalizado
+        recalcular_favoritos()
+        Estudiante.recalcular_calificaciones()
+    reconstruir_indice()
+    invalidar_catalogo()
+
+    return {
+        'estudiantes': len(nuevos_estudiantes),
+        'productos': len(nuevos_productos),
+        'imagenes': imagenes,
+        'favoritos': cantidad_favoritos,
+        'calificaciones': cantidad_calificaciones,
+    }
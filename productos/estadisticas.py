@@ -0,0 +1,158 @@
+"""Estadísticas diarias por producto (visitas, favoritos y cambios de estado).
+
+Las vistas y señales solo insertan filas en EventoProducto; el comando
+`consolidar_estadisticas` las suma por producto y día en EstadisticaDiaria,
+de forma incremental, y borra los eventos ya consolidados. Las tendencias del
+vendedor se leen de EstadisticaDiaria con un rango sobre (vendedor, fecha).
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import EstadisticaDiaria, EventoProducto, Producto
+
+LOTE_EVENTOS = 5000
+PERIODOS = (7, 30, 90)
+# Columna de EstadisticaDiaria que suma cada tipo de evento
+COLUMNAS = {
+    EventoProducto.TIPO_VISITAS: 'visitas',
+    EventoProducto.TIPO_FAVORITO: 'favoritos',
+    **{estado: f'a_{estado}' for estado, _ in Producto.ESTADO_OPCIONES},
+}
+
+
+def registrar_evento(producto_id, tipo, cantidad=1):
+    EventoProducto.objects.create(producto_id=producto_id, tipo=tipo, cantidad=cantidad)
+
+
+def registrar_cambios_estado(producto_ids, estado):
+    """Eventos de un cambio de estado masivo hecho con update()"""
+    EventoProducto.objects.bulk_create(
+        [EventoProducto(producto_id=producto_id, tipo=estado) for producto_id in producto_ids],
+        batch_size=LOTE_EVENTOS,
+    )
+
+
+def registrar_visitas(visitas, momento):
+    """Eventos de visitas {producto_id: cantidad} volcadas desde la caché"""
+    EventoProducto.objects.bulk_create(
+        [
+            EventoProducto(
+                producto_id=producto_id, tipo=EventoProducto.TIPO_VISITAS,
+                cantidad=cantidad, ocurrido_en=momento,
+            )
+            for producto_id, cantidad in visitas.items()
+        ],
+        batch_size=LOTE_EVENTOS,
+    )
+
+
+def _consolidar_lote(eventos):
+    sumas = defaultdict(lambda: defaultdict(int))
+    for producto_id, tipo, cantidad, ocurrido_en in eventos:
+        fecha = timezone.localdate(ocurrido_en)
+        sumas[(producto_id, fecha)][COLUMNAS[tipo]] += cantidad
+
+    productos = {producto_id for producto_id, _ in sumas}
+    vendedores = dict(Producto.objects.filter(pk__in=productos).values_list('id', 'vendedor_id'))
+    fechas = {fecha for _, fecha in sumas}
+    existentes = {
+        (fila.producto_id, fila.fecha): fila
+        for fila in EstadisticaDiaria.objects.filter(producto_id__in=productos, fecha__in=fechas)
+    }
+
+    nuevas, modificadas = [], []
+    for (producto_id, fecha), columnas in sumas.items():
+        if producto_id not in vendedores:
+            continue  # El producto se eliminó después del evento
+        fila = existentes.get((producto_id, fecha))
+        if fila is None:
+            nuevas.append(EstadisticaDiaria(
+                producto_id=producto_id, vendedor_id=vendedores[producto_id], fecha=fecha, **columnas,
+            ))
+            continue
+        for columna, cantidad in columnas.items():
+            setattr(fila, columna, getattr(fila, columna) + cantidad)
+        modificadas.append(fila)
+
+    EstadisticaDiaria.objects.bulk_create(nuevas, batch_size=LOTE_EVENTOS)
+    EstadisticaDiaria.objects.bulk_update(modificadas, list(set(COLUMNAS.values())), batch_size=LOTE_EVENTOS)
+
+
+class _LoteYaConsolidado(Exception):
+    pass
+
+
+def consolidar(tamano_lote=LOTE_EVENTOS):
+    """Sumar los eventos pendientes en EstadisticaDiaria y borrarlos.
+
+    Cada lote se suma y se borra en la misma transacción, así que un evento
+    nunca se cuenta dos veces aunque el proceso se corte a mitad. Si otra
+    ejecución simultánea borró alguno de los eventos del lote, el lote se
+    deshace y se vuelve a leer. Devuelve la cantidad de eventos consolidados.
+    """
+    consolidados = 0
+    ultimo_id = 0
+    while True:
+        try:
+            with transaction.atomic():
+                # En MySQL la otra ejecución espera aquí hasta que este lote se confirme
+                eventos = list(
+                    EventoProducto.objects.select_for_update().filter(id__gt=ultimo_id).order_by('id')
+                    .values_list('id', 'producto_id', 'tipo', 'cantidad', 'ocurrido_en')[:tamano_lote]
+                )
+                if not eventos:
+                    return consolidados
+                _consolidar_lote([evento[1:] for evento in eventos])
+                ids = [evento[0] for evento in eventos]
+                borrados, _ = EventoProducto.objects.filter(id__in=ids).delete()
+                if borrados != len(ids):
+                    raise _LoteYaConsolidado
+                ultimo_id = ids[-1]
+        except _LoteYaConsolidado:
+            continue
+        consolidados += len(eventos)
+
+
+class Tendencia:
+    """Serie diaria de un vendedor en los últimos `dias` días"""
+
+    def __init__(self, dias, filas, hoy):
+        por_fecha = {fila['fecha']: fila for fila in filas}
+        self.dias = []
+        for atras in range(dias - 1, -1, -1):
+            fecha = hoy - timedelta(days=atras)
+            fila = por_fecha.get(fecha, {})
+            self.dias.append({
+                'fecha': fecha,
+                'visitas': fila.get('suma_visitas') or 0,
+                'favoritos': fila.get('suma_favoritos') or 0,
+                'vendidos': fila.get('suma_vendidos') or 0,
+            })
+        self.total_visitas = sum(dia['visitas'] for dia in self.dias)
+        self.total_favoritos = sum(dia['favoritos'] for dia in self.dias)
+        self.total_vendidos = sum(dia['vendidos'] for dia in self.dias)
+        # Altura de cada barra relativa al día con más visitas
+        maximo = max((dia['visitas'] for dia in self.dias), default=0) or 1
+        for dia in self.dias:
+            dia['porcentaje'] = round(dia['visitas'] * 100 / maximo)
+
+
+def tendencia_vendedor(estudiante, dias=30):
+    hoy = timezone.localdate()
+    desde = hoy - timedelta(days=dias - 1)
+    filas = (
+        EstadisticaDiaria.objects.filter(vendedor=estudiante, fecha__gte=desde)
+        .values('fecha')
+        .annotate(
+            suma_visitas=Sum('visitas'),
+            suma_favoritos=Sum('favoritos'),
+            suma_vendidos=Sum('a_vendido'),
+        )
+        .order_by('fecha')
+    )
+    return Tendencia(dias, filas, hoy)
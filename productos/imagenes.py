@@ -0,0 +1,74 @@
+"""Especificaciones de imagekit para las imágenes de productos.
+
+Cada tamaño que usan los templates tiene su versión JPEG y WebP, y las de
+listado y detalle también una versión al doble de resolución para `srcset`.
+Los archivos se generan la primera vez que se piden y quedan en
+IMAGEKIT_CACHEFILE_DIR.
+"""
+
+from imagekit import ImageSpec
+from imagekit.processors import ResizeToFill, ResizeToFit, Transpose
+
+CALIDAD_JPEG = 82
+CALIDAD_WEBP = 80
+
+
+class _Spec(ImageSpec):
+    format = 'JPEG'
+    options = {'quality': CALIDAD_JPEG, 'optimize': True, 'progressive': True}
+
+
+class _SpecWebP(ImageSpec):
+    format = 'WEBP'
+    options = {'quality': CALIDAD_WEBP, 'method': 6}
+
+
+# Tarjetas de listados (explorar, mis productos, favoritos, estadísticas)
+class TarjetaJPEG(_Spec):
+    processors = [Transpose(), ResizeToFill(400, 300)]
+
+
+class TarjetaJPEG2x(_Spec):
+    processors = [Transpose(), ResizeToFill(800, 600)]
+
+
+class TarjetaWebP(_SpecWebP):
+    processors = [Transpose(), ResizeToFill(400, 300)]
+
+
+class TarjetaWebP2x(_SpecWebP):
+    processors = [Transpose(), ResizeToFill(800, 600)]
+
+
+# Carrusel de la página de detalle
+class CarruselJPEG(_Spec):
+    processors = [Transpose(), ResizeToFit(800, 800, upscale=False)]
+
+
+class CarruselJPEG2x(_Spec):
+    processors = [Transpose(), ResizeToFit(1600, 1600, upscale=False)]
+
+
+class CarruselWebP(_SpecWebP):
+    processors = [Transpose(), ResizeToFit(800, 800, upscale=False)]
+
+
+class CarruselWebP2x(_SpecWebP):
+    processors = [Transpose(), ResizeToFit(1600, 1600, upscale=False)]
+
+
+# Miniaturas del detalle y del inline del admin
+class MiniaturaJPEG(_Spec):
+    processors = [Transpose(), ResizeToFill(120, 120)]
+
+
+class MiniaturaWebP(_SpecWebP):
+    processors = [Transpose(), ResizeToFill(120, 120)]
+
+
+# Nombre de tamaño -> (jpeg 1x, jpeg 2x, webp 1x, webp 2x) como campos del modelo
+TAMANOS = {
+    'tarjeta': ('tarjeta_jpeg', 'tarjeta_jpeg_2x', 'tarjeta_webp', 'tarjeta_webp_2x'),
+    'carrusel': ('carrusel_jpeg', 'carrusel_jpeg_2x', 'carrusel_webp', 'carrusel_webp_2x'),
+    'miniatura': ('miniatura_jpeg', None, 'miniatura_webp', None),
+}
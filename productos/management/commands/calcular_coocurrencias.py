@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from productos.recomendaciones import BLOQUE_PRODUCTOS, LOTE, VECINOS, calcular_coocurrencias
+
+
+class Command(BaseCommand):
+    help = (
+        "Calcula para cada producto los productos que guardaron los mismos estudiantes "
+        "(filtrado colaborativo ítem a ítem sobre Favorito)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--vecinos', type=int, default=VECINOS, help="Vecinos guardados por producto")
+        parser.add_argument(
+            '--bloque', type=int, default=BLOQUE_PRODUCTOS,
+            help="Productos por bloque; limita la memoria usada",
+        )
+        parser.add_argument('--tamano-lote', type=int, default=LOTE)
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        procesados, con_vecinos = calcular_coocurrencias(
+            k=options['vecinos'], bloque=options['bloque'], tamano_lote=options['tamano_lote'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {procesados} productos procesados, {con_vecinos} con vecinos, "
+            f"en {time.perf_counter() - inicio:.1f}s"
+        ))
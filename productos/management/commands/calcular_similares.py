@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from productos.recomendaciones import LOTE, VECINOS, calcular_similares
+
+
+class Command(BaseCommand):
+    help = (
+        "Calcula los productos más parecidos por contenido (TF-IDF sobre nombre, tags y "
+        "descripción) de los productos modificados; con --completo, de todo el catálogo"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--completo', action='store_true', help="Recalcular todos los productos")
+        parser.add_argument('--vecinos', type=int, default=VECINOS, help="Vecinos guardados por producto")
+        parser.add_argument('--tamano-lote', type=int, default=LOTE)
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        recalculados, actualizadas = calcular_similares(
+            completo=options['completo'], k=options['vecinos'], tamano_lote=options['tamano_lote'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {recalculados} productos recalculados y {actualizadas} listas de vecinos "
+            f"actualizadas en {time.perf_counter() - inicio:.1f}s"
+        ))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from productos.contadores import vaciar_visitas
+from productos.estadisticas import LOTE_EVENTOS, consolidar
+
+
+class Command(BaseCommand):
+    help = (
+        "Suma los eventos pendientes (visitas, favoritos, cambios de estado) en las "
+        "estadísticas diarias por producto; pensado para ejecutarse periódicamente"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tamano-lote', type=int, default=LOTE_EVENTOS)
+        parser.add_argument(
+            '--sin-visitas', action='store_true',
+            help="No volcar antes las visitas pendientes en la caché",
+        )
+
+    def handle(self, *args, **options):
+        if not options['sin_visitas']:
+            vaciar_visitas()
+        consolidados = consolidar(options['tamano_lote'])
+        self.stdout.write(self.style.SUCCESS(f"✅ {consolidados} eventos consolidados"))
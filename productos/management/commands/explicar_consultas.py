@@ -0,0 +1,135 @@
+from contextlib import nullcontext
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from productos.datos_sinteticos import generar
+from productos.rendimiento import base_de_datos_temporal, cliente_y_urls, silenciar_logs
+
+# Tablas de pocas filas en las que recorrerlas entera es lo más barato
+TABLAS_PEQUENAS = {'productos_categoria', 'django_content_type', 'django_site'}
+
+
+def _tablas():
+    return set(connection.introspection.table_names()) - TABLAS_PEQUENAS
+
+
+def _plan_sqlite(cursor, sql, params):
+    """Pasos de EXPLAIN QUERY PLAN y los que son recorridos completos u ordenamientos temporales"""
+    cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+    pasos = [fila[-1] for fila in cursor.fetchall()]
+    # Solo cuentan los recorridos de tablas reales, no de subconsultas materializadas
+    tablas = _tablas()
+    problemas = []
+    for paso in pasos:
+        if 'TEMP B-TREE' in paso:
+            problemas.append(paso)
+        elif paso.startswith('SCAN ') and paso.split()[1] in tablas and 'VIRTUAL TABLE' not in paso:
+            problemas.append(paso)
+    return pasos, problemas
+
+
+def _plan_mysql(cursor, sql, params):
+    cursor.execute(f"EXPLAIN {sql}", params)
+    columnas = [columna[0] for columna in cursor.description]
+    tablas = _tablas()
+    pasos, problemas = [], []
+    for fila in cursor.fetchall():
+        fila = dict(zip(columnas, fila))
+        extra = fila.get('Extra') or ''
+        paso = f"{fila['table']}: type={fila['type']} key={fila['key']} rows={fila['rows']} {extra}".strip()
+        pasos.append(paso)
+        recorrido = fila['type'] in ('ALL', 'index') and fila['table'] in tablas
+        if recorrido or 'Using temporary' in extra or 'Using filesort' in extra:
+            problemas.append(paso)
+    return pasos, problemas
+
+
+PLANES = {
+    'sqlite': _plan_sqlite,
+    'mysql': _plan_mysql,
+}
+
+
+class _CapturaSelects:
+    def __init__(self):
+        self.consultas = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip().upper().startswith('SELECT'):
+            self.consultas.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Ejecuta EXPLAIN sobre las consultas de cada vista y señala recorridos completos "
+        "y ordenamientos temporales (SQLite y MySQL)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--productos', type=int, default=2000,
+            help="Productos sintéticos de la base temporal",
+        )
+        parser.add_argument(
+            '--bd-actual', action='store_true',
+            help="Usar la base de datos configurada (con sus datos y estadísticas) en vez de una temporal",
+        )
+        parser.add_argument('--detalle', action='store_true', help="Mostrar el plan completo de cada consulta")
+        parser.add_argument('--estricto', action='store_true', help="Terminar con error si hay hallazgos")
+
+    def handle(self, *args, **options):
+        plan = PLANES.get(connection.vendor)
+        if plan is None:
+            raise CommandError(f"EXPLAIN no soportado para {connection.vendor}")
+
+        silenciar_logs()
+        contexto = nullcontext() if options['bd_actual'] else base_de_datos_temporal()
+        with contexto:
+            if not options['bd_actual']:
+                productos = options['productos']
+                self.stdout.write(f"⏳ Generando {productos} productos...")
+                generar(
+                    estudiantes=max(productos // 5, 1), productos=productos,
+                    favoritos=productos * 2, calificaciones=productos // 2, semilla=1,
+                )
+                if connection.vendor == 'sqlite':
+                    with connection.cursor() as cursor:
+                        cursor.execute('ANALYZE')
+            hallazgos = self._explicar_vistas(plan, options['detalle'])
+
+        if hallazgos:
+            self.stdout.write(self.style.WARNING(f"\n⚠️ {hallazgos} consultas con recorridos completos u ordenamientos temporales"))
+            if options['estricto']:
+                raise CommandError("Hay consultas sin índice adecuado")
+        else:
+            self.stdout.write(self.style.SUCCESS("\n✅ Todas las consultas usan índices"))
+
+    def _explicar_vistas(self, plan, detalle):
+        hallazgos = 0
+        client, urls = cliente_y_urls()
+        for nombre, url in urls:
+            cache.clear()
+            captura = _CapturaSelects()
+            with connection.execute_wrapper(captura):
+                client.get(url)
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n{nombre} ({url})"))
+            vistas = set()
+            for sql, params in captura.consultas:
+                if sql in vistas:
+                    continue
+                vistas.add(sql)
+                with connection.cursor() as cursor:
+                    pasos, problemas = plan(cursor, sql, params)
+                if not problemas and not detalle:
+                    continue
+                if problemas:
+                    hallazgos += 1
+                estilo = self.style.WARNING if problemas else str
+                self.stdout.write(estilo(f"  {'⚠️' if problemas else '✅'} {sql[:160]}"))
+                for paso in (pasos if detalle else problemas):
+                    self.stdout.write(f"      {paso}")
+        return hallazgos
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from productos.datos_sinteticos import TAMANO_LOTE, generar
+
+
+class Command(BaseCommand):
+    help = "Crea estudiantes, productos, imágenes, favoritos y calificaciones sintéticos con bulk_create"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--productos', type=int, default=1000)
+        parser.add_argument(
+            '--estudiantes', type=int, default=None,
+            help="Por defecto, uno por cada 5 productos",
+        )
+        parser.add_argument('--imagenes-por-producto', type=int, default=1)
+        parser.add_argument(
+            '--favoritos', type=int, default=None,
+            help="Por defecto, 2 por producto",
+        )
+        parser.add_argument(
+            '--calificaciones', type=int, default=None,
+            help="Por defecto, 1 por cada 2 productos",
+        )
+        parser.add_argument('--semilla', type=int, default=None, help="Para repetir la misma carga")
+        parser.add_argument('--lote', type=int, default=TAMANO_LOTE)
+
+    def handle(self, *args, **options):
+        productos = options['productos']
+        try:
+            creados = generar(
+                estudiantes=_o(options['estudiantes'], max(productos // 5, 1)),
+                productos=productos,
+                imagenes_por_producto=options['imagenes_por_producto'],
+                favoritos=_o(options['favoritos'], productos * 2),
+                calificaciones=_o(options['calificaciones'], productos // 2),
+                semilla=options['semilla'],
+                tamano_lote=options['lote'],
+            )
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        resumen = ', '.join(f"{cantidad} {modelo}" for modelo, cantidad in creados.items())
+        self.stdout.write(self.style.SUCCESS(f"✅ Creados: {resumen}"))
+
+
+def _o(valor, por_defecto):
+    return por_defecto if valor is None else valor
@@ -0,0 +1,108 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Se ejecuta en un proceso nuevo para medir un arranque en frío de verdad
+SCRIPT = """
+import json, os, time
+inicio = time.perf_counter()
+fases = {}
+
+def fase(nombre, desde):
+    ahora = time.perf_counter()
+    fases[nombre] = (ahora - desde) * 1000
+    return ahora
+
+import django
+from django.conf import settings
+settings.INSTALLED_APPS
+t = fase('settings', inicio)
+django.setup()
+t = fase('setup', t)
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+t = fase('aplicacion', t)
+if os.environ['ARRANQUE_CALENTAR'] == '1':
+    from marketcampus.arranque import calentar_worker
+    calentar_worker()
+    t = fase('calentamiento', t)
+from django.test import Client
+from django.test.utils import setup_test_environment
+setup_test_environment()
+client = Client()
+estado = client.get(os.environ['URL_ARRANQUE']).status_code
+t = fase('primera_peticion', t)
+client.get(os.environ['URL_ARRANQUE'])
+fase('segunda_peticion', t)
+fases['total'] = (time.perf_counter() - inicio) * 1000
+print(json.dumps({'fases': fases, 'estado': estado}))
+"""
+
+FASES = ('settings', 'setup', 'aplicacion', 'calentamiento', 'primera_peticion', 'segunda_peticion', 'total')
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el arranque de un worker en procesos nuevos (settings, django.setup, "
+        "aplicación WSGI, calentamiento y primeras peticiones)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticiones', type=int, default=5)
+        parser.add_argument(
+            '--url', default='/usuarios/login/',
+            help="URL de las peticiones de prueba; conviene una que no consulte la base",
+        )
+        parser.add_argument('--json', action='store_true', help="Imprimir los resultados en JSON")
+
+    def handle(self, *args, **options):
+        resultados = {
+            'con_calentamiento': self._medir(options, calentar=True),
+            'sin_calentamiento': self._medir(options, calentar=False),
+        }
+        if options['json']:
+            self.stdout.write(json.dumps(resultados, indent=2))
+            return
+
+        for variante, fases in resultados.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n{variante.replace('_', ' ').capitalize()}"))
+            for nombre in FASES:
+                if nombre in fases:
+                    self.stdout.write(f"  {nombre:<18} {fases[nombre]:>8.1f} ms")
+
+        con = resultados['con_calentamiento']['primera_peticion']
+        sin = resultados['sin_calentamiento']['primera_peticion']
+        self.stdout.write(self.style.SUCCESS(
+            f"\n✅ Primera petición: {con:.1f} ms con calentamiento, {sin:.1f} ms sin él "
+            f"(medianas de {options['repeticiones']} arranques)"
+        ))
+
+    def _medir(self, options, calentar):
+        entorno = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'marketcampus.settings'),
+            'ARRANQUE_CALENTAR': '1' if calentar else '0',
+            'URL_ARRANQUE': options['url'],
+            'INSTRUMENTACION_LOG_NIVEL': 'WARNING',
+        }
+        corridas = []
+        for _ in range(options['repeticiones']):
+            proceso = subprocess.run(
+                [sys.executable, '-c', SCRIPT], cwd=settings.BASE_DIR, env=entorno,
+                capture_output=True, text=True,
+            )
+            if proceso.returncode:
+                raise CommandError(f"El arranque falló:\n{proceso.stderr}")
+            salida = json.loads(proceso.stdout.strip().splitlines()[-1])
+            if salida['estado'] != 200:
+                raise CommandError(f"{options['url']} respondió {salida['estado']}")
+            corridas.append(salida['fases'])
+        return {
+            nombre: round(statistics.median(corrida[nombre] for corrida in corridas), 2)
+            for nombre in corridas[0]
+        }
@@ -0,0 +1,122 @@
+import json
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+
+from marketcampus.instrumentacion import RegistroConsultas
+from productos.datos_sinteticos import generar
+from productos.rendimiento import base_de_datos_temporal, cliente_y_urls, percentil, silenciar_logs
+
+LINEA_BASE = Path(settings.BASE_DIR) / 'benchmarks' / 'linea_base.json'
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide cada URL de productos y usuarios con 1k/10k/100k productos sintéticos "
+        "y compara latencias y consultas con una línea base"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--escalas', type=int, nargs='+', default=[1000, 10000, 100000])
+        parser.add_argument('--repeticiones', type=int, default=20)
+        parser.add_argument('--semilla', type=int, default=42)
+        parser.add_argument('--linea-base', default=str(LINEA_BASE))
+        parser.add_argument(
+            '--guardar-linea-base', action='store_true',
+            help="Guardar estos resultados como nueva línea base",
+        )
+        parser.add_argument(
+            '--tolerancia', type=float, default=0.25,
+            help="Aumento de p95 permitido frente a la línea base (0.25 = 25%%)",
+        )
+        parser.add_argument(
+            '--estricto', action='store_true',
+            help="Terminar con error si hay regresiones",
+        )
+
+    def handle(self, *args, **options):
+        silenciar_logs()
+        with base_de_datos_temporal():
+            resultados = self._medir_escalas(options)
+
+        regresiones = self._comparar(resultados, options)
+        if options['guardar_linea_base']:
+            ruta = Path(options['linea_base'])
+            ruta.parent.mkdir(parents=True, exist_ok=True)
+            ruta.write_text(json.dumps(resultados, indent=2, sort_keys=True))
+            self.stdout.write(self.style.SUCCESS(f"✅ Línea base guardada en {ruta}"))
+        if regresiones and options['estricto']:
+            raise CommandError(f"{regresiones} regresiones frente a la línea base")
+
+    def _medir_escalas(self, options):
+        resultados = {}
+        actuales = 0
+        for escala in sorted(options['escalas']):
+            nuevos = escala - actuales
+            if nuevos > 0:
+                self.stdout.write(f"⏳ Generando datos hasta {escala} productos...")
+                generar(
+                    estudiantes=max(nuevos // 5, 1), productos=nuevos, favoritos=nuevos * 2,
+                    calificaciones=nuevos // 2, semilla=options['semilla'] + escala,
+                )
+                actuales = escala
+            cache.clear()
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n{escala} productos"))
+            self.client, urls = cliente_y_urls()
+            for nombre, url in urls:
+                medicion = self._medir(url, options['repeticiones'])
+                resultados[f"{escala}:{nombre}"] = medicion
+                self.stdout.write(
+                    f"  {nombre:<38} p50 {medicion['p50']:>8.1f} ms  p95 {medicion['p95']:>8.1f} ms  "
+                    f"p99 {medicion['p99']:>8.1f} ms  {medicion['consultas']:>3} consultas  "
+                    f"[{medicion['estado']}]"
+                )
+        return resultados
+
+    def _medir(self, url, repeticiones):
+        self.client.get(url)  # Calentamiento: compilación de plantillas, cachés de proceso
+        latencias = []
+        consultas = []
+        for _ in range(repeticiones):
+            registro = RegistroConsultas()
+            with registro.activo():
+                inicio = time.perf_counter()
+                response = self.client.get(url)
+                latencias.append((time.perf_counter() - inicio) * 1000)
+            consultas.append(registro.total)
+        return {
+            'url': url,
+            'estado': response.status_code,
+            'p50': round(percentil(latencias, 50), 2),
+            'p95': round(percentil(latencias, 95), 2),
+            'p99': round(percentil(latencias, 99), 2),
+            'consultas': max(consultas),
+        }
+
+    def _comparar(self, resultados, options):
+        ruta = Path(options['linea_base'])
+        if not ruta.exists():
+            self.stdout.write(f"\nSin línea base en {ruta} (usa --guardar-linea-base)")
+            return 0
+
+        base = json.loads(ruta.read_text())
+        regresiones = 0
+        self.stdout.write(self.style.MIGRATE_HEADING("\nComparación con la línea base"))
+        for clave, actual in resultados.items():
+            anterior = base.get(clave)
+            if not anterior:
+                continue
+            lenta = actual['p95'] > anterior['p95'] * (1 + options['tolerancia'])
+            mas_consultas = actual['consultas'] > anterior['consultas']
+            if lenta or mas_consultas:
+                regresiones += 1
+                self.stdout.write(self.style.WARNING(
+                    f"  ⚠️ {clave}: p95 {anterior['p95']} → {actual['p95']} ms, "
+                    f"consultas {anterior['consultas']} → {actual['consultas']}"
+                ))
+        if not regresiones:
+            self.stdout.write(self.style.SUCCESS("✅ Sin regresiones"))
+        return regresiones
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from productos.models import ImagenProducto
+from productos.procesamiento import procesar_imagen
+
+
+class Command(BaseCommand):
+    help = "Procesa las imágenes que quedaron pendientes (por ejemplo tras reiniciar el servidor)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reintentar-errores', action='store_true',
+            help="Procesar también las imágenes que fallaron antes",
+        )
+
+    def handle(self, *args, **options):
+        estados = [ImagenProducto.ESTADO_PENDIENTE]
+        if options['reintentar_errores']:
+            estados.append(ImagenProducto.ESTADO_ERROR)
+
+        ids = list(ImagenProducto.objects.filter(estado__in=estados).values_list('id', flat=True))
+        for imagen_id in ids:
+            procesar_imagen(imagen_id)
+        self.stdout.write(self.style.SUCCESS(f"✅ {len(ids)} imágenes procesadas"))
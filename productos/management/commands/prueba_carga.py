@@ -0,0 +1,263 @@
+import http.cookiejar
+import logging
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler, get_internal_wsgi_application
+from django.db.models import Count
+from django.urls import reverse
+
+from productos.datos_sinteticos import CLAVE_SINTETICA
+from productos.models import Categoria, Producto
+from productos.rendimiento import percentil
+from usuarios.models import Estudiante
+
+MEZCLA = 'navegar=60,detalle=25,favorito=10,calificar=5'
+BLOQUEO = 'database is locked'
+
+
+class _ManejadorSilencioso(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class _ContadorBloqueos(logging.Handler):
+    """Cuenta los errores 'database is locked' que registra el servidor en proceso"""
+
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+        self.total = 0
+        self._candado = threading.Lock()
+
+    def emit(self, record):
+        if record.exc_info and BLOQUEO in str(record.exc_info[1]):
+            with self._candado:
+                self.total += 1
+
+
+class UsuarioVirtual:
+    """Un navegador con sesión propia que recorre journeys al azar"""
+
+    def __init__(self, base, username, datos, rng, resultados):
+        self.base = base
+        self.username = username
+        self.datos = datos
+        self.rng = rng
+        self.resultados = resultados
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies))
+
+    def _csrf(self):
+        for cookie in self.cookies:
+            if cookie.name == 'csrftoken':
+                return cookie.value
+        return ''
+
+    def pedir(self, paso, ruta, datos=None):
+        if datos is not None:
+            datos = urllib.parse.urlencode({**datos, 'csrfmiddlewaretoken': self._csrf()}).encode()
+        inicio = time.perf_counter()
+        estado, bloqueo = 0, False
+        try:
+            with self.opener.open(self.base + ruta, data=datos, timeout=30) as response:
+                response.read()
+                estado = response.status
+                # Una redirección al login significa que la sesión no es válida
+                if paso != 'login' and response.url.startswith(self.base + reverse('usuarios:login')):
+                    estado = 401
+        except urllib.error.HTTPError as error:
+            estado = error.code
+            bloqueo = BLOQUEO in error.read().decode(errors='ignore')
+        except OSError:
+            estado = 0
+        self.resultados.registrar(paso, (time.perf_counter() - inicio) * 1000, estado, bloqueo)
+
+    def iniciar_sesion(self):
+        ruta = reverse('usuarios:login')
+        self.pedir('login', ruta)
+        self.pedir('login', ruta, {'username': self.username, 'password': CLAVE_SINTETICA})
+
+    def navegar(self):
+        self.pedir('explorar', reverse('productos:explorar'))
+        if self.rng.random() < 0.5:
+            categoria_id = self.rng.choice(self.datos['categorias'])
+            self.pedir('por_categoria', reverse('productos:por_categoria', args=[categoria_id]))
+        else:
+            consulta = urllib.parse.urlencode({'q': self.rng.choice(['libro', 'calculadora', 'mochila'])})
+            self.pedir('buscar', f"{reverse('productos:explorar')}?{consulta}")
+
+    def detalle(self):
+        self.pedir('explorar', reverse('productos:explorar'))
+        for _ in range(self.rng.randint(1, 3)):
+            self.pedir('detalle', reverse('productos:detalle', args=[self._producto()]))
+
+    def favorito(self):
+        producto_id = self._producto()
+        self.pedir('detalle', reverse('productos:detalle', args=[producto_id]))
+        self.pedir('toggle_favorito', reverse('productos:toggle_favorito', args=[producto_id]))
+
+    def calificar(self):
+        vendedor_id = self.rng.choice(self.datos['vendedores'])
+        ruta = reverse('usuarios:calificar_vendedor', args=[vendedor_id])
+        self.pedir('calificar', ruta)
+        self.pedir('calificar', ruta, {
+            'estrellas': self.rng.choice([3, 4, 5, 5]), 'comentario': 'Prueba de carga',
+        })
+
+    def _producto(self):
+        # Las visitas se concentran en los productos populares
+        return self.rng.choices(self.datos['productos'], cum_weights=self.datos['pesos'])[0]
+
+
+class Resultados:
+    def __init__(self):
+        self._candado = threading.Lock()
+        self.latencias = defaultdict(list)
+        self.errores = defaultdict(int)
+        self.bloqueos = 0
+
+    def registrar(self, paso, milisegundos, estado, bloqueo):
+        with self._candado:
+            self.latencias[paso].append(milisegundos)
+            if estado == 0 or estado >= 400:
+                self.errores[paso] += 1
+            if bloqueo:
+                self.bloqueos += 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Prueba de carga: usuarios virtuales concurrentes recorren explorar, detalle, "
+        "favoritos y calificaciones contra un servidor local"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--usuarios', type=int, default=10, help="Usuarios virtuales concurrentes")
+        parser.add_argument('--duracion', type=float, default=30, help="Segundos de carga")
+        parser.add_argument(
+            '--mezcla', default=MEZCLA,
+            help=f"Peso de cada journey (por defecto {MEZCLA})",
+        )
+        parser.add_argument(
+            '--url', default=None,
+            help="Servidor ya iniciado (gunicorn/uvicorn con wsgi.py o asgi.py); "
+                 "por defecto se levanta uno WSGI multihilo en este proceso",
+        )
+        parser.add_argument('--semilla', type=int, default=None)
+
+    def handle(self, *args, **options):
+        try:
+            mezcla = {
+                nombre: float(peso)
+                for nombre, peso in (parte.split('=') for parte in options['mezcla'].split(','))
+            }
+        except ValueError:
+            raise CommandError(f"Mezcla inválida: {options['mezcla']}")
+        desconocidos = set(mezcla) - {'navegar', 'detalle', 'favorito', 'calificar'}
+        if desconocidos:
+            raise CommandError(f"Journeys desconocidos: {', '.join(sorted(desconocidos))}")
+
+        datos = self._datos()
+        usernames = list(
+            Estudiante.objects.filter(user__username__endswith='@marketu.test')
+            .values_list('user__username', flat=True)[:options['usuarios']]
+        )
+        if len(usernames) < options['usuarios']:
+            raise CommandError("No hay suficientes usuarios sintéticos: ejecuta primero generar_datos")
+
+        servidor = None
+        contador = _ContadorBloqueos()
+        base = options['url']
+        if not base:
+            servidor = ThreadedWSGIServer(('127.0.0.1', 0), _ManejadorSilencioso)
+            servidor.set_app(get_internal_wsgi_application())
+            threading.Thread(target=servidor.serve_forever, daemon=True).start()
+            base = f"http://127.0.0.1:{servidor.server_port}"
+            logging.getLogger('django.request').addHandler(contador)
+        base = base.rstrip('/')
+        logging.getLogger('marketcampus.peticiones').setLevel(logging.WARNING)
+
+        self.stdout.write(f"🚀 {options['usuarios']} usuarios durante {options['duracion']:.0f}s contra {base}")
+        rng_global = random.Random(options['semilla'])
+        resultados = Resultados()
+        fin = time.monotonic() + options['duracion']
+        hilos = [
+            threading.Thread(
+                target=self._recorrer,
+                args=(UsuarioVirtual(base, username, datos, random.Random(rng_global.random()), resultados),
+                      mezcla, fin),
+            )
+            for username in usernames
+        ]
+        inicio = time.monotonic()
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        transcurrido = time.monotonic() - inicio
+
+        if servidor:
+            servidor.shutdown()
+            servidor.server_close()
+            logging.getLogger('django.request').removeHandler(contador)
+        self._reportar(resultados, transcurrido, max(resultados.bloqueos, contador.total))
+
+    def _datos(self):
+        productos = list(
+            Producto.objects.filter(estado='disponible')
+            .order_by('-cantidad_favoritos', '-visitas').values_list('id', flat=True)[:5000]
+        )
+        if not productos:
+            raise CommandError("No hay productos: ejecuta primero generar_datos")
+        pesos, acumulado = [], 0
+        for rango in range(len(productos)):
+            acumulado += 1 / (rango + 1)
+            pesos.append(acumulado)
+        vendedores = list(
+            Estudiante.objects.annotate(n=Count('productos_vendidos')).filter(n__gt=0)
+            .order_by('-n').values_list('id', flat=True)[:500]
+        )
+        return {
+            'productos': productos,
+            'pesos': pesos,
+            'vendedores': vendedores,
+            'categorias': list(Categoria.objects.values_list('id', flat=True)),
+        }
+
+    def _recorrer(self, usuario, mezcla, fin):
+        usuario.iniciar_sesion()
+        journeys = list(mezcla)
+        pesos = list(mezcla.values())
+        while time.monotonic() < fin:
+            getattr(usuario, usuario.rng.choices(journeys, weights=pesos)[0])()
+
+    def _reportar(self, resultados, transcurrido, bloqueos):
+        todas = [ms for latencias in resultados.latencias.values() for ms in latencias]
+        if not todas:
+            raise CommandError("No se completó ninguna petición")
+        errores = sum(resultados.errores.values())
+
+        self.stdout.write(self.style.MIGRATE_HEADING("\nPor paso"))
+        for paso, latencias in sorted(resultados.latencias.items()):
+            self.stdout.write(
+                f"  {paso:<16} {len(latencias):>6} pet.  p50 {percentil(latencias, 50):>8.1f} ms  "
+                f"p95 {percentil(latencias, 95):>8.1f} ms  p99 {percentil(latencias, 99):>8.1f} ms  "
+                f"errores {resultados.errores[paso] / len(latencias):>6.1%}"
+            )
+
+        self.stdout.write(self.style.MIGRATE_HEADING("\nTotal"))
+        self.stdout.write(f"  Peticiones:      {len(todas)} en {transcurrido:.1f}s")
+        self.stdout.write(f"  Throughput:      {len(todas) / transcurrido:.1f} pet/s")
+        self.stdout.write(
+            f"  Latencia:        p50 {percentil(todas, 50):.1f} ms  p95 {percentil(todas, 95):.1f} ms  "
+            f"p99 {percentil(todas, 99):.1f} ms"
+        )
+        self.stdout.write(f"  Errores:         {errores} ({errores / len(todas):.2%})")
+        estilo = self.style.ERROR if bloqueos else self.style.SUCCESS
+        self.stdout.write(estilo(f"  'database is locked': {bloqueos}"))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from productos.busqueda import TAMANO_LOTE, reconstruir_indice
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda full-text de productos"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote', type=int, default=TAMANO_LOTE,
+            help="Cantidad de productos indexados por lote (por defecto %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        total = reconstruir_indice(tamano_lote=options['lote'])
+        self.stdout.write(self.style.SUCCESS(f"✅ {total} productos indexados"))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from marketcampus.caches import cache_compartida
+from productos.contadores import vaciar_visitas
+
+
+class Command(BaseCommand):
+    help = "Vuelca a la base de datos las visitas pendientes en la caché"
+
+    def handle(self, *args, **options):
+        if not cache_compartida():
+            self.stdout.write(self.style.WARNING(
+                "⚠️ La caché no es compartida entre procesos: las visitas se guardan "
+                "directamente y no hay nada que vaciar"
+            ))
+            return
+        escritas = vaciar_visitas(incluir_actual=True)
+        self.stdout.write(self.style.SUCCESS(f"✅ {escritas} visitas guardadas"))
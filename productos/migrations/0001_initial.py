@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:13
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Categoria',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(choices=[('libros_texto', '📚 Libros de Texto'), ('apuntes_guias', '📝 Apuntes y Guías'), ('electronica', '💻 Electrónica'), ('instrumentos_laboratorio', '🔬 Instrumentos Lab'), ('ropa', '👕 Ropa'), ('deportes', '⚽ Deportes'), ('comida', '🍕 Comida'), ('accesorios', '🎒 Accesorios'), ('muebles_hogar', '🛋️ Muebles Hogar'), ('arte_musica', '🎨 Arte y Música'), ('servicios', '🛠️ Servicios'), ('otros', '📦 Otros')], max_length=50, unique=True)),
+                ('descripcion', models.TextField(blank=True)),
+                ('icono', models.CharField(default='📦', max_length=50)),
+                ('activa', models.BooleanField(default=True)),
+            ],
+            options={
+                'verbose_name': 'Categoría',
+                'verbose_name_plural': 'Categorías',
+                'ordering': ['nombre'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Favorito',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('agregado_en', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Favorito',
+                'verbose_name_plural': 'Favoritos',
+                'ordering': ['-agregado_en'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ImagenProducto',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('imagen', models.ImageField(upload_to='productos/')),
+                ('orden', models.PositiveIntegerField(default=0)),
+                ('creado_en', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['orden', 'creado_en'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Producto',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=100)),
+                ('descripcion', models.TextField()),
+                ('precio', models.DecimalField(decimal_places=2, max_digits=10, validators=[django.core.validators.MinValueValidator(0.01)])),
+                ('condicion', models.CharField(choices=[('nuevo', '🆕 Nuevo'), ('como_nuevo', '🌟 Como nuevo'), ('bueno', '👍 Bueno'), ('regular', '✅ Regular'), ('necesita_reparacion', '🔧 Necesita reparación')], default='bueno', max_length=20)),
+                ('estado', models.CharField(choices=[('disponible', '🟢 Disponible'), ('vendido', '🔴 Vendido'), ('reservado', '🟡 Reservado'), ('inactivo', '⚫ Inactivo')], default='disponible', max_length=20)),
+                ('stock', models.PositiveIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1)])),
+                ('es_multiple', models.BooleanField(default=False)),
+                ('tipo_envio', models.CharField(choices=[('recoger', '🏫 Recoger en universidad'), ('envio', '🚗 Envío a domicilio'), ('ambos', '📦 Ambos')], default='recoger', max_length=10)),
+                ('publicado_en', models.DateTimeField(auto_now_add=True)),
+                ('actualizado_en', models.DateTimeField(auto_now=True)),
+                ('visitas', models.PositiveIntegerField(default=0)),
+                ('tags', models.CharField(blank=True, max_length=200)),
+            ],
+            options={
+                'ordering': ['-publicado_en'],
+            },
+        ),
+    ]
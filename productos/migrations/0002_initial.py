@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('productos', '0001_initial'),
+        ('usuarios', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='favorito',
+            name='estudiante',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='favoritos', to='usuarios.estudiante'),
+        ),
+        migrations.AddField(
+            model_name='producto',
+            name='categoria',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='productos', to='productos.categoria'),
+        ),
+        migrations.AddField(
+            model_name='producto',
+            name='vendedor',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='productos_vendidos', to='usuarios.estudiante'),
+        ),
+        migrations.AddField(
+            model_name='imagenproducto',
+            name='producto',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='imagenes', to='productos.producto'),
+        ),
+        migrations.AddField(
+            model_name='favorito',
+            name='producto',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='en_favoritos', to='productos.producto'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='favorito',
+            unique_together={('estudiante', 'producto')},
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:13
+
+from django.db import migrations
+
+from productos.busqueda.analizador import documento
+from productos.busqueda.backends import obtener_backend
+
+
+def crear_indice(apps, schema_editor):
+    Producto = apps.get_model('productos', 'Producto')
+    backend = obtener_backend(schema_editor.connection)
+    with schema_editor.connection.cursor() as cursor:
+        backend.crear_tabla(cursor)
+        filas = []
+        for producto in Producto.objects.using(schema_editor.connection.alias).order_by('id').iterator(chunk_size=500):
+            campos = documento(producto)
+            filas.append((producto.id, campos['nombre'], campos['descripcion'], campos['tags']))
+        if filas:
+            backend.indexar(cursor, filas)
+
+
+def eliminar_indice(apps, schema_editor):
+    backend = obtener_backend(schema_editor.connection)
+    with schema_editor.connection.cursor() as cursor:
+        backend.eliminar_tabla(cursor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, eliminar_indice),
+    ]
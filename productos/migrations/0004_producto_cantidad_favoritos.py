@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:14
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def poblar_cantidad_favoritos(apps, schema_editor):
+    Producto = apps.get_model('productos', 'Producto')
+    Favorito = apps.get_model('productos', 'Favorito')
+    alias = schema_editor.connection.alias
+    conteo = Favorito.objects.using(alias).filter(producto=OuterRef('pk')).order_by().values(
+        'producto'
+    ).annotate(total=Count('id')).values('total')
+    Producto.objects.using(alias).update(cantidad_favoritos=Coalesce(Subquery(conteo), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0003_indice_busqueda'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='producto',
+            name='cantidad_favoritos',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(poblar_cantidad_favoritos, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0004_producto_cantidad_favoritos'),
+    ]
+
+    operations = [
+        # Las imágenes existentes ya se servían tal cual: se marcan como listas
+        migrations.AddField(
+            model_name='imagenproducto',
+            name='estado',
+            field=models.CharField(choices=[('pendiente', '⏳ Procesando'), ('lista', '✅ Lista'), ('error', '⚠️ Error')], default='lista', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='imagenproducto',
+            name='estado',
+            field=models.CharField(choices=[('pendiente', '⏳ Procesando'), ('lista', '✅ Lista'), ('error', '⚠️ Error')], default='pendiente', max_length=10),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:22
+
+import productos.almacenamiento
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def poblar_archivos(apps, schema_editor):
+    ImagenProducto = apps.get_model('productos', 'ImagenProducto')
+    ArchivoImagen = apps.get_model('productos', 'ArchivoImagen')
+    alias = schema_editor.connection.alias
+    conteos = ImagenProducto.objects.using(alias).order_by().values('imagen').annotate(total=Count('id'))
+    ArchivoImagen.objects.using(alias).bulk_create([
+        ArchivoImagen(nombre=fila['imagen'], referencias=fila['total'])
+        for fila in conteos if fila['imagen']
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0005_imagenproducto_estado'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivoImagen',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=255, unique=True)),
+                ('referencias', models.PositiveIntegerField(default=0)),
+                ('creado_en', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Archivo de imagen',
+                'verbose_name_plural': 'Archivos de imagen',
+            },
+        ),
+        migrations.AlterField(
+            model_name='imagenproducto',
+            name='imagen',
+            field=models.ImageField(storage=productos.almacenamiento.almacenamiento_imagenes, upload_to='productos/'),
+        ),
+        migrations.RunPython(poblar_archivos, migrations.RunPython.noop),
+    ]
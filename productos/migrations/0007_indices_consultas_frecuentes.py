@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0006_almacenamiento_por_contenido'),
+        ('usuarios', '0002_estudiante_agregados_calificaciones'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='favorito',
+            index=models.Index(fields=['estudiante', '-agregado_en'], name='favorito_estudiante_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='imagenproducto',
+            index=models.Index(fields=['producto', 'orden', 'creado_en'], name='imagen_producto_orden_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(fields=['estado', '-publicado_en', '-id'], name='producto_estado_pub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(fields=['vendedor', 'estado'], name='producto_vendedor_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(fields=['vendedor', '-publicado_en'], name='producto_vendedor_pub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(fields=['categoria', 'estado', '-publicado_en', '-id'], name='producto_cat_estado_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:35
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0007_indices_consultas_frecuentes'),
+        ('usuarios', '0003_indices_consultas_frecuentes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventoProducto',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('visitas', '👁️ Visitas'), ('favorito', '❤️ Favorito agregado'), ('disponible', '🟢 Disponible'), ('vendido', '🔴 Vendido'), ('reservado', '🟡 Reservado'), ('inactivo', '⚫ Inactivo')], max_length=20)),
+                ('cantidad', models.PositiveIntegerField(default=1)),
+                ('ocurrido_en', models.DateTimeField(default=django.utils.timezone.now)),
+                ('producto', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='productos.producto')),
+            ],
+            options={
+                'verbose_name': 'Evento de producto',
+                'verbose_name_plural': 'Eventos de productos',
+            },
+        ),
+        migrations.CreateModel(
+            name='EstadisticaDiaria',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField()),
+                ('visitas', models.PositiveIntegerField(default=0)),
+                ('favoritos', models.PositiveIntegerField(default=0)),
+                ('a_disponible', models.PositiveIntegerField(default=0)),
+                ('a_reservado', models.PositiveIntegerField(default=0)),
+                ('a_vendido', models.PositiveIntegerField(default=0)),
+                ('a_inactivo', models.PositiveIntegerField(default=0)),
+                ('producto', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='estadisticas_diarias', to='productos.producto')),
+                ('vendedor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='usuarios.estudiante')),
+            ],
+            options={
+                'verbose_name': 'Estadística diaria',
+                'verbose_name_plural': 'Estadísticas diarias',
+                'indexes': [models.Index(fields=['vendedor', 'fecha'], name='estadistica_vendedor_fecha_idx')],
+                'unique_together': {('producto', 'fecha')},
+            },
+        ),
+    ]
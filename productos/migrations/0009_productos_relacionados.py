@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0008_estadisticas_diarias'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='producto',
+            name='similares_calculados_en',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='ProductoRelacionado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('contenido', 'Por contenido (TF-IDF)')], max_length=20)),
+                ('puntaje', models.FloatField()),
+                ('producto', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='relacionados', to='productos.producto')),
+                ('relacionado', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='productos.producto')),
+            ],
+            options={
+                'verbose_name': 'Producto relacionado',
+                'verbose_name_plural': 'Productos relacionados',
+                'indexes': [models.Index(fields=['producto', 'tipo', '-puntaje'], name='relacionado_producto_idx')],
+                'unique_together': {('producto', 'tipo', 'relacionado')},
+            },
+        ),
+    ]
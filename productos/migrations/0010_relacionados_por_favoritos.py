@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0009_productos_relacionados'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='productorelacionado',
+            name='tipo',
+            field=models.CharField(choices=[('contenido', 'Por contenido (TF-IDF)'), ('favoritos', 'Guardados por los mismos estudiantes')], max_length=20),
+        ),
+    ]
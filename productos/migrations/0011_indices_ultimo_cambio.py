@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0010_relacionados_por_favoritos'),
+        ('usuarios', '0003_indices_consultas_frecuentes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(fields=['actualizado_en'], name='producto_actualizado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(fields=['categoria', 'actualizado_en'], name='producto_cat_actualizado_idx'),
+        ),
+    ]
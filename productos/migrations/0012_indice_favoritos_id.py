@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0011_indices_ultimo_cambio'),
+        ('usuarios', '0004_indice_apellidos'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='favorito',
+            name='favorito_estudiante_fecha_idx',
+        ),
+        migrations.AddIndex(
+            model_name='favorito',
+            index=models.Index(fields=['estudiante', '-agregado_en', '-id'], name='favorito_estudiante_fecha_idx'),
+        ),
+    ]
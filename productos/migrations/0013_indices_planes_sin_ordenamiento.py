@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0012_indice_favoritos_id'),
+        ('usuarios', '0004_indice_apellidos'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='imagenproducto',
+            options={'ordering': ['orden', 'creado_en', 'id']},
+        ),
+        migrations.RemoveIndex(
+            model_name='imagenproducto',
+            name='imagen_producto_orden_idx',
+        ),
+        migrations.AddIndex(
+            model_name='imagenproducto',
+            index=models.Index(fields=['producto', 'orden', 'creado_en', 'id'], name='imagen_producto_orden_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(fields=['vendedor', 'categoria'], name='producto_vendedor_cat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(fields=['vendedor', '-visitas'], name='producto_vendedor_visitas_idx'),
+        ),
+    ]
@@ -2,7 +2,10 @@ from django.db import models
 from django.utils import timezone
 from django.core.validators import MinValueValidator
 from django.core.exceptions import ValidationError
+from imagekit.models import ImageSpecField
 from usuarios.models import Estudiante
+from . import imagenes as specs
+from .almacenamiento import almacenamiento_imagenes
 
 class Categoria(models.Model):
     """Categorías para organizar productos"""
@@ -82,16 +85,58 @@ class Producto(models.Model):
     publicado_en = models.DateTimeField(auto_now_add=True)
     actualizado_en = models.DateTimeField(auto_now=True)
     visitas = models.PositiveIntegerField(default=0)
+    # Contador desnormalizado, mantenido por las señales de Favorito
+    cantidad_favoritos = models.PositiveIntegerField(default=0, editable=False)
     
     # Búsqueda
     tags = models.CharField(max_length=200, blank=True)
+    # Última vez que `calcular_similares` calculó sus vecinos; si es anterior a
+    # actualizado_en, el producto cambió y está pendiente de recalcular
+    similares_calculados_en = models.DateTimeField(null=True, blank=True, editable=False)
+    
+    # Solo se escriben con update(); ver `save`
+    CAMPOS_CONTADORES = ('visitas', 'cantidad_favoritos')
     
     class Meta:
         ordering = ['-publicado_en']
+        indexes = [
+            # Catálogo: disponibles, más recientes primero (keyset sobre publicado_en, id)
+            models.Index(fields=['estado', '-publicado_en', '-id'], name='producto_estado_pub_idx'),
+            # Panel del vendedor: conteos y filtros por estado, y su listado por fecha
+            models.Index(fields=['vendedor', 'estado'], name='producto_vendedor_estado_idx'),
+            models.Index(fields=['vendedor', '-publicado_en'], name='producto_vendedor_pub_idx'),
+            # Resumen del vendedor agrupado por categoría y sus productos más visitados
+            models.Index(fields=['vendedor', 'categoria'], name='producto_vendedor_cat_idx'),
+            models.Index(fields=['vendedor', '-visitas'], name='producto_vendedor_visitas_idx'),
+            # Páginas de categoría y relacionados
+            models.Index(fields=['categoria', 'estado', '-publicado_en', '-id'], name='producto_cat_estado_idx'),
+            # Último cambio del catálogo y de cada categoría (ETag / Last-Modified)
+            models.Index(fields=['actualizado_en'], name='producto_actualizado_idx'),
+            models.Index(fields=['categoria', 'actualizado_en'], name='producto_cat_actualizado_idx'),
+        ]
     
     def __str__(self):
         return f"{self.nombre} - ${self.precio}"
     
+    def save(self, *, update_fields=None, **kwargs):
+        # Visitas y favoritos se suman con F() desde otras peticiones: un save
+        # completo de una instancia leída antes los devolvería a su valor viejo
+        if update_fields is None and not self._state.adding and not kwargs.get('force_insert'):
+            update_fields = [
+                campo.name for campo in self._meta.concrete_fields
+                if not campo.primary_key and campo.name not in self.CAMPOS_CONTADORES
+            ]
+        super().save(update_fields=update_fields, **kwargs)
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        # Recordar la categoría guardada para invalidar también su caché al cambiarla
+        instancia._categoria_original_id = instancia.__dict__.get('categoria_id')
+        # y el estado, para registrar las transiciones en las estadísticas diarias
+        instancia._estado_original = instancia.__dict__.get('estado')
+        return instancia
+    
     @property
     def precio_formateado(self):
         return f"${self.precio:,.2f}"
@@ -101,9 +146,12 @@ class Producto(models.Model):
         return self.stock > 0 and self.estado == 'disponible'
     
     @property
-    def cantidad_favoritos(self):
-        return self.en_favoritos.count()
-    
+    def imagen_portada(self):
+        """Primera imagen del producto, usando la precarga de portada si existe"""
+        if hasattr(self, 'imagenes_portada'):
+            return self.imagenes_portada[0] if self.imagenes_portada else None
+        return self.imagenes.first()
+
     @property
     def ubicacion(self):
         """Obtener la ubicación automáticamente del vendedor"""
@@ -156,8 +204,10 @@ class Producto(models.Model):
         return self.en_favoritos.filter(estudiante=estudiante).exists()
     
     def incrementar_visitas(self):
+        """Registrar una visita; se escribe en la base de datos en diferido"""
+        from .contadores import registrar_visita
+        registrar_visita(self.id)
         self.visitas += 1
-        self.save(update_fields=['visitas'])
     
     def puede_editar(self, estudiante):
         """Verificar si un estudiante puede editar este producto"""
@@ -169,16 +219,67 @@ class Producto(models.Model):
 
 class ImagenProducto(models.Model):
     """Múltiples imágenes por producto"""
+    ESTADO_PENDIENTE = 'pendiente'
+    ESTADO_LISTA = 'lista'
+    ESTADO_ERROR = 'error'
+    ESTADO_OPCIONES = [
+        (ESTADO_PENDIENTE, '⏳ Procesando'),
+        (ESTADO_LISTA, '✅ Lista'),
+        (ESTADO_ERROR, '⚠️ Error'),
+    ]
+    
     producto = models.ForeignKey(Producto, on_delete=models.CASCADE, related_name='imagenes')
-    imagen = models.ImageField(upload_to='productos/')
+    imagen = models.ImageField(upload_to='productos/', storage=almacenamiento_imagenes)
     orden = models.PositiveIntegerField(default=0)
     creado_en = models.DateTimeField(auto_now_add=True)
+    # Las versiones redimensionadas se generan en segundo plano (productos/procesamiento.py)
+    estado = models.CharField(max_length=10, choices=ESTADO_OPCIONES, default=ESTADO_PENDIENTE)
+    
+    # Versiones redimensionadas (ver productos/imagenes.py), no se guardan en la BD
+    tarjeta_jpeg = ImageSpecField(source='imagen', spec=specs.TarjetaJPEG)
+    tarjeta_jpeg_2x = ImageSpecField(source='imagen', spec=specs.TarjetaJPEG2x)
+    tarjeta_webp = ImageSpecField(source='imagen', spec=specs.TarjetaWebP)
+    tarjeta_webp_2x = ImageSpecField(source='imagen', spec=specs.TarjetaWebP2x)
+    carrusel_jpeg = ImageSpecField(source='imagen', spec=specs.CarruselJPEG)
+    carrusel_jpeg_2x = ImageSpecField(source='imagen', spec=specs.CarruselJPEG2x)
+    carrusel_webp = ImageSpecField(source='imagen', spec=specs.CarruselWebP)
+    carrusel_webp_2x = ImageSpecField(source='imagen', spec=specs.CarruselWebP2x)
+    miniatura_jpeg = ImageSpecField(source='imagen', spec=specs.MiniaturaJPEG)
+    miniatura_webp = ImageSpecField(source='imagen', spec=specs.MiniaturaWebP)
     
     class Meta:
-        ordering = ['orden', 'creado_en']
+        ordering = ['orden', 'creado_en', 'id']
+        indexes = [
+            # Galería y portada de cada producto en su orden
+            models.Index(fields=['producto', 'orden', 'creado_en', 'id'], name='imagen_producto_orden_idx'),
+        ]
     
     def __str__(self):
         return f"Imagen de {self.producto.nombre}"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        # Recordar el archivo guardado para ajustar las referencias si cambia
+        instancia._imagen_original = instancia.__dict__.get('imagen')
+        return instancia
+    
+    @property
+    def esta_lista(self):
+        return self.estado == self.ESTADO_LISTA
+
+class ArchivoImagen(models.Model):
+    """Archivo de imagen único en disco y cuántas ImagenProducto lo usan"""
+    nombre = models.CharField(max_length=255, unique=True)
+    referencias = models.PositiveIntegerField(default=0)
+    creado_en = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Archivo de imagen'
+        verbose_name_plural = 'Archivos de imagen'
+    
+    def __str__(self):
+        return f"{self.nombre} ({self.referencias})"
 
 class Favorito(models.Model):
     """Productos favoritos de los usuarios"""
@@ -189,8 +290,88 @@ class Favorito(models.Model):
     class Meta:
         unique_together = ['estudiante', 'producto']
         ordering = ['-agregado_en']
+        indexes = [
+            # Mis favoritos: keyset sobre (agregado_en, id)
+            models.Index(fields=['estudiante', '-agregado_en', '-id'], name='favorito_estudiante_fecha_idx'),
+        ]
         verbose_name = 'Favorito'
         verbose_name_plural = 'Favoritos'
     
     def __str__(self):
-        return f"{self.estudiante.apodo} ❤️ {self.producto.nombre}"
\ No newline at end of file
+        return f"{self.estudiante.apodo} ❤️ {self.producto.nombre}"
+
+class EventoProducto(models.Model):
+    """Actividad cruda de un producto, pendiente de resumir por día.
+
+    `consolidar_estadisticas` suma estos eventos en EstadisticaDiaria y los borra.
+    """
+    TIPO_VISITAS = 'visitas'
+    TIPO_FAVORITO = 'favorito'
+    # Los demás tipos son el estado al que pasa el producto
+    TIPO_OPCIONES = [
+        (TIPO_VISITAS, '👁️ Visitas'),
+        (TIPO_FAVORITO, '❤️ Favorito agregado'),
+    ] + Producto.ESTADO_OPCIONES
+    
+    producto = models.ForeignKey(Producto, on_delete=models.CASCADE, related_name='+')
+    tipo = models.CharField(max_length=20, choices=TIPO_OPCIONES)
+    cantidad = models.PositiveIntegerField(default=1)
+    ocurrido_en = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        verbose_name = 'Evento de producto'
+        verbose_name_plural = 'Eventos de productos'
+    
+    def __str__(self):
+        return f"{self.get_tipo_display()} x{self.cantidad} - {self.producto_id}"
+
+class EstadisticaDiaria(models.Model):
+    """Actividad de un producto en un día, para las tendencias del vendedor"""
+    producto = models.ForeignKey(Producto, on_delete=models.CASCADE, related_name='estadisticas_diarias')
+    # Copia de producto.vendedor para leer las tendencias por rango sin JOIN
+    vendedor = models.ForeignKey(Estudiante, on_delete=models.CASCADE, related_name='+')
+    fecha = models.DateField()
+    visitas = models.PositiveIntegerField(default=0)
+    favoritos = models.PositiveIntegerField(default=0)
+    # Veces que el producto pasó a cada estado ese día
+    a_disponible = models.PositiveIntegerField(default=0)
+    a_reservado = models.PositiveIntegerField(default=0)
+    a_vendido = models.PositiveIntegerField(default=0)
+    a_inactivo = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        unique_together = ['producto', 'fecha']
+        indexes = [
+            models.Index(fields=['vendedor', 'fecha'], name='estadistica_vendedor_fecha_idx'),
+        ]
+        verbose_name = 'Estadística diaria'
+        verbose_name_plural = 'Estadísticas diarias'
+    
+    def __str__(self):
+        return f"{self.producto_id} {self.fecha}"
+
+class ProductoRelacionado(models.Model):
+    """Vecino precalculado de un producto (los K más parecidos), para recomendaciones"""
+    TIPO_CONTENIDO = 'contenido'
+    TIPO_FAVORITOS = 'favoritos'
+    TIPO_OPCIONES = [
+        (TIPO_CONTENIDO, 'Por contenido (TF-IDF)'),
+        (TIPO_FAVORITOS, 'Guardados por los mismos estudiantes'),
+    ]
+    
+    producto = models.ForeignKey(Producto, on_delete=models.CASCADE, related_name='relacionados')
+    relacionado = models.ForeignKey(Producto, on_delete=models.CASCADE, related_name='+')
+    tipo = models.CharField(max_length=20, choices=TIPO_OPCIONES)
+    puntaje = models.FloatField()
+    
+    class Meta:
+        unique_together = ['producto', 'tipo', 'relacionado']
+        indexes = [
+            # Detalle: los vecinos de un producto, más parecidos primero
+            models.Index(fields=['producto', 'tipo', '-puntaje'], name='relacionado_producto_idx'),
+        ]
+        verbose_name = 'Producto relacionado'
+        verbose_name_plural = 'Productos relacionados'
+    
+    def __str__(self):
+        return f"{self.producto_id} → {self.relacionado_id} ({self.puntaje:.3f})"
@@ -0,0 +1,177 @@
+import base64
+import binascii
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.db.models import F, Prefetch, Q, Window
+from django.db.models.functions import RowNumber
+
+from .models import ImagenProducto
+
+PRODUCTOS_POR_PAGINA = 24
+
+
+def _b64(crudo):
+    return base64.urlsafe_b64encode(crudo.encode()).decode().rstrip('=')
+
+
+def _desde_b64(cursor):
+    relleno = '=' * (-len(cursor) % 4)
+    return base64.urlsafe_b64decode(cursor + relleno).decode()
+
+
+def codificar_cursor(objeto, campo='publicado_en'):
+    """Cursor opaco a partir de la clave (campo de fecha, id) de un objeto"""
+    return _b64(f"{getattr(objeto, campo).isoformat()}|{objeto.id}")
+
+
+def decodificar_cursor(cursor):
+    """Devuelve (fecha, id) o None si el cursor no es válido"""
+    if not cursor:
+        return None
+    try:
+        fecha, producto_id = _desde_b64(cursor).split('|')
+        return datetime.fromisoformat(fecha), int(producto_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def con_portada(queryset, ruta='imagenes'):
+    """Precargar solo la primera imagen de cada producto en `imagenes_portada`.
+
+    `ruta` permite llegar a las imágenes desde otro modelo, por ejemplo
+    'producto__imagenes' para un queryset de Favorito.
+
+    La ventana se escribe a mano en lugar de rebanar un queryset ordenado: con
+    `[:1]` Django repite el ORDER BY por fuera de la ventana, sobre las
+    portadas de todos los productos, y eso ya no lo cubre ningún índice. Dentro
+    de cada producto el orden sale de `imagen_producto_orden_idx`.
+    """
+    portadas = ImagenProducto.objects.alias(
+        posicion=Window(RowNumber(), partition_by=F('producto'), order_by=['orden', 'creado_en', 'id']),
+    ).filter(posicion=1).order_by()
+    return queryset.prefetch_related(
+        Prefetch(ruta, queryset=portadas, to_attr='imagenes_portada')
+    )
+
+
+class PaginaCursor:
+    """Página de productos obtenida por keyset sobre (publicado_en, id)"""
+
+    def __init__(self, productos, siguiente_cursor, cursor_actual, parametros):
+        self.productos = productos
+        self.siguiente_cursor = siguiente_cursor
+        self.cursor_actual = cursor_actual
+        self._parametros = parametros
+
+    def __iter__(self):
+        return iter(self.productos)
+
+    def __len__(self):
+        return len(self.productos)
+
+    @property
+    def tiene_siguiente(self):
+        return self.siguiente_cursor is not None
+
+    @property
+    def es_primera(self):
+        return not self.cursor_actual
+
+    @property
+    def querystring_siguiente(self):
+        parametros = self._parametros.copy()
+        parametros['cursor'] = self.siguiente_cursor
+        return parametros.urlencode()
+
+    @property
+    def querystring_primera(self):
+        parametros = self._parametros.copy()
+        parametros.pop('cursor', None)
+        return parametros.urlencode()
+
+
+def _filtrar_por_cursor(queryset, request, por_pagina, campo):
+    """(queryset de la página más uno, cursor válido recibido o '')"""
+    cursor = request.GET.get('cursor', '')
+    queryset = queryset.order_by(f'-{campo}', '-id')
+
+    clave = decodificar_cursor(cursor)
+    if clave:
+        fecha, objeto_id = clave
+        queryset = queryset.filter(
+            Q(**{f'{campo}__lt': fecha}) |
+            Q(**{campo: fecha, 'id__lt': objeto_id})
+        )
+    else:
+        cursor = ''
+    return queryset[:por_pagina + 1], cursor
+
+
+def _pagina_cursor(productos, cursor, request, por_pagina, campo):
+    siguiente_cursor = None
+    if len(productos) > por_pagina:
+        productos = productos[:por_pagina]
+        siguiente_cursor = codificar_cursor(productos[-1], campo)
+    return PaginaCursor(productos, siguiente_cursor, cursor, request.GET)
+
+
+def paginar_por_cursor(queryset, request, por_pagina=PRODUCTOS_POR_PAGINA, campo='publicado_en'):
+    """Paginar un queryset sin OFFSET ni COUNT.
+
+    Ordena por (-campo, -id) y continúa a partir del cursor recibido en
+    `?cursor=`, de modo que el costo de cada página no depende del tamaño del
+    catálogo. `campo` es la fecha que define el orden: 'publicado_en' para
+    productos, 'agregado_en' para favoritos.
+    """
+    queryset, cursor = _filtrar_por_cursor(queryset, request, por_pagina, campo)
+    return _pagina_cursor(list(queryset), cursor, request, por_pagina, campo)
+
+
+async def apaginar_por_cursor(queryset, request, por_pagina=PRODUCTOS_POR_PAGINA, campo='publicado_en'):
+    """Versión async de `paginar_por_cursor`"""
+    queryset, cursor = _filtrar_por_cursor(queryset, request, por_pagina, campo)
+    productos = [producto async for producto in queryset]
+    return _pagina_cursor(productos, cursor, request, por_pagina, campo)
+
+
+def _posicion_ranking(request, por_pagina):
+    """(posición de inicio, cursor válido recibido o '')"""
+    cursor = request.GET.get('cursor', '')
+    try:
+        inicio = int(_desde_b64(cursor)) if cursor else 0
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        inicio = 0
+    inicio = max(inicio, 0)
+    if not inicio:
+        cursor = ''
+    return inicio, cursor
+
+
+def _pagina_ranking(por_id, ids, inicio, cursor, request, por_pagina):
+    productos = [por_id[producto_id] for producto_id in ids[:por_pagina] if producto_id in por_id]
+
+    # `ids` trae un resultado de más solo para saber si hay otra página
+    siguiente_cursor = _b64(str(inicio + por_pagina)) if len(ids) > por_pagina else None
+    return PaginaCursor(productos, siguiente_cursor, cursor, request.GET)
+
+
+def paginar_por_ranking(queryset, buscar, request, por_pagina=PRODUCTOS_POR_PAGINA):
+    """Paginar resultados ordenados por relevancia.
+
+    `buscar(desde, limite)` devuelve los ids del ranking a partir de la
+    posición `desde`. El cursor es esa posición: cada página pide al índice
+    solo sus resultados, así que se puede avanzar hasta el final del ranking.
+    """
+    inicio, cursor = _posicion_ranking(request, por_pagina)
+    ids = buscar(inicio, por_pagina + 1)
+    por_id = queryset.in_bulk(ids[:por_pagina])
+    return _pagina_ranking(por_id, ids, inicio, cursor, request, por_pagina)
+
+
+async def apaginar_por_ranking(queryset, buscar, request, por_pagina=PRODUCTOS_POR_PAGINA):
+    """Versión async de `paginar_por_ranking`; `buscar` es síncrona"""
+    inicio, cursor = _posicion_ranking(request, por_pagina)
+    ids = await sync_to_async(buscar)(inicio, por_pagina + 1)
+    por_id = await queryset.ain_bulk(ids[:por_pagina])
+    return _pagina_ranking(por_id, ids, inicio, cursor, request, por_pagina)
@@ -0,0 +1,117 @@
+"""Procesamiento en segundo plano de las imágenes subidas.
+
+Las vistas solo guardan el archivo original. Al confirmarse la transacción,
+cada imagen nueva se envía a un pool de hilos que corrige la orientación,
+elimina los metadatos EXIF, genera todas las versiones de
+`productos.imagenes` y marca la imagen como lista. Mientras tanto los
+templates muestran un aviso de "procesando".
+
+Con IMAGENES_PROCESAMIENTO_SINCRONO = True (útil en tests) todo se hace en el
+mismo hilo al confirmar la transacción.
+"""
+
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .almacenamiento import quitar_referencia, sumar_referencia
+from .imagenes import TAMANOS
+from .models import ImagenProducto, Producto
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+
+
+def _obtener_pool():
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'IMAGENES_PROCESAMIENTO_HILOS', 2),
+            thread_name_prefix='imagenes',
+        )
+    return _pool
+
+
+def encolar_procesamiento(imagen_id):
+    """Procesar la imagen cuando se confirme la transacción actual"""
+    transaction.on_commit(lambda: _enviar(imagen_id))
+
+
+def _enviar(imagen_id):
+    if getattr(settings, 'IMAGENES_PROCESAMIENTO_SINCRONO', False):
+        procesar_imagen(imagen_id)
+    else:
+        _obtener_pool().submit(_procesar_en_hilo, imagen_id)
+
+
+def _procesar_en_hilo(imagen_id):
+    close_old_connections()
+    try:
+        procesar_imagen(imagen_id)
+    finally:
+        close_old_connections()
+
+
+def _normalizar_original(campo):
+    """Aplicar la orientación EXIF y volver a guardar el original sin metadatos"""
+    with campo.open('rb') as archivo:
+        imagen = Image.open(archivo)
+        imagen.load()
+    formato = imagen.format or 'JPEG'
+    imagen = ImageOps.exif_transpose(imagen)
+    if formato == 'JPEG' and imagen.mode not in ('RGB', 'L'):
+        imagen = imagen.convert('RGB')
+
+    salida = io.BytesIO()
+    # Sin pasar exif= ni pnginfo=, PIL no copia los metadatos del original
+    imagen.save(salida, format=formato, quality=90, optimize=True)
+
+    # El almacenamiento es por contenido: el original sin procesar se libera
+    # al actualizar el campo si ninguna otra imagen lo usa
+    return campo.storage.save(campo.name, ContentFile(salida.getvalue()))
+
+
+def procesar_imagen(imagen_id):
+    try:
+        imagen = ImagenProducto.objects.get(pk=imagen_id)
+    except ImagenProducto.DoesNotExist:
+        return  # Se eliminó antes de llegar a procesarse
+
+    original = imagen.imagen.name
+    try:
+        # Asignar el nombre (no solo .name) para que las versiones se generen
+        # a partir del original normalizado y no del archivo ya abierto
+        imagen.imagen = _normalizar_original(imagen.imagen)
+        for campos in TAMANOS.values():
+            for campo in campos:
+                if campo:
+                    getattr(imagen, campo).generate(force=True)
+    except Exception:
+        logger.exception("Error procesando la imagen %s", imagen_id)
+        estado = ImagenProducto.ESTADO_ERROR
+    else:
+        estado = ImagenProducto.ESTADO_LISTA
+
+    nombre = imagen.imagen.name
+    storage = imagen.imagen.storage
+    with transaction.atomic():
+        # update() en vez de save(): la fila pudo borrarse (o cambiar de
+        # archivo) mientras se procesaba, y entonces no hay nada que guardar
+        actualizadas = ImagenProducto.objects.filter(pk=imagen_id, imagen=original).update(
+            imagen=nombre, estado=estado,
+        )
+        if nombre != original:
+            # update() no dispara las señales que llevan las referencias
+            sumar_referencia(nombre)
+            quitar_referencia(original if actualizadas else nombre, storage)
+    if not actualizadas:
+        return
+    # Cambiar actualizado_en invalida las tarjetas cacheadas del producto
+    Producto.objects.filter(pk=imagen.producto_id).update(actualizado_en=timezone.now())
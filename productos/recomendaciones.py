@@ -0,0 +1,340 @@
+"""Productos relacionados precalculados.
+
+Comandos periódicos calculan los K vecinos de cada producto y los guardan en
+ProductoRelacionado; el detalle y los favoritos solo los leen con búsquedas
+por índice.
+
+Por contenido (`calcular_similares`): cada producto es un vector TF-IDF
+disperso sobre los términos de nombre, tags y descripción (los mismos que
+produce el analizador de la búsqueda), normalizado, y la similitud es el
+coseno. Los productos candidatos (disponibles) se guardan en listas invertidas
+término → [(producto, peso)] ordenadas por peso y truncadas, así que el
+producto escalar de un vector contra todo el catálogo solo recorre los
+candidatos que comparten algún término fuerte, con costo acotado.
+
+En modo incremental solo se recalculan los productos modificados desde su
+último cálculo, y cada uno se ofrece como vecino a los productos de su lista.
+Las listas ajenas no se corrigen si un producto deja de parecerse (el IDF
+también se desplaza con el tiempo): para eso está el recálculo completo.
+
+Por favoritos (`calcular_coocurrencias`): filtrado colaborativo ítem a ítem
+sobre la matriz estudiante × producto de Favorito. Dos productos se parecen
+si los guardan los mismos estudiantes; la similitud es el coseno
+coocurrencias / sqrt(favoritos_i · favoritos_j). Los productos se procesan
+por bloques de ids: en cada bloque se recorren las listas de favoritos de
+cada estudiante en streaming y solo se acumulan los pares cuyo primer
+producto está en el bloque, así que la memoria depende del bloque y no del
+total de favoritos.
+"""
+
+import heapq
+import math
+from collections import Counter, defaultdict
+from operator import itemgetter
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .busqueda.analizador import analizar, analizar_tags
+from .models import Favorito, Producto, ProductoRelacionado
+from .paginacion import con_portada
+
+VECINOS = 12
+LOTE = 500
+SIMILITUD_MINIMA = 0.05
+# Un término aporta como mucho sus N productos de mayor peso
+LARGO_MAXIMO_LISTA = 200
+PESOS_CAMPOS = {'nombre': 3.0, 'tags': 2.0, 'descripcion': 1.0}
+RELACIONADOS_EN_DETALLE = 4
+# Filtrado colaborativo
+BLOQUE_PRODUCTOS = 5000
+COOCURRENCIAS_MINIMAS = 2
+# Estudiantes con más favoritos aportan solo los más recientes (evita O(n²) por cesta)
+LARGO_MAXIMO_CESTA = 200
+RECOMENDADOS_EN_FAVORITOS = 8
+
+
+# --- Almacenamiento compartido ------------------------------------------------
+
+def guardar_vecinos(vecinos, tipo):
+    """Reemplazar las listas {producto_id: [(relacionado_id, puntaje)]} de un tipo"""
+    with transaction.atomic():
+        ProductoRelacionado.objects.filter(producto_id__in=list(vecinos), tipo=tipo).delete()
+        ProductoRelacionado.objects.bulk_create(
+            [
+                ProductoRelacionado(
+                    producto_id=producto_id, relacionado_id=relacionado_id, tipo=tipo, puntaje=puntaje,
+                )
+                for producto_id, lista in vecinos.items()
+                for relacionado_id, puntaje in lista
+            ],
+            batch_size=LOTE,
+        )
+
+
+def ofrecer_vecinos(propuestas, tipo, k=VECINOS):
+    """Sumar candidatos {producto_id: [(relacionado_id, puntaje)]} a listas existentes.
+
+    Solo se reescriben las listas en las que algún candidato entra al top-K.
+    """
+    actuales = defaultdict(dict)
+    for producto_id, relacionado_id, puntaje in ProductoRelacionado.objects.filter(
+        producto_id__in=list(propuestas), tipo=tipo,
+    ).values_list('producto_id', 'relacionado_id', 'puntaje'):
+        actuales[producto_id][relacionado_id] = puntaje
+
+    cambios = {}
+    for producto_id, candidatos in propuestas.items():
+        lista = actuales[producto_id]
+        anterior = heapq.nlargest(k, lista.items(), key=itemgetter(1))
+        lista.update(candidatos)
+        nueva = heapq.nlargest(k, lista.items(), key=itemgetter(1))
+        if nueva != anterior:
+            cambios[producto_id] = nueva
+    guardar_vecinos(cambios, tipo)
+    return len(cambios)
+
+
+def _relaciones(producto):
+    return con_portada(
+        ProductoRelacionado.objects.filter(producto=producto, relacionado__estado='disponible')
+        .select_related('relacionado__categoria', 'relacionado__vendedor__user'),
+        'relacionado__imagenes',
+    ).order_by('tipo', '-puntaje')
+
+
+def _por_tipo(relaciones, limite):
+    por_tipo = {tipo: [] for tipo, _ in ProductoRelacionado.TIPO_OPCIONES}
+    for relacion in relaciones:
+        if len(por_tipo[relacion.tipo]) < limite:
+            por_tipo[relacion.tipo].append(relacion.relacionado)
+    return por_tipo
+
+
+def productos_relacionados(producto, limite=RELACIONADOS_EN_DETALLE):
+    """{tipo: vecinos disponibles más parecidos primero} en una sola consulta.
+
+    Cada producto tiene como mucho K vecinos por tipo, así que se leen todos y
+    se recortan aquí. `producto` puede ser la instancia o su id.
+    """
+    return _por_tipo(_relaciones(producto), limite)
+
+
+async def aproductos_relacionados(producto, limite=RELACIONADOS_EN_DETALLE):
+    """Versión async de `productos_relacionados`"""
+    return _por_tipo([relacion async for relacion in _relaciones(producto)], limite)
+
+
+def recomendados_para(estudiante, limite=RECOMENDADOS_EN_FAVORITOS):
+    """Vecinos por favoritos de los favoritos del estudiante que aún no guardó"""
+    # Los vecinos de los favoritos se suman aquí: son pocas filas por
+    # estudiante y el GROUP BY ... ORDER BY SUM() necesitaría dos ordenamientos
+    # temporales en la base de datos
+    vecinos = (
+        ProductoRelacionado.objects.filter(
+            tipo=ProductoRelacionado.TIPO_FAVORITOS,
+            producto__en_favoritos__estudiante=estudiante,
+            relacionado__estado='disponible',
+        )
+        .exclude(relacionado__en_favoritos__estudiante=estudiante)
+        .values_list('relacionado_id', 'puntaje')
+    )
+    puntajes = defaultdict(float)
+    for relacionado_id, puntaje in vecinos:
+        puntajes[relacionado_id] += puntaje
+    mejores = heapq.nsmallest(limite, puntajes.items(), key=lambda par: (-par[1], par[0]))
+    ids = [relacionado_id for relacionado_id, _ in mejores]
+    if not ids:
+        return []
+    por_id = con_portada(
+        Producto.objects.select_related('categoria', 'vendedor__user')
+    ).in_bulk(ids)
+    return [por_id[producto_id] for producto_id in ids if producto_id in por_id]
+
+
+# --- Similitud por contenido (TF-IDF) -----------------------------------------
+
+def _terminos(nombre, descripcion, tags):
+    """Frecuencia ponderada por campo de cada término del producto"""
+    frecuencias = Counter()
+    for campo, terminos in (
+        ('nombre', analizar(nombre)),
+        ('tags', analizar_tags(tags)),
+        ('descripcion', analizar(descripcion)),
+    ):
+        for termino in terminos:
+            frecuencias[termino] += PESOS_CAMPOS[campo]
+    return frecuencias
+
+
+class IndiceTfidf:
+    """Vectores TF-IDF normalizados de todo el catálogo y listas invertidas de los candidatos"""
+
+    def __init__(self, filas):
+        vocabulario = {}
+        documentos = {}
+        frecuencia_documental = Counter()
+        candidatos = set()
+        for producto_id, nombre, descripcion, tags, estado in filas:
+            frecuencias = {}
+            for termino, tf in _terminos(nombre, descripcion, tags).items():
+                frecuencias[vocabulario.setdefault(termino, len(vocabulario))] = tf
+            documentos[producto_id] = frecuencias
+            frecuencia_documental.update(frecuencias.keys())
+            if estado == 'disponible':
+                candidatos.add(producto_id)
+
+        self.candidatos = candidatos
+        total = len(documentos)
+        idf = {
+            termino: math.log((1 + total) / (1 + df)) + 1
+            for termino, df in frecuencia_documental.items()
+        }
+        self.vectores = {}
+        listas = defaultdict(list)
+        for producto_id, frecuencias in documentos.items():
+            pesos = [(termino, (1 + math.log(tf)) * idf[termino]) for termino, tf in frecuencias.items()]
+            norma = math.sqrt(sum(peso * peso for _, peso in pesos)) or 1.0
+            vector = [(termino, peso / norma) for termino, peso in pesos]
+            self.vectores[producto_id] = vector
+            if producto_id in candidatos:
+                for termino, peso in vector:
+                    listas[termino].append((producto_id, peso))
+
+        self.listas = {
+            termino: heapq.nlargest(LARGO_MAXIMO_LISTA, lista, key=itemgetter(1))
+            for termino, lista in listas.items()
+        }
+
+    @classmethod
+    def desde_bd(cls):
+        return cls(
+            Producto.objects.order_by().values_list('id', 'nombre', 'descripcion', 'tags', 'estado')
+            .iterator(chunk_size=LOTE * 4)
+        )
+
+    def vecinos(self, producto_id, k=VECINOS):
+        """Los k candidatos con mayor coseno frente al producto"""
+        acumulado = defaultdict(float)
+        for termino, peso in self.vectores.get(producto_id, ()):
+            for candidato_id, peso_candidato in self.listas.get(termino, ()):
+                acumulado[candidato_id] += peso * peso_candidato
+        acumulado.pop(producto_id, None)
+        mejores = heapq.nlargest(k, acumulado.items(), key=itemgetter(1))
+        return [
+            (candidato_id, round(puntaje, 4))
+            for candidato_id, puntaje in mejores if puntaje >= SIMILITUD_MINIMA
+        ]
+
+
+def calcular_similares(completo=False, k=VECINOS, tamano_lote=LOTE):
+    """Calcular los vecinos por contenido de los productos pendientes (o de todos).
+
+    Devuelve (productos recalculados, listas ajenas actualizadas).
+    """
+    inicio = timezone.now()
+    indice = IndiceTfidf.desde_bd()
+    pendientes = Producto.objects.all()
+    if not completo:
+        pendientes = pendientes.filter(
+            Q(similares_calculados_en__isnull=True) |
+            Q(similares_calculados_en__lt=F('actualizado_en'))
+        )
+    ids = list(pendientes.order_by('id').values_list('id', flat=True))
+
+    actualizadas = 0
+    for posicion in range(0, len(ids), tamano_lote):
+        lote = ids[posicion:posicion + tamano_lote]
+        vecinos = {producto_id: indice.vecinos(producto_id, k) for producto_id in lote}
+        guardar_vecinos(vecinos, ProductoRelacionado.TIPO_CONTENIDO)
+
+        if not completo:
+            # El coseno es simétrico: cada producto recalculado puede entrar en la lista de sus vecinos
+            en_lote = set(lote)
+            propuestas = defaultdict(list)
+            for producto_id, lista in vecinos.items():
+                if producto_id not in indice.candidatos:
+                    continue
+                for vecino_id, puntaje in lista:
+                    if vecino_id not in en_lote:
+                        propuestas[vecino_id].append((producto_id, puntaje))
+            actualizadas += ofrecer_vecinos(propuestas, ProductoRelacionado.TIPO_CONTENIDO, k)
+
+        Producto.objects.filter(id__in=lote).update(similares_calculados_en=inicio)
+    return len(ids), actualizadas
+
+
+# --- Filtrado colaborativo por favoritos --------------------------------------
+
+def _cestas(tamano_lote):
+    """(estudiante, [productos]) en streaming, ordenado por estudiante"""
+    favoritos = (
+        Favorito.objects.order_by('estudiante_id', '-agregado_en')
+        .values_list('estudiante_id', 'producto_id')
+        .iterator(chunk_size=tamano_lote * 4)
+    )
+    actual, cesta = None, []
+    for estudiante_id, producto_id in favoritos:
+        if estudiante_id != actual:
+            if cesta:
+                yield actual, cesta
+            actual, cesta = estudiante_id, []
+        if len(cesta) < LARGO_MAXIMO_CESTA:
+            cesta.append(producto_id)
+    if cesta:
+        yield actual, cesta
+
+
+def calcular_coocurrencias(k=VECINOS, bloque=BLOQUE_PRODUCTOS, tamano_lote=LOTE):
+    """Recalcular los vecinos por favoritos de todos los productos, bloque a bloque.
+
+    Devuelve (productos procesados, productos con vecinos).
+    """
+    conteos = dict(
+        Favorito.objects.order_by().values_list('producto').annotate(total=Count('id'))
+    )
+    candidatos = set(
+        Producto.objects.filter(id__in=list(conteos), estado='disponible').values_list('id', flat=True)
+    )
+    ids = list(Producto.objects.order_by('id').values_list('id', flat=True))
+
+    con_vecinos = 0
+    for posicion in range(0, len(ids), bloque):
+        ids_bloque = ids[posicion:posicion + bloque]
+        primero, ultimo = ids_bloque[0], ids_bloque[-1]
+        coocurrencias = defaultdict(Counter)
+        for _, cesta in _cestas(tamano_lote):
+            en_bloque = [producto_id for producto_id in cesta if primero <= producto_id <= ultimo]
+            if not en_bloque:
+                continue
+            otros = [producto_id for producto_id in cesta if producto_id in candidatos]
+            for producto_id in en_bloque:
+                fila = coocurrencias[producto_id]
+                for otro_id in otros:
+                    if otro_id != producto_id:
+                        fila[otro_id] += 1
+
+        vecinos = {}
+        for producto_id in ids_bloque:
+            fila = coocurrencias.pop(producto_id, None)
+            if not fila:
+                vecinos[producto_id] = []
+                continue
+            puntajes = (
+                (otro_id, veces / math.sqrt(conteos[producto_id] * conteos[otro_id]))
+                for otro_id, veces in fila.items() if veces >= COOCURRENCIAS_MINIMAS
+            )
+            vecinos[producto_id] = [
+                (otro_id, round(puntaje, 4))
+                for otro_id, puntaje in heapq.nlargest(k, puntajes, key=itemgetter(1))
+            ]
+            con_vecinos += bool(vecinos[producto_id])
+
+        for inicio in range(0, len(ids_bloque), tamano_lote):
+            lote = ids_bloque[inicio:inicio + tamano_lote]
+            guardar_vecinos(
+                {producto_id: vecinos[producto_id] for producto_id in lote},
+                ProductoRelacionado.TIPO_FAVORITOS,
+            )
+    return len(ids), con_vecinos
@@ -0,0 +1,83 @@
+"""Utilidades compartidas por los comandos de medición de rendimiento.
+
+`medir_vistas`, `prueba_carga` y `explicar_consultas` recorren las mismas
+URLs, sobre una base de datos de pruebas desechable, con el vendedor que más
+productos tiene como usuario.
+"""
+
+import logging
+import math
+import tempfile
+from contextlib import contextmanager
+
+from django.db import connection
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from usuarios import urls as usuarios_urls
+from usuarios.models import Estudiante
+
+from . import urls as productos_urls
+from .models import Categoria, Producto
+
+# Vistas que modifican datos con un GET: medirlas alteraría las siguientes
+EXCLUIDAS = {
+    'productos:toggle_favorito', 'productos:cambiar_estado', 'productos:duplicar',
+    'productos:activar_desactivar', 'usuarios:logout',
+}
+
+
+def percentil(valores, p):
+    """Percentil por rango más cercano"""
+    ordenados = sorted(valores)
+    indice = max(math.ceil(p / 100 * len(ordenados)) - 1, 0)
+    return ordenados[indice]
+
+
+def silenciar_logs():
+    logging.getLogger('marketcampus.peticiones').setLevel(logging.WARNING)
+    logging.getLogger('django.request').setLevel(logging.CRITICAL)  # Los 500 se reportan aparte
+
+
+@contextmanager
+def base_de_datos_temporal():
+    """Base de datos de pruebas y MEDIA_ROOT temporales: la de desarrollo no se toca.
+
+    Las réplicas se desactivan: no tienen los datos de la base temporal.
+    """
+    setup_test_environment()
+    nombre_original = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media, REPLICAS_LECTURA=[]):
+            yield
+    finally:
+        connection.creation.destroy_test_db(nombre_original, verbosity=0)
+        teardown_test_environment()
+
+
+def cliente_y_urls():
+    """Cliente con sesión del vendedor más activo y (nombre, url) de cada patrón"""
+    vendedor = Estudiante.objects.annotate(n=Count('productos_vendidos')).order_by('-n').first()
+    # Un error en una vista se reporta como estado 500 en vez de cortar la medición
+    client = Client(raise_request_exception=False)
+    client.force_login(vendedor.user)
+
+    otro = Estudiante.objects.exclude(id=vendedor.id).first() or vendedor
+    argumentos = {
+        'producto_id': Producto.objects.filter(vendedor=vendedor).values_list('id', flat=True).first(),
+        'categoria_id': Categoria.objects.annotate(n=Count('productos')).order_by('-n').first().id,
+        'vendedor_id': otro.id,
+        'estudiante_id': vendedor.id,
+        'id': vendedor.id,
+    }
+    urls = []
+    for modulo in (productos_urls, usuarios_urls):
+        for patron in modulo.urlpatterns:
+            nombre = f"{modulo.app_name}:{patron.name}"
+            if nombre in EXCLUIDAS:
+                continue
+            kwargs = {clave: argumentos[clave] for clave in patron.pattern.converters}
+            urls.append((nombre, reverse(nombre, kwargs=kwargs)))
+    return client, urls
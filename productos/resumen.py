@@ -0,0 +1,91 @@
+"""Resumen del panel de un vendedor en una sola consulta.
+
+Una única consulta agrupada por categoría devuelve, con agregados
+condicionales, los conteos por estado, visitas, favoritos, ingresos y
+publicaciones recientes de cada categoría; los totales del vendedor se suman
+en Python a partir de esas filas. La comparten `mis_productos`,
+`estadisticas_productos` y `productos_mas_vendidos`.
+"""
+
+from datetime import timedelta
+
+from django.db.models import Count, Min, Q, Sum
+from django.utils import timezone
+
+from .models import Categoria, Producto
+
+ESTADOS = [estado for estado, _ in Producto.ESTADO_OPCIONES]
+DIAS_RECIENTES = 7
+
+
+class ResumenVendedor:
+
+    def __init__(self, filas):
+        self.categorias = filas
+        self.por_estado = {estado: sum(fila[estado] for fila in filas) for estado in ESTADOS}
+        self.total = sum(fila['total'] for fila in filas)
+        self.total_visitas = sum(fila['suma_visitas'] or 0 for fila in filas)
+        self.total_favoritos = sum(fila['suma_favoritos'] or 0 for fila in filas)
+        self.ingresos = sum(fila['ingresos'] or 0 for fila in filas)
+        self.recientes = sum(fila['recientes'] for fila in filas)
+
+    @property
+    def disponibles(self):
+        return self.por_estado['disponible']
+
+    @property
+    def vendidos(self):
+        return self.por_estado['vendido']
+
+    @property
+    def lista_por_estado(self):
+        """[{'estado', 'total'}] de los estados con productos, como values().annotate()"""
+        return [
+            {'estado': estado, 'total': total}
+            for estado, total in self.por_estado.items() if total
+        ]
+
+    @property
+    def ventas_por_categoria(self):
+        ventas = [
+            {'categoria__nombre': fila['categoria__nombre'], 'total': fila['vendido'], 'ingresos': fila['ingresos']}
+            for fila in self.categorias if fila['vendido']
+        ]
+        return sorted(ventas, key=lambda fila: fila['total'], reverse=True)
+
+    @property
+    def categorias_con_productos(self):
+        """Categorías (id, nombre legible) en las que el vendedor publicó algo"""
+        nombres = dict(Categoria.CATEGORIAS_UNIVERSITARIAS)
+        return [
+            {'id': fila['categoria_id'], 'nombre': nombres.get(fila['categoria__nombre'], fila['categoria__nombre'])}
+            for fila in self.categorias if fila['categoria_id']
+        ]
+
+
+def resumen_vendedor(estudiante):
+    desde = timezone.now() - timedelta(days=DIAS_RECIENTES)
+    conteos_por_estado = {
+        estado: Count('id', filter=Q(estado=estado)) for estado in ESTADOS
+    }
+    # Agrupado solo por categoria_id, que llega en orden por
+    # producto_vendedor_cat_idx; el nombre sale de la única categoría del grupo
+    filas = list(
+        Producto.objects.filter(vendedor=estudiante)
+        .values('categoria_id')
+        .annotate(
+            nombre_categoria=Min('categoria__nombre'),
+            total=Count('id'),
+            suma_visitas=Sum('visitas'),
+            suma_favoritos=Sum('cantidad_favoritos'),
+            ingresos=Sum('precio', filter=Q(estado='vendido')),
+            recientes=Count('id', filter=Q(publicado_en__gte=desde)),
+            **conteos_por_estado,
+        )
+        .order_by()
+    )
+    for fila in filas:
+        fila['categoria__nombre'] = fila.pop('nombre_categoria')
+    # Pocas filas (una por categoría): ordenarlas aquí evita un ordenamiento temporal en SQL
+    filas.sort(key=lambda fila: fila['total'], reverse=True)
+    return ResumenVendedor(filas)
@@ -0,0 +1,95 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .almacenamiento import quitar_referencia, sumar_referencia
+from .busqueda import desindexar_producto, indexar_producto
+from .cache import invalidar_catalogo, invalidar_categorias
+from .contadores import sumar_favoritos
+from .estadisticas import registrar_evento
+from .models import Categoria, EventoProducto, Favorito, ImagenProducto, Producto
+from .procesamiento import encolar_procesamiento
+
+
+@receiver(post_save, sender=Producto)
+def indexar_producto_guardado(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Mantener el índice de búsqueda al día cuando cambia el texto del producto"""
+    if raw:
+        return
+    campos_texto = {'nombre', 'descripcion', 'tags'}
+    if update_fields is not None and not campos_texto.intersection(update_fields):
+        return
+    indexar_producto(instance)
+
+
+@receiver(post_delete, sender=Producto)
+def desindexar_producto_eliminado(sender, instance, **kwargs):
+    desindexar_producto(instance.id)
+
+
+@receiver(post_save, sender=Favorito)
+def contar_favorito_agregado(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        sumar_favoritos(instance.producto_id, 1)
+        registrar_evento(instance.producto_id, EventoProducto.TIPO_FAVORITO)
+
+
+@receiver(post_delete, sender=Favorito)
+def descontar_favorito_eliminado(sender, instance, **kwargs):
+    # También se ejecuta por cada fila en borrados masivos y en cascada
+    sumar_favoritos(instance.producto_id, -1)
+
+
+@receiver(post_save, sender=Producto)
+def registrar_cambio_estado(sender, instance, created, raw=False, **kwargs):
+    """Evento para las estadísticas diarias al publicar o cambiar de estado"""
+    if raw:
+        return
+    if created or instance.estado != getattr(instance, '_estado_original', instance.estado):
+        registrar_evento(instance.id, instance.estado)
+    instance._estado_original = instance.estado
+
+
+@receiver(post_save, sender=Producto)
+@receiver(post_delete, sender=Producto)
+def invalidar_cache_producto(sender, instance, **kwargs):
+    invalidar_catalogo(instance.categoria_id, getattr(instance, '_categoria_original_id', None))
+    instance._categoria_original_id = instance.categoria_id
+
+
+@receiver(post_save, sender=ImagenProducto)
+@receiver(post_delete, sender=ImagenProducto)
+def invalidar_cache_imagen(sender, instance, **kwargs):
+    categoria_id = Producto.objects.filter(pk=instance.producto_id).values_list(
+        'categoria_id', flat=True
+    ).first()
+    invalidar_catalogo(categoria_id)
+
+
+@receiver(post_save, sender=Categoria)
+@receiver(post_delete, sender=Categoria)
+def invalidar_cache_categoria(sender, instance, **kwargs):
+    invalidar_categorias()
+    invalidar_catalogo(instance.id)
+
+
+@receiver(post_save, sender=ImagenProducto)
+def procesar_imagen_nueva(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and not instance.esta_lista:
+        encolar_procesamiento(instance.id)
+
+
+@receiver(post_save, sender=ImagenProducto)
+def contar_referencia_imagen(sender, instance, created, raw=False, **kwargs):
+    nombre = instance.imagen.name
+    original = getattr(instance, '_imagen_original', None)
+    if created:
+        sumar_referencia(nombre)
+    elif original != nombre:
+        sumar_referencia(nombre)
+        quitar_referencia(original, instance.imagen.storage)
+    instance._imagen_original = nombre
+
+
+@receiver(post_delete, sender=ImagenProducto)
+def descontar_referencia_imagen(sender, instance, **kwargs):
+    quitar_referencia(instance.imagen.name, instance.imagen.storage)
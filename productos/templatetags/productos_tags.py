@@ -0,0 +1,69 @@
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from ..imagenes import TAMANOS
+
+register = template.Library()
+
+
+def clave_tarjeta(producto, variante):
+    """Clave del fragmento: cambia cuando cambia el producto o sus contadores"""
+    return ':'.join(str(parte) for parte in (
+        'tarjeta', variante, producto.id,
+        producto.actualizado_en.timestamp(),
+        producto.visitas, producto.cantidad_favoritos, int(producto.es_nuevo),
+    ))
+
+
+@register.simple_tag
+def tarjeta_producto(producto, variante):
+    """Renderizar `productos/tarjetas/<variante>.html` con caché por producto.
+
+    Solo incluye lo que depende del producto; los botones que dependen del
+    usuario o de la petición se quedan en la página que lo usa.
+    """
+    clave = clave_tarjeta(producto, variante)
+    html = cache.get(clave)
+    if html is None:
+        html = render_to_string(f'productos/tarjetas/{variante}.html', {'producto': producto})
+        cache.set(clave, html, getattr(settings, 'TARJETAS_CACHE_SEGUNDOS', 600))
+    return mark_safe(html)
+
+
+def _srcset(imagen, campo_1x, campo_2x):
+    partes = [f"{getattr(imagen, campo_1x).url} 1x"]
+    if campo_2x:
+        partes.append(f"{getattr(imagen, campo_2x).url} 2x")
+    return ', '.join(partes)
+
+
+@register.simple_tag
+def imagen_responsive(imagen, tamano, alt='', clase='', lazy=True):
+    """<picture> con WebP y JPEG en 1x/2x para uno de los tamaños de `productos.imagenes`"""
+    if imagen.estado == imagen.ESTADO_ERROR:
+        # El procesamiento falló y no se va a reintentar: no dejar el aviso de espera
+        return format_html(
+            '<div class="imagen-procesando imagen-error"><span>⚠️</span><p>Imagen no disponible</p></div>'
+        )
+    if not imagen.esta_lista:
+        # Todavía no hay versiones redimensionadas; no generarlas en la petición
+        return format_html(
+            '<div class="imagen-procesando"><span>⏳</span><p>Procesando imagen...</p></div>'
+        )
+    jpeg, jpeg_2x, webp, webp_2x = TAMANOS[tamano]
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}">'
+        '<img src="{}" srcset="{}" alt="{}"{}{}>'
+        '</picture>',
+        _srcset(imagen, webp, webp_2x),
+        getattr(imagen, jpeg).url,
+        _srcset(imagen, jpeg, jpeg_2x),
+        alt,
+        format_html(' class="{}"', clase) if clase else '',
+        mark_safe(' loading="lazy"') if lazy else '',
+    )
@@ -1,3 +1,383 @@
-from django.test import TestCase
+import io
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db.models import Count, F
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from marketcampus.pruebas import PresupuestoConsultasMixin, crear_estudiante
+from usuarios.models import Estudiante
+
+from . import estadisticas, procesamiento
+from .almacenamiento import almacenamiento_imagenes, quitar_referencia, sumar_referencia
+from .busqueda import buscar_productos
+from .contadores import registrar_visita, vaciar_visitas
+from .datos_sinteticos import generar
+from .estadisticas import consolidar, registrar_evento, tendencia_vendedor
+from .models import (
+    ArchivoImagen, Categoria, EstadisticaDiaria, EventoProducto, Favorito, ImagenProducto, Producto,
+    ProductoRelacionado,
+)
+from .paginacion import paginar_por_ranking
+from .recomendaciones import calcular_coocurrencias, calcular_similares, recomendados_para
+from .resumen import resumen_vendedor
+
+
+# Caché en archivos: la ven todos los procesos, como Redis o Memcached
+CACHE_COMPARTIDA = {'default': {
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': tempfile.mkdtemp(),
+}}
+
+
+class PresupuestoConsultasTests(PresupuestoConsultasMixin, TestCase):
+    """Las vistas principales no deben crecer en consultas con el número de filas"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.categorias = [
+            Categoria.objects.create(nombre=nombre)
+            for nombre in ('libros_texto', 'electronica', 'ropa')
+        ]
+        cls.vendedores = [crear_estudiante(i) for i in range(4)]
+        cls.productos = [
+            Producto.objects.create(
+                nombre=f"Producto {i}", descripcion='Descripción', precio=10 + i,
+                categoria=cls.categorias[i % 3], vendedor=cls.vendedores[i % 4],
+            )
+            for i in range(12)
+        ]
+        cls.estudiante = cls.vendedores[0]
+        for producto in cls.productos[:6]:
+            Favorito.objects.create(estudiante=cls.estudiante, producto=producto)
+
+    def setUp(self):
+        self.client.force_login(self.estudiante.user)
+
+    def test_explorar(self):
+        # La última incluye el Max(actualizado_en) del validador condicional
+        self.assertPresupuestoConsultas(reverse('productos:explorar'), maximo=6)
+
+    def test_detalle_producto(self):
+        producto = self.productos[1]
+        calcular_similares()
+        calcular_coocurrencias()
+        # Vecinos precalculados de ambos tipos: una consulta para ellos y otra para sus portadas.
+        # Con la caché por proceso de los tests la visita se escribe directamente (evento y contador)
+        self.assertPresupuestoConsultas(reverse('productos:detalle', args=[producto.id]), maximo=10)
+
+    def test_get_condicional(self):
+        # Con la caché por proceso las versiones del catálogo no son fiables: sin 304
+        self.assertNotIn('ETag', self.client.get(reverse('productos:explorar')))
+        with self.settings(CACHES=CACHE_COMPARTIDA):
+            self._comprobar_get_condicional()
+
+    def _comprobar_get_condicional(self):
+        cache.clear()
+        producto = self.productos[1]
+        detalle = reverse('productos:detalle', args=[producto.id])
+        # La primera página con {% csrf_token %} crea la cookie CSRF, que entra en el ETag
+        self.client.get(detalle)
+        for indice, url in enumerate((detalle, reverse('productos:explorar'))):
+            respuesta = self.client.get(url)
+            self.assertIn('no-cache', respuesta['Cache-Control'])
+            etag = respuesta['ETag']
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+            # Las visitas no cambian actualizado_en: la página sigue vigente
+            registrar_visita(producto.id)
+            vaciar_visitas(incluir_actual=True)
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+            # Un secreto CSRF nuevo (tras volver a iniciar sesión) invalida los formularios guardados
+            self.client.cookies[settings.CSRF_COOKIE_NAME] = str(indice) * 32
+            respuesta = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(respuesta.status_code, 200)
+            etag = respuesta['ETag']
+
+            producto.precio += 1
+            # Sin pisar las visitas que el objeto en memoria no conoce
+            producto.save(update_fields=['precio', 'actualizado_en'])
+            respuesta = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(respuesta.status_code, 200)
+            self.assertNotEqual(respuesta['ETag'], etag)
+
+        # 4 páginas completas y 2 respuestas 304 del detalle, más las 2 visitas registradas a mano
+        vaciar_visitas(incluir_actual=True)
+        producto.refresh_from_db()
+        self.assertEqual(producto.visitas, 8)
+
+    def test_guardar_no_pisa_los_contadores(self):
+        producto = Producto.objects.get(id=self.productos[8].id)
+        Producto.objects.filter(id=producto.id).update(visitas=F('visitas') + 5)
+        Favorito.objects.create(estudiante=self.vendedores[1], producto=producto)
+        producto.precio = 99
+        producto.save()
+        producto.refresh_from_db()
+        self.assertEqual((producto.precio, producto.visitas, producto.cantidad_favoritos), (99, 5, 1))
+
+    def test_busqueda_pagina_hasta_el_final_del_ranking(self):
+        productos = Producto.objects.filter(estado='disponible')
+
+        def buscar(desde, limite):
+            return buscar_productos(productos, 'producto', limite=limite, desde=desde)
+
+        vistos, cursor = [], ''
+        while True:
+            pagina = paginar_por_ranking(productos, buscar, RequestFactory().get('/', {'cursor': cursor}), por_pagina=5)
+            vistos += [producto.id for producto in pagina]
+            if not pagina.tiene_siguiente:
+                break
+            cursor = pagina.siguiente_cursor
+        self.assertEqual(sorted(vistos), sorted(producto.id for producto in self.productos))
+
+    def test_admin_productos_y_categorias(self):
+        self.estudiante.user.is_staff = self.estudiante.user.is_superuser = True
+        self.estudiante.user.save()
+        # Categoría es pequeña: el admin cuenta las filas dos veces (página y total)
+        respuesta = self.assertPresupuestoConsultas(
+            reverse('admin:productos_categoria_changelist'), maximo=6, repeticiones_permitidas=2,
+        )
+        self.assertEqual(respuesta.context['cl'].result_list[0].productos_disponibles, 4)
+        url = reverse('admin:productos_producto_changelist')
+        self.assertPresupuestoConsultas(url, maximo=6)
+        # Búsqueda por el índice full-text
+        respuesta = self.assertPresupuestoConsultas(f"{url}?q=producto", maximo=7)
+        self.assertEqual(respuesta.context['cl'].result_count, len(self.productos))
+        # Favoritos por el nombre del producto
+        respuesta = self.client.get(reverse('admin:productos_favorito_changelist'), {'q': 'producto 3'})
+        self.assertEqual([favorito.producto for favorito in respuesta.context['cl'].result_list], [self.productos[3]])
+
+    async def test_vistas_async_por_asgi(self):
+        # Sin anfitrión síncrono: cualquier acceso síncrono a la base fallaría
+        await self.async_client.aforce_login(self.estudiante.user)
+        producto = self.productos[2]
+        respuesta = await self.async_client.get(reverse('productos:detalle', args=[producto.id]))
+        self.assertContains(respuesta, producto.nombre)
+
+        respuesta = await self.async_client.get(reverse('productos:explorar'), {'q': 'producto'})
+        self.assertEqual(respuesta.status_code, 200)
+        await self.async_client.alogout()
+        respuesta = await self.async_client.get(reverse('productos:por_categoria', args=[self.categorias[0].id]))
+        self.assertContains(respuesta, self.productos[0].nombre)
+
+    def test_mis_favoritos(self):
+        url = reverse('productos:mis_favoritos')
+        # Recomendaciones: puntajes, productos y portadas
+        self.assertPresupuestoConsultas(url, maximo=9)
+        Producto.objects.filter(id=self.productos[0].id).update(estado='vendido')
+
+        response = self.client.get(url, {'filtro': 'disponible', 'categoria': 'electronica'})
+
+        esperados = {
+            producto.id for producto in self.productos[:6]
+            if producto.id != self.productos[0].id and producto.categoria.nombre == 'electronica'
+        }
+        self.assertEqual({producto.id for producto in response.context['productos']}, esperados)
+        self.assertEqual(response.context['total_productos'], 6)
+        self.assertEqual(response.context['total_filtrados'], len(esperados))
+        self.assertEqual(response.context['productos_disponibles'], 5)
+        self.assertEqual(
+            response.context['precio_total'],
+            sum(producto.precio for producto in self.productos[1:6]),
+        )
+
+    def test_mis_productos(self):
+        self.assertPresupuestoConsultas(reverse('productos:mis_productos'), maximo=6)
+
+    def test_estadisticas(self):
+        self.assertPresupuestoConsultas(reverse('productos:estadisticas'), maximo=7)
+        # '²'.isdigit() es True pero int('²') falla
+        respuesta = self.client.get(reverse('productos:estadisticas'), {'periodo': '²'})
+        self.assertEqual(respuesta.context['periodo'], 30)
+
+    def test_resumen_vendedor(self):
+        Producto.objects.filter(id=self.productos[0].id).update(estado='vendido', visitas=7)
+        productos = Producto.objects.filter(vendedor=self.estudiante)
+
+        resumen = resumen_vendedor(self.estudiante)
+
+        self.assertEqual(resumen.total, productos.count())
+        self.assertEqual(resumen.vendidos, 1)
+        self.assertEqual(resumen.disponibles, productos.filter(estado='disponible').count())
+        self.assertEqual(resumen.total_visitas, 7)
+        self.assertEqual(resumen.total_favoritos, 2)
+        self.assertEqual(resumen.ingresos, self.productos[0].precio)
+        self.assertEqual(
+            {categoria['id'] for categoria in resumen.categorias_con_productos},
+            set(productos.values_list('categoria_id', flat=True)),
+        )
+
+    # El búfer de visitas solo se usa con una caché que vean todos los procesos
+    @override_settings(CACHES=CACHE_COMPARTIDA)
+    def test_consolidar_estadisticas_diarias(self):
+        producto = self.productos[0]
+        consolidar()  # Publicaciones y favoritos de setUpTestData
+        for _ in range(3):
+            registrar_visita(producto.id)
+        vaciar_visitas(incluir_actual=True)
+        producto.estado = 'reservado'
+        producto.save()
+        Favorito.objects.create(estudiante=self.vendedores[1], producto=producto)
+
+        self.assertEqual(consolidar(tamano_lote=2), 3)
+
+        self.assertFalse(EventoProducto.objects.exists())
+        fila = EstadisticaDiaria.objects.get(producto=producto)
+        self.assertEqual(
+            (fila.visitas, fila.favoritos, fila.a_disponible, fila.a_reservado),
+            (3, 2, 1, 1),
+        )
+        tendencia = tendencia_vendedor(self.estudiante, dias=7)
+        self.assertEqual(len(tendencia.dias), 7)
+        self.assertEqual(tendencia.total_visitas, 3)
+        self.assertEqual(tendencia.dias[-1]['porcentaje'], 100)
+
+    def test_consolidaciones_simultaneas_no_cuentan_dos_veces(self):
+        consolidar()
+        producto = self.productos[0]
+        for _ in range(3):
+            registrar_evento(producto.id, EventoProducto.TIPO_VISITAS)
+        consolidar_lote = estadisticas._consolidar_lote
+
+        def consolidar_a_la_vez(eventos):
+            # Otra ejecución consolida los mismos eventos antes de que esta los borre
+            parche.stop()
+            consolidar()
+            consolidar_lote(eventos)
+
+        parche = mock.patch.object(estadisticas, '_consolidar_lote', consolidar_a_la_vez)
+        parche.start()
+        consolidar()
+        self.assertEqual(EstadisticaDiaria.objects.get(producto=producto).visitas, 3)
+        self.assertFalse(EventoProducto.objects.exists())
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class AlmacenamientoTests(TestCase):
+
+    def test_no_borra_un_archivo_que_se_vuelve_a_subir(self):
+        storage = almacenamiento_imagenes()
+        nombre = storage.save('productos/foto.jpg', ContentFile(b'contenido'))
+        sumar_referencia(nombre)
+
+        with self.captureOnCommitCallbacks() as pendientes:
+            quitar_referencia(nombre, storage)
+        # Otra subida del mismo contenido antes de que corra el borrado
+        self.assertEqual(storage.save('productos/otra.jpg', ContentFile(b'contenido')), nombre)
+        sumar_referencia(nombre)
+        for callback in pendientes:
+            callback()
+        self.assertTrue(storage.exists(nombre))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            quitar_referencia(nombre, storage)
+        self.assertFalse(storage.exists(nombre))
+        self.assertFalse(ArchivoImagen.objects.exists())
+
+    def test_procesar_una_imagen_borrada_libera_el_archivo(self):
+        producto = Producto.objects.create(
+            nombre='Foto', descripcion='Descripción', precio=1,
+            categoria=Categoria.objects.create(nombre='otros'), vendedor=crear_estudiante(0),
+        )
+        foto = io.BytesIO()
+        Image.new('RGB', (8, 8), 'red').save(foto, format='JPEG')
+        with self.captureOnCommitCallbacks():
+            imagen = ImagenProducto.objects.create(producto=producto, imagen=ContentFile(foto.getvalue(), 'foto.jpg'))
+        normalizar = procesamiento._normalizar_original
+        nombres = [imagen.imagen.name]
+
+        def borrar_mientras_se_procesa(campo):
+            nombres.append(normalizar(campo))
+            with self.captureOnCommitCallbacks(execute=True):
+                ImagenProducto.objects.filter(pk=imagen.pk).delete()
+            return nombres[-1]
+
+        with mock.patch.object(procesamiento, '_normalizar_original', borrar_mientras_se_procesa):
+            with self.captureOnCommitCallbacks(execute=True):
+                procesamiento.procesar_imagen(imagen.pk)
+        self.assertNotEqual(*nombres)
+        self.assertFalse(any(imagen.imagen.storage.exists(nombre) for nombre in nombres))
+        self.assertFalse(ArchivoImagen.objects.exists())
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class DatosSinteticosTests(TestCase):
+
+    def test_generar_deja_agregados_consistentes(self):
+        creados = generar(estudiantes=20, productos=100, favoritos=150, calificaciones=40, semilla=1)
+
+        self.assertEqual(creados['productos'], 100)
+        self.assertEqual(Favorito.objects.count(), creados['favoritos'])
+        for producto in Producto.objects.annotate(n=Count('en_favoritos')):
+            self.assertEqual(producto.cantidad_favoritos, producto.n)
+        for estudiante in Estudiante.objects.annotate(n=Count('calificaciones_recibidas')):
+            self.assertEqual(estudiante.total_calificaciones, estudiante.n)
+
+
+class RecomendacionesTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        categoria = Categoria.objects.create(nombre='electronica')
+        cls.vendedor = crear_estudiante(0)
+        textos = [
+            ('Calculadora científica Casio', 'Calculadora para cálculo y física', 'calculadora,casio'),
+            ('Calculadora gráfica Texas', 'Calculadora programable', 'calculadora,graficadora'),
+            ('Audífonos bluetooth', 'Audífonos inalámbricos con micrófono', 'audio'),
+            ('Audífonos de diadema', 'Audífonos con cable', 'audio'),
+            ('Mouse inalámbrico', 'Mouse óptico', 'computadora'),
+        ]
+        cls.productos = [
+            Producto.objects.create(
+                nombre=nombre, descripcion=descripcion, tags=tags, precio=10,
+                categoria=categoria, vendedor=cls.vendedor,
+            )
+            for nombre, descripcion, tags in textos
+        ]
+
+    def test_calcular_similares_por_contenido(self):
+        calculadora, graficadora, audifonos, diadema, mouse = self.productos
+        self.assertEqual(calcular_similares(), (5, 0))
+        self.assertEqual(calcular_similares(), (0, 0))
+
+        vecinos = ProductoRelacionado.objects.filter(producto=calculadora).order_by('-puntaje')
+        self.assertEqual(vecinos[0].relacionado, graficadora)
+
+        # Un producto editado se recalcula solo y entra en las listas de sus vecinos
+        mouse.nombre = 'Audífonos gamer'
+        mouse.descripcion = 'Audífonos con micrófono'
+        mouse.save()
+        recalculados, _ = calcular_similares()
+        self.assertEqual(recalculados, 1)
+        self.assertTrue(
+            ProductoRelacionado.objects.filter(producto=audifonos, relacionado=mouse).exists()
+        )
+
+        self.client.force_login(self.vendedor.user)
+        response = self.client.get(reverse('productos:detalle', args=[calculadora.id]))
+        self.assertEqual(response.context['productos_relacionados'][0], graficadora)
+
+    def test_calcular_coocurrencias(self):
+        calculadora, graficadora, audifonos, diadema, mouse = self.productos
+        estudiantes = [crear_estudiante(i) for i in range(1, 5)]
+        for estudiante in estudiantes[:3]:
+            Favorito.objects.create(estudiante=estudiante, producto=calculadora)
+            Favorito.objects.create(estudiante=estudiante, producto=graficadora)
+        Favorito.objects.create(estudiante=estudiantes[0], producto=mouse)
+        Favorito.objects.create(estudiante=estudiantes[3], producto=calculadora)
+
+        # Bloques de 2 productos: el resultado no depende del tamaño del bloque
+        self.assertEqual(calcular_coocurrencias(bloque=2), (5, 2))
+
+        vecinos = ProductoRelacionado.objects.filter(
+            producto=calculadora, tipo=ProductoRelacionado.TIPO_FAVORITOS,
+        )
+        # 3 coocurrencias / sqrt(4 · 3); el mouse solo coincide una vez
+        self.assertEqual([(v.relacionado, v.puntaje) for v in vecinos], [(graficadora, 0.866)])
+        self.assertEqual(recomendados_para(estudiantes[3]), [graficadora])
@@ -1,71 +1,89 @@
-from django.shortcuts import render, redirect, get_object_or_404
+from asgiref.sync import sync_to_async
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q, Sum, Count
-from .models import Producto, Categoria, Favorito, ImagenProducto
+from django.db.models import Count, Exists, OuterRef, Q, Sum
+from django.utils import timezone
+from datetime import timedelta
+from .models import Producto, Categoria, Favorito, ImagenProducto, ProductoRelacionado
 from .forms import ProductoForm
+from .busqueda import buscar_productos
+from .cache import cachear_catalogo, invalidar_catalogo
+from .condicional import contar_visita, respuesta_condicional, validar_detalle, validar_listado
+from .paginacion import con_portada, apaginar_por_cursor, apaginar_por_ranking, paginar_por_cursor
+from .estadisticas import PERIODOS, registrar_cambios_estado, tendencia_vendedor
+from .recomendaciones import RELACIONADOS_EN_DETALLE, aproductos_relacionados, recomendados_para
+from .resumen import resumen_vendedor
+from marketcampus.asincrono import alista, arender
 
-def explorar(request):
+@respuesta_condicional(validar_listado)
+@cachear_catalogo
+async def explorar(request):
     """Vista principal para explorar productos"""
     query = request.GET.get('q', '')
     categoria_id = request.GET.get('categoria', '')
     
     productos = Producto.objects.filter(estado='disponible').select_related(
-        'categoria', 'vendedor'
-    ).prefetch_related('imagenes')
-    
-    if query:
-        productos = productos.filter(
-            Q(nombre__icontains=query) |
-            Q(descripcion__icontains=query) |
-            Q(tags__icontains=query)
-        )
+        'categoria', 'vendedor', 'vendedor__user'
+    )
     
     if categoria_id:
         productos = productos.filter(categoria_id=categoria_id)
     
-    categorias = Categoria.objects.filter(activa=True)
+    async def obtener_pagina():
+        if query:
+            # Resultados ordenados por relevancia desde el índice full-text
+            def buscar(desde, limite):
+                return buscar_productos(productos, query, limite=limite, desde=desde)
+            return await apaginar_por_ranking(con_portada(productos), buscar, request)
+        return await apaginar_por_cursor(con_portada(productos), request)
+    
+    categorias = await alista(Categoria.objects.filter(activa=True))
+    pagina = await obtener_pagina()
     
     context = {
-        'productos': productos,
+        'productos': pagina,
+        'pagina': pagina,
         'categorias': categorias,
         'query': query,
         'categoria_seleccionada': categoria_id,
     }
-    return render(request, 'productos/explorar.html', context)
+    return await arender(request, 'productos/explorar.html', context)
 
 
 @login_required
-def detalle_producto(request, producto_id):
+@respuesta_condicional(validar_detalle, sin_cambios=contar_visita)
+async def detalle_producto(request, producto_id):
     """Vista detallada de un producto - SOLO para usuarios logueados"""
-    producto = get_object_or_404(
-        Producto.objects.select_related('categoria', 'vendedor').prefetch_related('imagenes'), 
+    user = await request.auser()
+    
+    producto = await aget_object_or_404(
+        Producto.objects.select_related('categoria', 'vendedor').prefetch_related('imagenes'),
         id=producto_id
     )
+    es_favorito = await Favorito.objects.filter(estudiante__user_id=user.id, producto_id=producto_id).aexists()
+    # Vecinos precalculados por contenido (`calcular_similares`) y por
+    # favoritos (`calcular_coocurrencias`)
+    vecinos = await aproductos_relacionados(producto_id)
     
     # Incrementar visitas
-    producto.incrementar_visitas()
-    
-    # Verificar si el usuario actual tiene este producto en favoritos
-    es_favorito = False
-    if hasattr(request.user, 'estudiante'):
-        es_favorito = Favorito.objects.filter(
-            estudiante=request.user.estudiante, 
-            producto=producto
-        ).exists()
-    
-    # Productos relacionados (misma categoría)
-    productos_relacionados = Producto.objects.filter(
-        categoria=producto.categoria,
-        estado='disponible'
-    ).exclude(id=producto.id).select_related('categoria', 'vendedor')[:4]
+    await sync_to_async(producto.incrementar_visitas)()
+    
+    # Los de la misma categoría mientras no haya vecinos por contenido
+    relacionados = vecinos[ProductoRelacionado.TIPO_CONTENIDO]
+    if not relacionados:
+        relacionados = await alista(con_portada(Producto.objects.filter(
+            categoria=producto.categoria,
+            estado='disponible'
+        ).exclude(id=producto.id).select_related('categoria', 'vendedor__user'))[:RELACIONADOS_EN_DETALLE])
     
     context = {
         'producto': producto,
         'es_favorito': es_favorito,
-        'productos_relacionados': productos_relacionados,
+        'productos_relacionados': relacionados,
+        'tambien_guardaron': vecinos[ProductoRelacionado.TIPO_FAVORITOS],
     }
-    return render(request, 'productos/detalle.html', context)
+    return await arender(request, 'productos/detalle.html', context)
 
 @login_required
 def toggle_favorito(request, producto_id):
@@ -95,53 +113,57 @@ def mis_favoritos(request):
         messages.error(request, "Debes tener un perfil de estudiante para ver favoritos")
         return redirect('productos:explorar')
     
-    favoritos = Favorito.objects.filter(estudiante=request.user.estudiante).select_related(
-        'producto', 'producto__categoria', 'producto__vendedor'
-    ).prefetch_related('producto__imagenes')
+    estudiante = request.user.estudiante
+    favoritos = Favorito.objects.filter(estudiante=estudiante)
     
-    # Aplicar filtros
+    # Aplicar filtros como condiciones de la consulta
     filtro_activo = request.GET.get('filtro', '')
     categoria_filtro = request.GET.get('categoria', '')
     
-    productos_favoritos = []
-    for favorito in favoritos:
-        producto = favorito.producto
-        # Aplicar filtro de estado
-        if filtro_activo:
-            if filtro_activo == 'disponible' and producto.estado != 'disponible':
-                continue
-            elif filtro_activo == 'reservado' and producto.estado != 'reservado':
-                continue
-            elif filtro_activo == 'vendido' and producto.estado != 'vendido':
-                continue
-            elif filtro_activo == 'nuevo' and not producto.es_nuevo:
-                continue
-        
-        # Aplicar filtro de categoría
-        if categoria_filtro and producto.categoria and producto.categoria.nombre != categoria_filtro:
-            continue
-            
-        productos_favoritos.append(producto)
+    condicion = Q()
+    if filtro_activo in ('disponible', 'reservado', 'vendido'):
+        condicion &= Q(producto__estado=filtro_activo)
+    elif filtro_activo == 'nuevo':
+        condicion &= Q(producto__publicado_en__gt=timezone.now() - timedelta(days=1))
+    if categoria_filtro:
+        condicion &= Q(producto__categoria__nombre=categoria_filtro)
+    
+    # Estadísticas (sobre todos los favoritos, no solo los filtrados) en una consulta
+    disponible = Q(producto__estado='disponible')
+    estadisticas = favoritos.aggregate(
+        total_productos=Count('id'),
+        total_filtrados=Count('id', filter=condicion),
+        productos_disponibles=Count('id', filter=disponible),
+        precio_total=Sum('producto__precio', filter=disponible),
+        # SQLite cuenta los distintos en un árbol temporal, acotado a los favoritos del estudiante
+        universidades_unicas=Count(
+            'producto__vendedor__universidad', distinct=True,
+            filter=~Q(producto__vendedor__universidad=''),
+        ),
+    )
     
-    # Estadísticas (sobre todos los favoritos, no solo los filtrados)
-    todos_productos = [f.producto for f in favoritos]
-    productos_disponibles = len([p for p in todos_productos if p.estado == 'disponible'])
-    precio_total = sum(p.precio for p in todos_productos if p.estado == 'disponible')
-    universidades_unicas = len(set(p.vendedor.universidad for p in todos_productos if p.vendedor.universidad))
+    # EXISTS en vez de JOIN + DISTINCT: recorre las categorías en orden de nombre
+    # y comprueba cada una con el índice de favoritos, sin ordenar en memoria
+    categorias_favoritos = Categoria.objects.filter(
+        Exists(favoritos.filter(producto__categoria=OuterRef('pk')))
+    )
     
-    # Categorías únicas para filtros
-    categorias_favoritos = set(producto.categoria for producto in todos_productos if producto.categoria)
+    pagina = paginar_por_cursor(
+        con_portada(favoritos.filter(condicion).select_related(
+            'producto', 'producto__categoria', 'producto__vendedor'
+        ), 'producto__imagenes'),
+        request, campo='agregado_en',
+    )
     
     context = {
-        'productos': productos_favoritos,
-        'productos_disponibles': productos_disponibles,
-        'precio_total': precio_total,
-        'universidades_unicas': universidades_unicas,
+        'productos': [favorito.producto for favorito in pagina],
+        'pagina': pagina,
         'categorias_favoritos': categorias_favoritos,
         'filtro_activo': filtro_activo,
         'categoria_filtro': categoria_filtro,
-        'total_productos': len(todos_productos),
-        'titulo': 'Mis Favoritos'
+        'titulo': 'Mis Favoritos',
+        'recomendados': recomendados_para(estudiante),
+        **estadisticas,
     }
     return render(request, 'productos/mis_favoritos.html', context)
 
@@ -185,45 +207,32 @@ def mis_productos(request):
     # Obtener todos los productos del usuario
     productos = Producto.objects.filter(vendedor=request.user.estudiante).select_related(
         'categoria'
-    ).prefetch_related('imagenes').order_by('-publicado_en')
+    ).order_by('-publicado_en')
     
     # Aplicar filtros
     estado_filtro = request.GET.get('estado', '')
     categoria_filtro = request.GET.get('categoria', '')
     
-    productos_filtrados = productos
+    productos_filtrados = con_portada(productos)
     if estado_filtro and estado_filtro != 'todos':
         productos_filtrados = productos_filtrados.filter(estado=estado_filtro)
     
     if categoria_filtro:
         productos_filtrados = productos_filtrados.filter(categoria_id=categoria_filtro)
     
-    # Organizar productos por estado para estadísticas
-    productos_activos = productos.filter(estado='disponible')
-    productos_reservados = productos.filter(estado='reservado')
-    productos_vendidos = productos.filter(estado='vendido')
-    productos_inactivos = productos.filter(estado='inactivo')
-    
-    # Estadísticas
-    total_productos = productos.count()
-    total_visitas = productos.aggregate(Sum('visitas'))['visitas__sum'] or 0
-    total_favoritos = sum(producto.cantidad_favoritos for producto in productos)
-    
-    # Categorías únicas del usuario para filtros
-    categorias_usuario = Categoria.objects.filter(
-        productos__vendedor=request.user.estudiante
-    ).distinct()
+    # Conteos, totales y categorías en una sola consulta
+    resumen = resumen_vendedor(request.user.estudiante)
     
     context = {
         'productos': productos_filtrados,
-        'productos_activos': productos_activos,
-        'productos_reservados': productos_reservados,
-        'productos_vendidos': productos_vendidos,
-        'productos_inactivos': productos_inactivos,
-        'total_productos': total_productos,
-        'total_visitas': total_visitas,
-        'total_favoritos': total_favoritos,
-        'categorias_usuario': categorias_usuario,
+        'productos_activos': resumen.disponibles,
+        'productos_reservados': resumen.por_estado['reservado'],
+        'productos_vendidos': resumen.vendidos,
+        'productos_inactivos': resumen.por_estado['inactivo'],
+        'total_productos': resumen.total,
+        'total_visitas': resumen.total_visitas,
+        'total_favoritos': resumen.total_favoritos,
+        'categorias_usuario': resumen.categorias_con_productos,
         'estado_filtro': estado_filtro,
         'categoria_filtro': categoria_filtro,
     }
@@ -242,7 +251,14 @@ def marcar_todos_vendidos(request):
             estado='disponible'
         )
         
-        count = productos_activos.update(estado='vendido')
+        # update() no dispara señales ni pone actualizado_en: la caché del
+        # catálogo, la fecha de cambio y los eventos de estadísticas se
+        # actualizan a mano con los productos anotados antes
+        vendidos = dict(productos_activos.values_list('id', 'categoria_id'))
+        count = productos_activos.filter(id__in=vendidos).update(estado='vendido', actualizado_en=timezone.now())
+        if count:
+            invalidar_catalogo(*set(vendidos.values()))
+            registrar_cambios_estado(vendidos, 'vendido')
         
         if count > 0:
             messages.success(request, f"✅ {count} productos marcados como vendidos")
@@ -260,34 +276,26 @@ def estadisticas_productos(request):
         return redirect('productos:explorar')
     
     productos = Producto.objects.filter(vendedor=request.user.estudiante)
+    resumen = resumen_vendedor(request.user.estudiante)
     
-    # Estadísticas básicas
-    total_productos = productos.count()
-    productos_por_estado = productos.values('estado').annotate(total=Count('id'))
-    productos_por_categoria = productos.values('categoria__nombre').annotate(total=Count('id'))
+    periodo = request.GET.get('periodo', '30')
+    periodo = int(periodo) if periodo.isdecimal() and int(periodo) in PERIODOS else 30
     
     # Productos más populares con imágenes
-    productos_populares = productos.order_by('-visitas')[:5].prefetch_related('imagenes')
-    
-    # Estadísticas de tiempo
-    from django.utils import timezone
-    from datetime import timedelta
-    
-    ultima_semana = timezone.now() - timedelta(days=7)
-    productos_recientes = productos.filter(publicado_en__gte=ultima_semana).count()
-    
-    # Productos por estado para cálculos
-    productos_activos = productos.filter(estado='disponible').count()
+    productos_populares = con_portada(productos.order_by('-visitas'))[:5]
     
     context = {
-        'total_productos': total_productos,
-        'productos_por_estado': productos_por_estado,
-        'productos_por_categoria': productos_por_categoria,
+        'total_productos': resumen.total,
+        'productos_por_estado': resumen.lista_por_estado,
+        'productos_por_categoria': resumen.categorias,
         'productos_populares': productos_populares,
-        'productos_recientes': productos_recientes,
-        'productos_activos': productos_activos,
-        'total_visitas': productos.aggregate(Sum('visitas'))['visitas__sum'] or 0,
-        'total_favoritos': sum(p.cantidad_favoritos for p in productos),
+        'productos_recientes': resumen.recientes,
+        'productos_activos': resumen.disponibles,
+        'total_visitas': resumen.total_visitas,
+        'total_favoritos': resumen.total_favoritos,
+        'tendencia': tendencia_vendedor(request.user.estudiante, periodo),
+        'periodo': periodo,
+        'periodos': PERIODOS,
     }
     return render(request, 'productos/estadisticas.html', context)
 
@@ -391,19 +399,23 @@ def cambiar_estado_producto(request, producto_id, nuevo_estado):
     next_url = request.POST.get('next', request.GET.get('next', 'productos:mis_productos'))
     return redirect(next_url)
 
-def productos_por_categoria(request, categoria_id):
+@respuesta_condicional(validar_listado)
+@cachear_catalogo
+async def productos_por_categoria(request, categoria_id):
     """Mostrar productos por categoría específica"""
-    categoria = get_object_or_404(Categoria, id=categoria_id)
-    productos = Producto.objects.filter(categoria=categoria, estado='disponible').select_related(
-        'categoria', 'vendedor'
-    ).prefetch_related('imagenes')
+    productos = Producto.objects.filter(categoria_id=categoria_id, estado='disponible').select_related(
+        'categoria', 'vendedor', 'vendedor__user'
+    )
+    categoria = await aget_object_or_404(Categoria, id=categoria_id)
+    pagina = await apaginar_por_cursor(con_portada(productos), request)
     
     context = {
-        'productos': productos,
+        'productos': pagina,
+        'pagina': pagina,
         'categoria': categoria,
         'titulo': f'Productos en {categoria.get_nombre_display()}'
     }
-    return render(request, 'productos/explorar.html', context)
+    return await arender(request, 'productos/explorar.html', context)
 
 @login_required
 def duplicar_producto(request, producto_id):
@@ -431,13 +443,15 @@ def duplicar_producto(request, producto_id):
     )
     producto_nuevo.save()
     
-    # Copiar imágenes (opcional - si quieres duplicar las imágenes también)
-    # for imagen in producto_original.imagenes.all():
-    #     ImagenProducto.objects.create(
-    #         producto=producto_nuevo,
-    #         imagen=imagen.imagen,
-    #         orden=imagen.orden
-    #     )
+    # Copiar imágenes: con el almacenamiento por contenido solo se suma una
+    # referencia al mismo archivo, sin copiarlo
+    for imagen in producto_original.imagenes.all():
+        ImagenProducto.objects.create(
+            producto=producto_nuevo,
+            imagen=imagen.imagen.name,
+            orden=imagen.orden,
+            estado=imagen.estado,
+        )
     
     messages.success(request, "📋 Producto duplicado exitosamente. Ahora puedes editarlo.")
     return redirect('productos:editar', producto_id=producto_nuevo.id)
@@ -477,21 +491,13 @@ def productos_mas_vendidos(request):
         estado='vendido'
     ).order_by('-publicado_en')
     
-    total_ventas = productos_vendidos.count()
-    ingresos_totales = productos_vendidos.aggregate(Sum('precio'))['precio__sum'] or 0
-    
-    ventas_por_categoria = productos_vendidos.values(
-        'categoria__nombre'
-    ).annotate(
-        total=Count('id'),
-        ingresos=Sum('precio')
-    ).order_by('-total')
+    resumen = resumen_vendedor(request.user.estudiante)
     
     context = {
         'productos_vendidos': productos_vendidos,
-        'total_ventas': total_ventas,
-        'ingresos_totales': ingresos_totales,
-        'ventas_por_categoria': ventas_por_categoria,
+        'total_ventas': resumen.vendidos,
+        'ingresos_totales': resumen.ingresos,
+        'ventas_por_categoria': resumen.ventas_por_categoria,
         'titulo': 'Mis Ventas'
     }
     return render(request, 'productos/ventas.html', context)
\ No newline at end of file
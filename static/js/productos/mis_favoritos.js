@@ -0,0 +1,33 @@
+// Solo mantener la funcionalidad de compartir y efectos visuales
+document.addEventListener('DOMContentLoaded', function() {
+    // Efectos hover mejorados
+    document.querySelectorAll('.favorito-card').forEach(card => {
+        card.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateY(-8px)';
+        });
+
+        card.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateY(0)';
+        });
+    });
+});
+
+function compartirProducto(productoId) {
+    const url = `${window.location.origin}/productos/${productoId}/`;
+
+    if (navigator.share) {
+        navigator.share({
+            title: 'Mira este producto en MarketU',
+            text: 'Encontré este producto interesante en MarketU',
+            url: url
+        });
+    } else {
+        // Fallback para navegadores que no soportan Web Share API
+        navigator.clipboard.writeText(url).then(() => {
+            alert('🔗 Enlace copiado al portapapeles');
+        }).catch(() => {
+            // Fallback más básico
+            prompt('Comparte este enlace:', url);
+        });
+    }
+}
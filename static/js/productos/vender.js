@@ -0,0 +1,129 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('productoForm');
+    const fileUploadArea = document.getElementById('fileUploadArea');
+    const imagePreview = document.getElementById('imagePreview');
+    const fileInput = document.querySelector('input[type="file"]');
+    const btnPublicar = document.getElementById('btnPublicar');
+    const acceptTerms = document.getElementById('acceptTerms');
+
+    // Drag & Drop para imágenes
+    fileUploadArea.addEventListener('dragover', function(e) {
+        e.preventDefault();
+        this.classList.add('dragover');
+    });
+
+    fileUploadArea.addEventListener('dragleave', function(e) {
+        e.preventDefault();
+        this.classList.remove('dragover');
+    });
+
+    fileUploadArea.addEventListener('drop', function(e) {
+        e.preventDefault();
+        this.classList.remove('dragover');
+        const files = e.dataTransfer.files;
+        handleFiles(files);
+    });
+
+    // Cambio en el input de archivos
+    fileInput.addEventListener('change', function(e) {
+        handleFiles(this.files);
+    });
+
+    // Manejar archivos seleccionados
+    function handleFiles(files) {
+        if (files.length > 5) {
+            alert('❌ No puedes subir más de 5 imágenes');
+            return;
+        }
+
+        // Limpiar previsualizaciones anteriores
+        imagePreview.innerHTML = '';
+
+        Array.from(files).forEach((file, index) => {
+            if (index >= 5) return; // Máximo 5 imágenes
+
+            if (!file.type.startsWith('image/')) {
+                alert('❌ Solo se permiten archivos de imagen');
+                return;
+            }
+
+            const reader = new FileReader();
+            reader.onload = function(e) {
+                const previewItem = document.createElement('div');
+                previewItem.className = 'preview-item';
+                previewItem.innerHTML = `
+                    <img src="${e.target.result}" alt="Previsualización">
+                    <button type="button" class="preview-remove" data-index="${index}">×</button>
+                `;
+                imagePreview.appendChild(previewItem);
+
+                // Evento para eliminar previsualización
+                previewItem.querySelector('.preview-remove').addEventListener('click', function() {
+                    previewItem.remove();
+                    updateFileInput();
+                });
+            };
+            reader.readAsDataURL(file);
+        });
+    }
+
+    // Actualizar input file
+    function updateFileInput() {
+        console.log('Actualizar lista de archivos seleccionados');
+    }
+
+    // Validación del formulario
+    form.addEventListener('submit', function(e) {
+        if (!acceptTerms.checked) {
+            e.preventDefault();
+            alert('❌ Debes aceptar los términos y condiciones para publicar');
+            acceptTerms.focus();
+            return;
+        }
+
+        // Deshabilitar botón para evitar múltiples envíos
+        btnPublicar.disabled = true;
+        btnPublicar.textContent = '📤 Publicando...';
+    });
+
+    // Contador de caracteres para descripción
+    const descripcionTextarea = document.querySelector('textarea[name="descripcion"]');
+    if (descripcionTextarea) {
+        const contador = document.createElement('div');
+        contador.className = 'contador-caracteres';
+        contador.style.marginTop = '8px';
+        contador.style.fontSize = '12px';
+        contador.style.color = '#888';
+        contador.style.textAlign = 'right';
+
+        descripcionTextarea.parentNode.appendChild(contador);
+
+        function actualizarContador() {
+            const longitud = descripcionTextarea.value.length;
+            contador.textContent = `${longitud} caracteres`;
+
+            if (longitud < 50) {
+                contador.style.color = '#f44336';
+            } else if (longitud < 100) {
+                contador.style.color = '#ff9800';
+            } else {
+                contador.style.color = '#4CAF50';
+            }
+        }
+
+        descripcionTextarea.addEventListener('input', actualizarContador);
+        actualizarContador(); // Inicializar
+    }
+
+    // Efectos visuales en los campos
+    const formControls = document.querySelectorAll('.form-control');
+    formControls.forEach(control => {
+        control.addEventListener('focus', function() {
+            this.parentNode.style.transform = 'translateY(-2px)';
+        });
+
+        control.addEventListener('blur', function() {
+            this.parentNode.style.transform = 'translateY(0)';
+        });
+    });
+});
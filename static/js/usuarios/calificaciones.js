@@ -0,0 +1,36 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Calcular y animar las barras de progreso
+    function animarBarrasProgreso() {
+        const niveles = document.querySelectorAll('.nivel-estrellas');
+        const grid = document.querySelector('.distribucion-grid');
+        const totalCalificaciones = grid ? parseInt(grid.dataset.total) || 0 : 0;
+
+        if (totalCalificaciones === 0) return;
+
+        niveles.forEach(nivel => {
+            const cantidad = parseInt(nivel.getAttribute('data-cantidad')) || 0;
+            const barra = nivel.querySelector('.barra-progreso');
+            const porcentaje = (cantidad / totalCalificaciones) * 100;
+
+            // Animar la barra después de un pequeño delay
+            setTimeout(() => {
+                barra.style.width = porcentaje.toFixed(1) + '%';
+            }, 100);
+        });
+    }
+
+    // Iniciar la animación
+    animarBarrasProgreso();
+
+    // Efectos hover para las tarjetas de calificación
+    const tarjetasCalificacion = document.querySelectorAll('.calificacion-card');
+    tarjetasCalificacion.forEach(tarjeta => {
+        tarjeta.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateY(-4px)';
+        });
+
+        tarjeta.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateY(0)';
+        });
+    });
+});
@@ -0,0 +1,47 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Efectos para las opciones de estrellas
+    const estrellaLabels = document.querySelectorAll('.estrella-label');
+
+    estrellaLabels.forEach(label => {
+        label.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateY(-2px)';
+            this.style.boxShadow = '0 4px 12px rgba(0, 0, 0, 0.3)';
+        });
+
+        label.addEventListener('mouseleave', function() {
+            const input = this.previousElementSibling;
+            if (!input.checked) {
+                this.style.transform = 'translateY(0)';
+                this.style.boxShadow = 'none';
+            }
+        });
+    });
+
+    // Contador de caracteres para el comentario
+    const comentarioTextarea = document.querySelector('textarea[name="comentario"]');
+    if (comentarioTextarea) {
+        const contador = document.createElement('div');
+        contador.className = 'contador-caracteres';
+        contador.style.marginTop = '8px';
+        contador.style.fontSize = '12px';
+        contador.style.color = '#888';
+        contador.style.textAlign = 'right';
+
+        comentarioTextarea.parentNode.appendChild(contador);
+
+        function actualizarContador() {
+            const longitud = comentarioTextarea.value.length;
+            const maximo = 500;
+            contador.textContent = `${longitud}/${maximo} caracteres`;
+
+            if (longitud > maximo * 0.8) {
+                contador.style.color = '#ff9800';
+            } else {
+                contador.style.color = '#888';
+            }
+        }
+
+        comentarioTextarea.addEventListener('input', actualizarContador);
+        actualizarContador(); // Inicializar
+    }
+});
@@ -0,0 +1,79 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const passwordInput = document.getElementById('password');
+
+    // Mostrar/ocultar contraseña
+    const togglePassword = document.createElement('span');
+    togglePassword.innerHTML = '👁️';
+    togglePassword.style.position = 'absolute';
+    togglePassword.style.right = '15px';
+    togglePassword.style.top = '50%';
+    togglePassword.style.transform = 'translateY(-50%)';
+    togglePassword.style.cursor = 'pointer';
+    togglePassword.style.opacity = '0.7';
+    togglePassword.style.transition = 'opacity 0.3s';
+    togglePassword.style.zIndex = '2';
+
+    const passwordContainer = passwordInput.parentNode;
+    passwordContainer.style.position = 'relative';
+    passwordContainer.appendChild(togglePassword);
+
+    togglePassword.addEventListener('mouseenter', function() {
+        this.style.opacity = '1';
+    });
+
+    togglePassword.addEventListener('mouseleave', function() {
+        this.style.opacity = '0.7';
+    });
+
+    togglePassword.addEventListener('click', function() {
+        if (passwordInput.type === 'password') {
+            passwordInput.type = 'text';
+            this.innerHTML = '🔒';
+        } else {
+            passwordInput.type = 'password';
+            this.innerHTML = '👁️';
+        }
+    });
+
+    // Validación de correo universitario
+    const emailInput = document.getElementById('username');
+    emailInput.addEventListener('blur', function() {
+        const email = this.value;
+        if (email && !email.includes('.edu.ec') && !email.includes('@epn.edu.ec')) {
+            showEmailWarning();
+        }
+    });
+
+    function showEmailWarning() {
+        // Remover advertencia anterior si existe
+        const existingWarning = document.querySelector('.email-warning');
+        if (existingWarning) {
+            existingWarning.remove();
+        }
+
+        const warning = document.createElement('div');
+        warning.className = 'email-warning';
+        warning.innerHTML = '💡 Recomendamos usar un correo universitario';
+        warning.style.marginTop = '8px';
+        warning.style.fontSize = '12px';
+        warning.style.padding = '8px 12px';
+        warning.style.background = 'rgba(255, 152, 0, 0.1)';
+        warning.style.border = '1px solid rgba(255, 152, 0, 0.3)';
+        warning.style.color = '#ff9800';
+        warning.style.borderRadius = '4px';
+
+        emailInput.parentNode.appendChild(warning);
+    }
+
+    // Efecto de focus mejorado
+    const inputs = document.querySelectorAll('.form-input');
+    inputs.forEach(input => {
+        input.addEventListener('focus', function() {
+            this.parentNode.style.transform = 'translateY(-2px)';
+        });
+
+        input.addEventListener('blur', function() {
+            this.parentNode.style.transform = 'translateY(0)';
+        });
+    });
+});
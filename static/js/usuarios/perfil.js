@@ -0,0 +1,21 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Función para editar perfil (placeholder)
+    const btnEditar = document.querySelector('.btn-editar-perfil');
+    if (btnEditar) {
+        btnEditar.addEventListener('click', function() {
+            alert('🔧 Función de edición de perfil en desarrollo');
+        });
+    }
+
+    // Efectos hover mejorados
+    const actionCards = document.querySelectorAll('.action-card');
+    actionCards.forEach(card => {
+        card.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateY(-5px)';
+        });
+
+        card.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateY(0)';
+        });
+    });
+});
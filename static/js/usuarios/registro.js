@@ -0,0 +1,34 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const telefonoInput = document.querySelector('[name="telefono"]');
+    if (!telefonoInput) return;
+
+    // Formateo automático del teléfono
+    telefonoInput.addEventListener('input', function(e) {
+        let value = e.target.value.replace(/\D/g, '');
+
+        if (value.startsWith('593')) {
+            value = '+' + value;
+        } else if (value.length > 0 && !value.startsWith('593')) {
+            value = '+593' + value;
+        }
+
+        // Limitar longitud
+        if (value.length > 13) {
+            value = value.substring(0, 13);
+        }
+
+        e.target.value = value;
+    });
+
+    // Validación en tiempo real
+    telefonoInput.addEventListener('blur', function() {
+        const value = this.value;
+        if (value && !/^\+593\d{8,9}$/.test(value)) {
+            this.style.borderColor = '#f44336';
+            this.style.boxShadow = '0 0 0 2px rgba(244, 67, 54, 0.2)';
+        } else {
+            this.style.borderColor = '#4CAF50';
+            this.style.boxShadow = '0 0 0 2px rgba(76, 175, 80, 0.2)';
+        }
+    });
+});
@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.db.models import Q
 from django.utils.html import format_html
+from marketcampus.paginacion_admin import PaginadorEstimado
 from .models import Estudiante, Calificacion
 
 @admin.register(Estudiante)
@@ -22,12 +24,16 @@ class EstudianteAdmin(admin.ModelAdmin):
         'fecha_registro'
     ]
     
+    # Búsquedas por prefijo o exactas sobre columnas con índice (apodo y correo
+    # son únicos), en vez de icontains. En MySQL el LIKE 'texto%' de la
+    # colación sin mayúsculas usa esos índices; en SQLite no (Django añade
+    # ESCAPE y las columnas no son NOCASE) y la búsqueda recorre la tabla
     search_fields = [
-        'nombres',
-        'apellidos', 
-        'apodo',
-        'correo',
-        'telefono'
+        '^nombres',
+        '^apellidos',
+        '^apodo',
+        '^correo',
+        '=telefono'
     ]
     
     readonly_fields = [
@@ -73,6 +79,8 @@ class EstudianteAdmin(admin.ModelAdmin):
     
     ordering = ['-fecha_registro']
     list_per_page = 20
+    paginator = PaginadorEstimado
+    show_full_result_count = False
     
     # Métodos personalizados para display en admin
     def universidad_display(self, obj):
@@ -131,16 +139,15 @@ class CalificacionAdmin(admin.ModelAdmin):
         'calificador__universidad'
     ]
     
+    # Se busca por el estudiante que califica o que es calificado con los mismos
+    # campos que EstudianteAdmin (ver get_search_results)
     search_fields = [
-        'calificador__nombres',
-        'calificador__apellidos',
         'calificador__apodo',
-        'calificado__nombres', 
-        'calificado__apellidos',
         'calificado__apodo',
-        'comentario'
     ]
     
+    list_select_related = ['calificador', 'calificado', 'producto']
+    autocomplete_fields = ['calificador', 'calificado', 'producto']
     readonly_fields = ['fecha_calificacion']
     
     fieldsets = (
@@ -161,6 +168,20 @@ class CalificacionAdmin(admin.ModelAdmin):
     
     ordering = ['-fecha_calificacion']
     list_per_page = 20
+    paginator = PaginadorEstimado
+    show_full_result_count = False
+    
+    def get_search_results(self, request, queryset, search_term):
+        # Primero los estudiantes por sus índices y luego sus calificaciones por
+        # calificador o calificado, también indexados; un OR de icontains sobre
+        # dos JOIN recorría la tabla de calificaciones completa
+        if not search_term.strip():
+            return queryset, False
+        estudiantes, _ = self.admin_site.get_model_admin(Estudiante).get_search_results(
+            request, Estudiante.objects.all(), search_term
+        )
+        ids = estudiantes.values('id')
+        return queryset.filter(Q(calificador_id__in=ids) | Q(calificado_id__in=ids)), False
     
     # Métodos personalizados para display
     def calificador_display(self, obj):
@@ -181,14 +202,6 @@ class CalificacionAdmin(admin.ModelAdmin):
             return obj.producto.nombre
         return "Sin producto"
     producto_display.short_description = 'Producto'
-    
-    # Filtro personalizado para evitar auto-calificaciones
-    def formfield_for_foreignkey(self, db_field, request, **kwargs):
-        if db_field.name == "calificador":
-            kwargs["queryset"] = Estudiante.objects.all().order_by('apodo')
-        elif db_field.name == "calificado":
-            kwargs["queryset"] = Estudiante.objects.all().order_by('apodo')
-        return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
 # Si quieres también personalizar el User admin para mostrar información del estudiante
 from django.contrib.auth.models import User
@@ -203,6 +216,9 @@ class EstudianteInline(admin.StackedInline):
 class CustomUserAdmin(UserAdmin):
     inlines = (EstudianteInline,)
     list_display = UserAdmin.list_display + ('estudiante_info',)
+    list_select_related = ['estudiante']
+    paginator = PaginadorEstimado
+    show_full_result_count = False
     
     def estudiante_info(self, obj):
         try:
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from usuarios.models import Estudiante
+
+
+class Command(BaseCommand):
+    help = "Recalcula los agregados de calificaciones y el prestigio de todos los estudiantes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote', type=int, default=1000,
+            help="Cantidad de estudiantes por bulk_update (por defecto %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        total = Estudiante.recalcular_calificaciones(tamano_lote=options['lote'])
+        self.stdout.write(self.style.SUCCESS(f"✅ {total} estudiantes recalculados"))
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:13
+
+import django.core.validators
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('productos', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Estudiante',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombres', models.CharField(max_length=100)),
+                ('apellidos', models.CharField(max_length=100)),
+                ('apodo', models.CharField(blank=True, max_length=50, null=True, unique=True)),
+                ('correo', models.EmailField(max_length=254, unique=True)),
+                ('telefono', models.CharField(blank=True, help_text='Formato: +593XXXXXXXXX', max_length=13, null=True, validators=[django.core.validators.RegexValidator(message='El número debe estar en formato: +593XXXXXXXXX. (9-10 dígitos después del código país)', regex='^\\+593\\d{8,9}$')])),
+                ('universidad', models.CharField(choices=[('EPN', 'Escuela Politécnica Nacional (EPN)'), ('USFQ', 'Universidad San Francisco de Quito (USFQ)'), ('PUCE', 'Pontificia Universidad Católica del Ecuador (PUCE)'), ('UCE', 'Universidad Central del Ecuador (UCE)'), ('UDLA', 'Universidad de Las Américas (UDLA)'), ('UTE', 'Universidad Tecnológica Equinoccial (UTE)'), ('UISRAEL', 'Universidad Tecnológica Israel (UISRAEL)'), ('UNIVERSIDAD_DEL_QUINDIO', 'Universidad del Quindío'), ('UNIVERSIDAD_INTERNACIONAL_SEK', 'Universidad Internacional SEK'), ('OTRA', 'Otra universidad')], default='OTRA', max_length=50)),
+                ('prestigio', models.IntegerField(default=0)),
+                ('fecha_registro', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('es_vendedor_verificado', models.BooleanField(default=False)),
+                ('avatar', models.ImageField(blank=True, null=True, upload_to='avatars/')),
+                ('bio', models.TextField(blank=True, help_text='Breve descripción sobre ti', max_length=500)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Estudiante',
+                'verbose_name_plural': 'Estudiantes',
+            },
+        ),
+        migrations.CreateModel(
+            name='Calificacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('estrellas', models.IntegerField(choices=[(1, '⭐'), (2, '⭐⭐'), (3, '⭐⭐⭐'), (4, '⭐⭐⭐⭐'), (5, '⭐⭐⭐⭐⭐')])),
+                ('comentario', models.TextField(blank=True, max_length=500)),
+                ('fecha_calificacion', models.DateTimeField(auto_now_add=True)),
+                ('producto', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='productos.producto')),
+                ('calificado', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='calificaciones_recibidas', to='usuarios.estudiante')),
+                ('calificador', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='calificaciones_hechas', to='usuarios.estudiante')),
+            ],
+            options={
+                'verbose_name': 'Calificación',
+                'verbose_name_plural': 'Calificaciones',
+                'ordering': ['-fecha_calificacion'],
+                'unique_together': {('calificador', 'calificado', 'producto')},
+            },
+        ),
+    ]
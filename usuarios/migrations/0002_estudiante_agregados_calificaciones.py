@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:17
+
+from django.db import migrations, models
+
+
+def poblar_agregados(apps, schema_editor):
+    Estudiante = apps.get_model('usuarios', 'Estudiante')
+    Calificacion = apps.get_model('usuarios', 'Calificacion')
+    alias = schema_editor.connection.alias
+    conteos = {}
+    filas = Calificacion.objects.using(alias).order_by().values('calificado_id', 'estrellas').annotate(
+        cantidad=models.Count('id')
+    )
+    for fila in filas:
+        conteos.setdefault(fila['calificado_id'], {})[fila['estrellas']] = fila['cantidad']
+
+    estudiantes = list(Estudiante.objects.using(alias).filter(pk__in=conteos))
+    for estudiante in estudiantes:
+        histograma = conteos[estudiante.pk]
+        estudiante.total_calificaciones = sum(histograma.values())
+        estudiante.suma_calificaciones = sum(e * c for e, c in histograma.items())
+        for estrellas in range(1, 6):
+            setattr(estudiante, f'calificaciones_{estrellas}', histograma.get(estrellas, 0))
+    Estudiante.objects.using(alias).bulk_update(estudiantes, [
+        'total_calificaciones', 'suma_calificaciones', 'calificaciones_1',
+        'calificaciones_2', 'calificaciones_3', 'calificaciones_4', 'calificaciones_5',
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='estudiante',
+            name='calificaciones_1',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='estudiante',
+            name='calificaciones_2',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='estudiante',
+            name='calificaciones_3',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='estudiante',
+            name='calificaciones_4',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='estudiante',
+            name='calificaciones_5',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='estudiante',
+            name='suma_calificaciones',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='estudiante',
+            name='total_calificaciones',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(poblar_agregados, migrations.RunPython.noop),
+    ]
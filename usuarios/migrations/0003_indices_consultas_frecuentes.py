@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0007_indices_consultas_frecuentes'),
+        ('usuarios', '0002_estudiante_agregados_calificaciones'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='calificacion',
+            index=models.Index(fields=['calificado', '-fecha_calificacion'], name='calificacion_calificado_idx'),
+        ),
+    ]
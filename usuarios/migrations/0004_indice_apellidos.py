@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0003_indices_consultas_frecuentes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='estudiante',
+            index=models.Index(fields=['apellidos'], name='estudiante_apellidos_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0013_indices_planes_sin_ordenamiento'),
+        ('usuarios', '0004_indice_apellidos'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='calificacion',
+            index=models.Index(fields=['calificador', 'calificado', '-fecha_calificacion'], name='calificacion_calificador_idx'),
+        ),
+    ]
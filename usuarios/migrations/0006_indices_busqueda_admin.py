@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0005_indice_calificacion_previa'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='estudiante',
+            index=models.Index(fields=['nombres'], name='estudiante_nombres_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='estudiante',
+            index=models.Index(fields=['telefono'], name='estudiante_telefono_idx'),
+        ),
+    ]
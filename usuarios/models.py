@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Round
 from django.contrib.auth.models import User
 from django.core.validators import RegexValidator
 from django.utils import timezone
@@ -23,6 +25,13 @@ class Estudiante(models.Model):
         message="El número debe estar en formato: +593XXXXXXXXX. (9-10 dígitos después del código país)"
     )
     
+    # Campos que mantienen registrar_calificacion y recalcular_calificaciones
+    CAMPOS_CALIFICACIONES = [
+        'prestigio', 'total_calificaciones', 'suma_calificaciones',
+        'calificaciones_1', 'calificaciones_2', 'calificaciones_3',
+        'calificaciones_4', 'calificaciones_5',
+    ]
+    
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     nombres = models.CharField(max_length=100)
     apellidos = models.CharField(max_length=100)
@@ -41,6 +50,16 @@ class Estudiante(models.Model):
         default='OTRA'
     )
     prestigio = models.IntegerField(default=0)
+    
+    # Agregados de calificaciones, mantenidos de forma incremental por Calificacion
+    total_calificaciones = models.PositiveIntegerField(default=0, editable=False)
+    suma_calificaciones = models.PositiveIntegerField(default=0, editable=False)
+    calificaciones_1 = models.PositiveIntegerField(default=0, editable=False)
+    calificaciones_2 = models.PositiveIntegerField(default=0, editable=False)
+    calificaciones_3 = models.PositiveIntegerField(default=0, editable=False)
+    calificaciones_4 = models.PositiveIntegerField(default=0, editable=False)
+    calificaciones_5 = models.PositiveIntegerField(default=0, editable=False)
+    
     fecha_registro = models.DateTimeField(default=timezone.now, editable=False)
     
     # Campos adicionales
@@ -51,6 +70,12 @@ class Estudiante(models.Model):
     class Meta:
         verbose_name = 'Estudiante'
         verbose_name_plural = 'Estudiantes'
+        indexes = [
+            # Búsqueda del admin (MySQL): cada campo del OR necesita su índice
+            models.Index(fields=['nombres'], name='estudiante_nombres_idx'),
+            models.Index(fields=['apellidos'], name='estudiante_apellidos_idx'),
+            models.Index(fields=['telefono'], name='estudiante_telefono_idx'),
+        ]
     
     def __str__(self):
         return f"{self.nombres} {self.apellidos}"
@@ -69,28 +94,103 @@ class Estudiante(models.Model):
         return bool(self.telefono)
     
     # Métodos para calificaciones
+    @staticmethod
+    def prestigio_calculado():
+        """Prestigio (0-100) a partir de los contadores, redondeado en SQL.
+
+        Lo usan registrar_calificacion y recalcular_calificaciones para que
+        ambos redondeen igual (ROUND de SQL redondea .5 hacia arriba; round()
+        de Python, al par).
+        """
+        return Case(
+            When(total_calificaciones=0, then=Value(0)),
+            default=Round(F('suma_calificaciones') * 20.0 / F('total_calificaciones')),
+            output_field=models.IntegerField(),
+        )
+    
+    def registrar_calificacion(self, estrellas, signo=1):
+        """Sumar (signo=1) o restar (signo=-1) una calificación a los agregados.
+
+        Se hace con UPDATE y expresiones F() para que sea atómico; el prestigio
+        se recalcula en un segundo UPDATE a partir de los contadores ya
+        actualizados. No refresca la instancia en memoria.
+        """
+        campo_estrellas = f'calificaciones_{estrellas}'
+        estudiantes = Estudiante.objects.filter(pk=self.pk)
+        with transaction.atomic():
+            estudiantes.update(**{
+                'total_calificaciones': F('total_calificaciones') + signo,
+                'suma_calificaciones': F('suma_calificaciones') + signo * estrellas,
+                campo_estrellas: F(campo_estrellas) + signo,
+            })
+            estudiantes.update(prestigio=Estudiante.prestigio_calculado())
+    
     def actualizar_prestigio(self):
-        """Actualizar el prestigio basado en las calificaciones"""
-        calificaciones = self.calificaciones_recibidas.all()
-        if calificaciones.exists():
-            promedio = calificaciones.aggregate(models.Avg('estrellas'))['estrellas__avg']
-            self.prestigio = round(promedio * 20)  # Convertir a escala 0-100
-        else:
-            self.prestigio = 0
-        self.save(update_fields=['prestigio'])
+        """Recalcular desde cero los agregados y el prestigio de este estudiante"""
+        Estudiante.recalcular_calificaciones(Estudiante.objects.filter(pk=self.pk))
+        self.refresh_from_db(fields=Estudiante.CAMPOS_CALIFICACIONES)
+    
+    @classmethod
+    def recalcular_calificaciones(cls, estudiantes=None, tamano_lote=1000):
+        """Reconstruir los agregados con un único GROUP BY y bulk_update.
+
+        Pensado para reparaciones e importaciones masivas que no pasan por
+        Calificacion.save. Devuelve la cantidad de estudiantes actualizados.
+        """
+        if estudiantes is None:
+            estudiantes = cls.objects.all()
+        
+        conteos = {}
+        filas = Calificacion.objects.filter(calificado__in=estudiantes).order_by().values(
+            'calificado_id', 'estrellas'
+        ).annotate(cantidad=models.Count('id'))
+        for fila in filas:
+            conteos.setdefault(fila['calificado_id'], {})[fila['estrellas']] = fila['cantidad']
+        
+        actualizados = 0
+        lote = []
+        for estudiante in estudiantes.only('id').iterator(chunk_size=tamano_lote):
+            histograma = conteos.get(estudiante.id, {})
+            total = sum(histograma.values())
+            suma = sum(estrellas * cantidad for estrellas, cantidad in histograma.items())
+            estudiante.total_calificaciones = total
+            estudiante.suma_calificaciones = suma
+            for estrellas in range(1, 6):
+                setattr(estudiante, f'calificaciones_{estrellas}', histograma.get(estrellas, 0))
+            lote.append(estudiante)
+            if len(lote) >= tamano_lote:
+                cls._guardar_agregados(lote)
+                actualizados += len(lote)
+                lote = []
+        if lote:
+            cls._guardar_agregados(lote)
+            actualizados += len(lote)
+        return actualizados
+    
+    @classmethod
+    def _guardar_agregados(cls, lote):
+        """Guardar los contadores del lote y recalcular su prestigio en SQL"""
+        contadores = [campo for campo in cls.CAMPOS_CALIFICACIONES if campo != 'prestigio']
+        with transaction.atomic():
+            cls.objects.bulk_update(lote, contadores)
+            cls.objects.filter(pk__in=[estudiante.pk for estudiante in lote]).update(
+                prestigio=cls.prestigio_calculado()
+            )
     
     @property
     def promedio_calificaciones(self):
         """Obtener el promedio de calificaciones"""
-        calificaciones = self.calificaciones_recibidas.all()
-        if calificaciones.exists():
-            return calificaciones.aggregate(models.Avg('estrellas'))['estrellas__avg']
+        if self.total_calificaciones:
+            return self.suma_calificaciones / self.total_calificaciones
         return 0
     
     @property
-    def total_calificaciones(self):
-        """Obtener el total de calificaciones recibidas"""
-        return self.calificaciones_recibidas.count()
+    def distribucion_calificaciones(self):
+        """Cantidad de calificaciones por número de estrellas, de 5 a 1"""
+        return {
+            estrellas: getattr(self, f'calificaciones_{estrellas}')
+            for estrellas in range(5, 0, -1)
+        }
     
     @property
     def estrellas_display(self):
@@ -155,13 +255,33 @@ class Calificacion(models.Model):
     class Meta:
         unique_together = ['calificador', 'calificado', 'producto']
         ordering = ['-fecha_calificacion']
+        indexes = [
+            models.Index(fields=['calificado', '-fecha_calificacion'], name='calificacion_calificado_idx'),
+            # Calificación previa de un calificador a un vendedor (calificar_vendedor)
+            models.Index(fields=['calificador', 'calificado', '-fecha_calificacion'], name='calificacion_calificador_idx'),
+        ]
         verbose_name = 'Calificación'
         verbose_name_plural = 'Calificaciones'
     
     def __str__(self):
         return f"{self.calificador} → {self.calificado}: {self.estrellas}⭐"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        # Recordar los valores guardados para ajustar los agregados al editar
+        instancia._original = (instancia.__dict__.get('calificado_id'), instancia.__dict__.get('estrellas'))
+        return instancia
+    
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        # Actualizar el prestigio del estudiante calificado
-        self.calificado.actualizar_prestigio()
\ No newline at end of file
+        es_nueva = self._state.adding
+        original = getattr(self, '_original', None)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            # Actualizar de forma incremental los agregados del estudiante calificado
+            if es_nueva:
+                self.calificado.registrar_calificacion(self.estrellas)
+            elif original and None not in original and original != (self.calificado_id, self.estrellas):
+                Estudiante(pk=original[0]).registrar_calificacion(original[1], signo=-1)
+                self.calificado.registrar_calificacion(self.estrellas)
+        self._original = (self.calificado_id, self.estrellas)
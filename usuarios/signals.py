@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Calificacion, Estudiante
+
+
+@receiver(post_delete, sender=Calificacion)
+def descontar_calificacion_eliminada(sender, instance, **kwargs):
+    # También se ejecuta por cada fila en borrados masivos y en cascada
+    Estudiante(pk=instance.calificado_id).registrar_calificacion(instance.estrellas, signo=-1)
@@ -1,3 +1,59 @@
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from marketcampus.pruebas import PresupuestoConsultasMixin, crear_estudiante
+
+from .models import Calificacion
+
+
+class PresupuestoConsultasTests(PresupuestoConsultasMixin, TestCase):
+    """Perfil y calificaciones no deben hacer una consulta por calificación"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.estudiante = crear_estudiante(0)
+        for indice in range(1, 7):
+            Calificacion.objects.create(
+                calificador=crear_estudiante(indice), calificado=cls.estudiante,
+                estrellas=1 + indice % 5, comentario='Buen vendedor',
+            )
+
+    def setUp(self):
+        self.client.force_login(self.estudiante.user)
+
+    def test_perfil(self):
+        self.assertPresupuestoConsultas(
+            reverse('usuarios:perfil_con_id', args=[self.estudiante.id]), maximo=4,
+        )
+
+    def test_ver_calificaciones(self):
+        self.assertPresupuestoConsultas(
+            reverse('usuarios:ver_calificaciones', args=[self.estudiante.id]), maximo=5,
+        )
+
+    def test_prestigio_redondea_igual_al_recalcular(self):
+        calificado = crear_estudiante(10)
+        # Suma 9 en 8 calificaciones: 22.5 se redondea hacia arriba en ambos caminos
+        for indice, estrellas in enumerate([2] + [1] * 7, start=11):
+            Calificacion.objects.create(
+                calificador=crear_estudiante(indice), calificado=calificado, estrellas=estrellas,
+            )
+        calificado.refresh_from_db()
+        self.assertEqual(calificado.prestigio, 23)
+        calificado.actualizar_prestigio()
+        self.assertEqual(calificado.prestigio, 23)
+
+    def test_admin_calificaciones(self):
+        self.estudiante.user.is_staff = self.estudiante.user.is_superuser = True
+        self.estudiante.user.save()
+        url = reverse('admin:usuarios_calificacion_changelist')
+        respuesta = self.assertPresupuestoConsultas(url, maximo=6)
+        self.assertContains(respuesta, 'apodo3')
+        # La búsqueda va por los estudiantes y luego por calificador o calificado
+        respuesta = self.assertPresupuestoConsultas(f"{url}?q=apodo3", maximo=6)
+        self.assertEqual(respuesta.context['cl'].result_count, 1)
+        self.assertPresupuestoConsultas(
+            reverse('admin:usuarios_estudiante_change', args=[self.estudiante.id]), maximo=6,
+        )
+        respuesta = self.client.get(reverse('admin:usuarios_estudiante_changelist'), {'q': 'nombre3'})
+        self.assertEqual(respuesta.context['cl'].result_count, 1)
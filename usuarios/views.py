@@ -1,10 +1,11 @@
-from django.shortcuts import render, redirect, get_object_or_404
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
 from django.contrib import messages
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from .models import Estudiante, Calificacion
 from .forms import RegistroEstudianteForm, CalificacionForm
+from marketcampus.asincrono import alista, arender
 
 ## REGISTRO
 def registro(request):
@@ -60,33 +61,33 @@ def logout_estudiante(request):
 
 ## PERFIL
 @login_required
-def perfil(request, id=None):
+async def perfil(request, id=None):
     """Vista del perfil del usuario"""
+    user = await request.auser()
     # Si no se proporciona id, usar el del usuario actual
     if id is None:
-        try:
-            estudiante = request.user.estudiante
-            # Redirigir a la URL con el id
-            return redirect('usuarios:perfil_con_id', id=estudiante.id)
-        except Estudiante.DoesNotExist:
+        estudiante = await Estudiante.objects.filter(user=user).afirst()
+        if estudiante is None:
             messages.error(request, "Primero debes completar tu perfil de estudiante")
             return redirect('usuarios:registro')
+        # Redirigir a la URL con el id
+        return redirect('usuarios:perfil_con_id', id=estudiante.id)
     
-    # Obtener el perfil del estudiante
-    estudiante = get_object_or_404(Estudiante, id=id)
+    # Obtener el perfil del estudiante y sus calificaciones recientes
+    estudiante = await aget_object_or_404(Estudiante.objects.select_related('user'), id=id)
+    calificaciones_recientes = await alista(
+        Calificacion.objects.filter(calificado_id=id).select_related('calificador__user')[:5]
+    )
     
     # Verificar que el usuario tiene permiso para ver este perfil
-    puede_editar = request.user == estudiante.user
-    
-    # Obtener calificaciones recientes
-    calificaciones_recientes = estudiante.calificaciones_recibidas.all()[:5]
+    puede_editar = user.id == estudiante.user_id
     
     context = {
         'estudiante': estudiante,
         'puede_editar': puede_editar,
         'calificaciones_recientes': calificaciones_recientes,
     }
-    return render(request, 'usuarios/perfil.html', context)
+    return await arender(request, 'usuarios/perfil.html', context)
 
 ## CALIFICAR VENDEDOR
 @login_required
@@ -139,34 +140,23 @@ def calificar_vendedor(request, vendedor_id):
 
 ## VER CALIFICACIONES
 @login_required
-def ver_calificaciones(request, estudiante_id):
+async def ver_calificaciones(request, estudiante_id):
     """Ver todas las calificaciones de un estudiante"""
-    estudiante = get_object_or_404(Estudiante, id=estudiante_id)
-    calificaciones = estudiante.calificaciones_recibidas.all()
-    
-    # Asegurarse de que las estadísticas se calculen correctamente
-    total_calificaciones = calificaciones.count()
-    
-    # Calcular distribución
-    distribucion = {
-        5: calificaciones.filter(estrellas=5).count(),
-        4: calificaciones.filter(estrellas=4).count(),
-        3: calificaciones.filter(estrellas=3).count(),
-        2: calificaciones.filter(estrellas=2).count(),
-        1: calificaciones.filter(estrellas=1).count(),
-    }
+    estudiante = await aget_object_or_404(Estudiante.objects.select_related('user'), id=estudiante_id)
+    calificaciones = await alista(
+        Calificacion.objects.filter(calificado_id=estudiante_id).select_related('calificador__user')
+    )
     
+    # Los agregados se mantienen en el propio estudiante, sin COUNT por estrella
     estadisticas = {
-        'total': total_calificaciones,
-        'promedio': estudiante.promedio_calificaciones or 0,
-        'distribucion': distribucion
+        'total': estudiante.total_calificaciones,
+        'promedio': estudiante.promedio_calificaciones,
+        'distribucion': estudiante.distribucion_calificaciones,
     }
     
-    print("🔍 DEBUG - Estadísticas:", estadisticas)  # Para ver en consola
-    
     context = {
         'estudiante': estudiante,
         'calificaciones': calificaciones,
         'estadisticas': estadisticas,
     }
-    return render(request, 'usuarios/calificaciones.html', context)
\ No newline at end of file
+    return await arender(request, 'usuarios/calificaciones.html', context)